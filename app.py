@@ -1,16 +1,30 @@
 import os
-import json
+import queue
+import sys
+import threading
+
+from core import metrics
+
+if __name__ == "__main__":
+    # --metrics/--profile must be applied before instrumented modules load.
+    sys.argv[1:] = metrics.configure()
+
 import tkinter as tk
 from tkinter import messagebox
 from ttkbootstrap import (
     Style, Frame, Label, Entry, Button, Combobox, Separator
 )
-from core.calculator import zerodha_intraday_pnl
+from core.analytics import TradeAnalytics
+from core.cache import QUOTE_CACHE
+from core.ledger import TradeLedger, trade_record
+from core.utils import plain_number
+from storage.state import AppState
+from worker import BackgroundWorker, PersistQueue
 
 APP_WIDTH = 800
 APP_HEIGHT = 560
-STATE_FILE = "app_state.json"
 APP_ICON = os.path.join("assets", "app.ico")
+LOAD_POLL_MS = 15
 
 # ================= Helpers =================
 def format_inr(value):
@@ -29,36 +43,306 @@ def format_inr(value):
     return f"-₹ {s}" if neg else f"₹ {s}"
 
 def center_window(root):
-    root.update_idletasks()
+    # Screen size is known without flushing pending geometry (update_idletasks).
     sw = root.winfo_screenwidth()
     sh = root.winfo_screenheight()
     x = (sw - APP_WIDTH) // 2
     y = (sh - APP_HEIGHT) // 2
     root.geometry(f"{APP_WIDTH}x{APP_HEIGHT}+{x}+{y}")
 
-# ================= Persistence =================
-class AppState:
-    @staticmethod
-    def load():
-        if not os.path.exists(STATE_FILE):
-            return {"theme": "light", "trades": [], "window": None}
-        with open(STATE_FILE, "r") as f:
-            return json.load(f)
+def pnl_color(value):
+    return "#1e8449" if value >= 0 else "#c0392b"
+
+def stats_text(summary, today):
+    """One-line analytics readout under the overall total."""
+    if not summary.trades:
+        return ""
+    factor = "∞" if summary.profit_factor == float("inf") else f"{summary.profit_factor:.2f}"
+    return (f"Today {format_inr(today.net_pnl)} ({today.trades})   "
+            f"Win rate {summary.win_rate:.0%}   PF {factor}   "
+            f"Max DD {format_inr(summary.max_drawdown)}   "
+            f"Charges {summary.charges_pct:.2f}% of turnover")
+
+# ================= Virtual Trades Grid =================
+class VirtualTradesGrid:
+    """
+    Trades table that only creates widgets for the rows that fit on screen.
+    A fixed pool of row widgets is recycled while scrolling; refresh() only
+    reconfigures rows whose contents changed.
+    """
+    HEADERS = ["BUY", "SELL", "QTY", "NET P&L", "CUMULATIVE", ""]
+    COLUMN_WIDTHS = [80, 80, 60, 110, 120, 40]
+    HEADER_HEIGHT = 40
+    ROW_HEIGHT = 37
+    BIND_TAG = "VirtualTradesGrid"
+
+    def __init__(self, parent, ledger, on_delete):
+        self.ledger = ledger
+        self.on_delete = on_delete
+        self.first = 0
+        self.rows = []
+
+        container = Frame(parent)
+        container.pack(fill="both", expand=True)
+
+        self.scrollbar = tk.Scrollbar(container, orient="vertical", command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
 
-    @staticmethod
-    def save(state):
-        with open(STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
+        self.body = Frame(container)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.grid_propagate(False)
+
+        for c, h in enumerate(self.HEADERS):
+            self.body.columnconfigure(c, minsize=self.COLUMN_WIDTHS[c])
+            Label(self.body, text=h, font=("Segoe UI", 11, "bold"))\
+                .grid(row=0, column=c, padx=10, pady=6, sticky="w")
+        Separator(self.body).grid(row=1, column=0, columnspan=6, sticky="ew")
+
+        self._add_bind_tag(self.body)
+        self.body.bind_class(self.BIND_TAG, "<MouseWheel>", self._on_wheel)
+        self.body.bind_class(self.BIND_TAG, "<Button-4>", lambda e: self.scroll_by(-3))
+        self.body.bind_class(self.BIND_TAG, "<Button-5>", lambda e: self.scroll_by(3))
+        self.body.bind("<Configure>", lambda e: self._ensure_pool())
+
+    # ---------- Public ----------
+    def refresh(self, from_index=0):
+        """Update visible rows at or after from_index (earlier rows are unchanged)."""
+        n = len(self.ledger)
+        first = max(0, min(self.first, n - len(self.rows)))
+        if first != self.first:
+            self.first = first
+            from_index = 0
+
+        start = max(first, from_index)
+        cumulative = self.ledger.cumulative(start - 1) if start > 0 else 0
+        for pos, row in enumerate(self.rows):
+            index = first + pos
+            if index >= n:
+                self._hide(row)
+            elif index >= from_index:
+                trade = self.ledger[index]
+                cumulative += trade.net_pnl
+                self._show(row, (plain_number(trade.buy), plain_number(trade.sell),
+                                 trade.qty, trade.net_pnl, cumulative))
+
+        if n:
+            self.scrollbar.set(first / n, min(1.0, (first + len(self.rows)) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, index):
+        index = max(0, min(index, len(self.ledger) - len(self.rows)))
+        if index != self.first:
+            self.first = index
+            self.refresh()
+
+    # ---------- Row pool ----------
+    def _ensure_pool(self):
+        height = self.body.winfo_height() - self.HEADER_HEIGHT
+        wanted = max(1, -(-height // self.ROW_HEIGHT))
+        if wanted <= len(self.rows):
+            return
+        while len(self.rows) < wanted:
+            self.rows.append(self._make_row(len(self.rows)))
+        self.refresh()
+
+    def _make_row(self, pos):
+        r = 2 + 2 * pos
+        labels = []
+        for c in range(5):
+            bold = c >= 3
+            label = Label(self.body, font=("Segoe UI", 11, "bold" if bold else "normal"))
+            label.grid(row=r, column=c, padx=10, sticky="w")
+            labels.append(label)
+
+        icon = tk.Canvas(self.body, width=24, height=24, highlightthickness=0, bd=0)
+        icon.grid(row=r, column=5, padx=6)
+        icon.create_oval(2, 2, 22, 22, fill="#c0392b", outline="")
+        icon.create_text(12, 12, text="×", fill="white",
+                         font=("Segoe UI", 13, "bold"))
+        icon.bind("<Button-1>", lambda e: self.on_delete(self.first + pos))
+
+        separator = Separator(self.body)
+        separator.grid(row=r + 1, column=0, columnspan=6, sticky="ew", pady=6)
+
+        widgets = labels + [icon, separator]
+        for w in widgets:
+            self._add_bind_tag(w)
+        return {"labels": labels, "widgets": widgets, "values": None, "shown": True}
+
+    def _show(self, row, values):
+        if not row["shown"]:
+            for w in row["widgets"]:
+                w.grid()
+            row["shown"] = True
+        if row["values"] == values:
+            return
+        row["values"] = values
+
+        buy, sell, qty, net, cumulative = values
+        buy_l, sell_l, qty_l, net_l, cum_l = row["labels"]
+        buy_l.config(text=buy)
+        sell_l.config(text=sell)
+        qty_l.config(text=qty)
+        net_l.config(text=format_inr(net), foreground=pnl_color(net))
+        cum_l.config(text=format_inr(cumulative), foreground=pnl_color(cumulative))
+
+    def _hide(self, row):
+        if row["shown"]:
+            for w in row["widgets"]:
+                w.grid_remove()
+            row["shown"] = False
+            row["values"] = None
+
+    # ---------- Scrolling ----------
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.ledger)))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * max(1, len(self.rows) - 1))
+        else:
+            self.scroll_by(int(amount))
+
+    def _on_wheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def _add_bind_tag(self, widget):
+        widget.bindtags((self.BIND_TAG,) + widget.bindtags())
+
+# ================= Scenario Heat Map =================
+def surface_to_ppm(surface):
+    """
+    Encode a P&L surface as a binary PPM: green for profit, red for loss,
+    white at zero, row 0 drawn at the bottom. Pure NumPy so it can run off
+    the Tk thread.
+    """
+    import numpy as np
+
+    values = np.flipud(surface).astype(np.float64)
+    scale = np.abs(values).max() or 1.0
+    t = np.clip(values / scale, -1.0, 1.0)[..., None]
+    white = np.array([255.0, 255.0, 255.0])
+    profit = np.array([0x1e, 0x84, 0x49], dtype=np.float64)
+    loss = np.array([0xc0, 0x39, 0x2b], dtype=np.float64)
+    rgb = np.where(t >= 0, white + (profit - white) * t, white + (loss - white) * -t)
+    pixels = rgb.astype(np.uint8)
+    height, width, _ = pixels.shape
+    return f"P6 {width} {height} 255\n".encode() + pixels.tobytes()
+
+
+class ScenarioPanel:
+    """
+    Toplevel beside the main window showing net P&L over exit price (x) and
+    quantity (y). The surface and its image bytes are computed on a worker
+    thread; Tk only decodes the finished PPM, so the event loop never blocks.
+    """
+    PRICE_STEPS = 500
+    QTY_STEPS = 200
+    POLL_MS = 15
+
+    def __init__(self, root, buy_price, quantity, exchange):
+        self.root = root
+        self.buy_price = buy_price
+        self.exchange = exchange
+        self.surface = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title(f"Scenario Grid · Buy {plain_number(buy_price)} · {exchange}")
+        self.window.geometry(f"+{root.winfo_x() + APP_WIDTH + 8}+{root.winfo_y()}")
+        self.window.resizable(False, False)
+
+        frame = Frame(self.window, padding=12)
+        frame.pack(fill="both", expand=True)
+        self.canvas = tk.Canvas(frame, width=self.PRICE_STEPS, height=self.QTY_STEPS,
+                                highlightthickness=0, bg="white")
+        self.canvas.pack()
+        self.axes = Label(frame, text="Computing…", font=("Segoe UI", 10))
+        self.axes.pack(anchor="w", pady=(8, 0))
+        self.readout = Label(frame, text="", font=("Segoe UI", 11, "bold"))
+        self.readout.pack(anchor="w")
+        self.canvas.bind("<Motion>", self._on_hover)
+
+        results = queue.Queue(maxsize=1)
+        threading.Thread(target=self._compute, args=(quantity, results),
+                         name="scenario-grid", daemon=True).start()
+        self.window.after(self.POLL_MS, self._poll, results)
+
+    def _compute(self, quantity, results):
+        from core.scenario import exit_price_range, pnl_surface, quantity_range
+        try:
+            prices = exit_price_range(self.buy_price, steps=self.PRICE_STEPS)
+            quantities = quantity_range(2 * quantity, steps=self.QTY_STEPS)
+            # Transposed so quantity runs bottom-to-top and price left-to-right.
+            surface = pnl_surface(self.buy_price, prices, quantities, self.exchange).T
+            results.put((prices, quantities, surface, surface_to_ppm(surface)))
+        except Exception as e:
+            results.put(e)
+
+    def _poll(self, results):
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.window.after(self.POLL_MS, self._poll, results)
+            return
+        if isinstance(result, Exception):
+            self.axes.config(text=f"Could not compute scenarios: {result}")
+            return
+
+        self.prices, self.quantities, self.surface, ppm = result
+        self.image = tk.PhotoImage(data=ppm, format="PPM")
+        width, height = self.surface.shape[1], self.surface.shape[0]
+        zoom_x = max(1, self.PRICE_STEPS // width)
+        zoom_y = max(1, self.QTY_STEPS // height)
+        if zoom_x > 1 or zoom_y > 1:
+            self.image = self.image.zoom(zoom_x, zoom_y)
+        self.canvas.config(width=width * zoom_x, height=height * zoom_y)
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+        self.zoom = (zoom_x, zoom_y)
+        self.axes.config(text=(
+            f"Exit price {plain_number(self.prices[0])} → {plain_number(self.prices[-1])}   "
+            f"Quantity {self.quantities[0]} (bottom) → {self.quantities[-1]} (top)"
+        ))
+
+    def _on_hover(self, event):
+        if self.surface is None:
+            return
+        rows, cols = self.surface.shape
+        col = min(cols - 1, max(0, event.x // self.zoom[0]))
+        row = rows - 1 - min(rows - 1, max(0, event.y // self.zoom[1]))
+        net = float(self.surface[row, col])
+        self.readout.config(
+            text=f"Exit {plain_number(self.prices[col])} × {self.quantities[row]}: {format_inr(net)}",
+            foreground=pnl_color(net)
+        )
 
 # ================= App =================
 class ZerodhaPnLApp:
-    def __init__(self, root):
+    def __init__(self, root, on_loaded=None):
         self.root = root
-        self.state = AppState.load()
-        self.trades = self.state["trades"]
+        self.store = AppState()
+        # Only settings are needed for the first frame; trades load in the background.
+        self.state = self.store.load_settings()
+        self.trades = TradeLedger()
+        self.analytics = TradeAnalytics()
+        self.trades_loaded = False
+        self.trades_grid = None
+        self.on_loaded = on_loaded
         self.calculated = False
         self.last_result = None
+        self.last_inputs = None
+        self.quote_seq = 0
+
+        # Calculations and disk I/O run off the Tk thread; results come back via after().
+        self.worker = BackgroundWorker(self.root.after, report=self.root.report_callback_exception)
+        self.writes = PersistQueue(self.worker, self._apply_writes,
+                                   on_flushed=self._compact_if_due, on_error=self._write_failed)
+        metrics.gauge("quote_cache", QUOTE_CACHE.stats)
+        metrics.gauge("ledger.trades", lambda: len(self.trades))
 
+        # Only the active theme is built; the other is built on first toggle.
         self.style = Style(
             "flatly" if self.state["theme"] == "light" else "darkly"
         )
@@ -83,7 +367,35 @@ class ZerodhaPnLApp:
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self._build_ui()
+        self._load_trades_async()
+
+    # ================= Startup =================
+    def _load_trades_async(self):
+        """Parse saved trades and rebuild analytics on the worker; both are handed to Tk when ready."""
+        self.worker.submit_write(self._load_ledger, on_done=self._trades_loaded,
+                                 on_error=self._trades_load_failed)
+
+    def _load_ledger(self):
+        ledger = TradeLedger.from_records(self.store.load()["trades"])
+        return ledger, TradeAnalytics.from_ledger(ledger)
+
+    def _trades_load_failed(self, error):
+        messagebox.showerror("Could not load trades", str(error))
+        self._trades_loaded((TradeLedger(), TradeAnalytics()))
+
+    @metrics.timed("tk.trades_loaded")
+    def _trades_loaded(self, loaded):
+        if self.trades_grid is None:
+            self.root.after(LOAD_POLL_MS, self._trades_loaded, loaded)
+            return
+
+        ledger, self.analytics = loaded
+        self.trades = ledger
+        self.trades_grid.ledger = ledger
+        self.trades_loaded = True
         self._render_trades()
+        if self.on_loaded:
+            self.on_loaded()
 
     # ================= UI =================
     def _build_ui(self):
@@ -98,8 +410,9 @@ class ZerodhaPnLApp:
         self.right = Frame(main, padding=16)
         self.right.pack(side="right", fill="both", expand=True)
 
+        # The calculator is painted first; the trades panel follows on idle.
         self._build_calculator()
-        self._build_right_panel()
+        self.root.after_idle(self._build_right_panel)
 
     # ================= Calculator =================
     def _build_calculator(self):
@@ -124,6 +437,9 @@ class ZerodhaPnLApp:
                               state="disabled", command=self.add_trade)
         self.add_btn.pack(fill="x", pady=4)
 
+        Button(self.left, text="Scenario Grid", bootstyle="info-outline",
+               command=self.open_scenarios).pack(fill="x", pady=4)
+
     def _field(self, label):
         Label(self.left, text=label, font=("Segoe UI", 11)).pack(anchor="w")
         e = Entry(self.left, font=("Segoe UI", 11))
@@ -148,31 +464,16 @@ class ZerodhaPnLApp:
 
         self.total_label = Label(
             self.right,
-            text="Overall P&L: ₹ 0",
+            text="Loading trades…",
             font=("Segoe UI", 14, "bold")
         )
-        self.total_label.pack(anchor="w", pady=(6, 10))
-
-        # Scrollable trades area
-        container = Frame(self.right)
-        container.pack(fill="both", expand=True)
+        self.total_label.pack(anchor="w", pady=(6, 0))
 
-        self.canvas = tk.Canvas(container, highlightthickness=0)
-        scrollbar = tk.Scrollbar(container, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.stats_label = Label(self.right, text="", font=("Segoe UI", 10))
+        self.stats_label.pack(anchor="w", pady=(2, 10))
 
-        scrollbar.pack(side="right", fill="y")
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        self.scroll_frame = Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.scroll_frame, anchor="nw")
-
-        self.scroll_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
-        self._build_trades_grid()
+        # Virtualized trades area
+        self.trades_grid = VirtualTradesGrid(self.right, self.trades, self.confirm_delete)
 
         # Footer actions
         footer = Frame(self.right)
@@ -186,65 +487,21 @@ class ZerodhaPnLApp:
         ).pack(side="right")
 
     # ================= Trades Grid =================
-    def _build_trades_grid(self):
-        headers = ["BUY", "SELL", "QTY", "NET P&L", "CUMULATIVE", ""]
-        for c, h in enumerate(headers):
-            Label(self.scroll_frame, text=h, font=("Segoe UI", 11, "bold"))\
-                .grid(row=0, column=c, padx=10, pady=6, sticky="w")
-
-        Separator(self.scroll_frame).grid(row=1, column=0, columnspan=6, sticky="ew")
-
-    def _render_trades(self):
-        for w in self.scroll_frame.grid_slaves():
-            if int(w.grid_info()["row"]) > 1:
-                w.destroy()
-
-        cumulative = 0
-        total = 0
-        row = 2
-
-        for i, t in enumerate(self.trades):
-            cumulative += t["net_pnl"]
-            total += t["net_pnl"]
-
-            Label(self.scroll_frame, text=t["buy"], font=("Segoe UI", 11)).grid(row=row, column=0, padx=10, sticky="w")
-            Label(self.scroll_frame, text=t["sell"], font=("Segoe UI", 11)).grid(row=row, column=1, padx=10, sticky="w")
-            Label(self.scroll_frame, text=t["qty"], font=("Segoe UI", 11)).grid(row=row, column=2, padx=10, sticky="w")
-
-            Label(
-                self.scroll_frame,
-                text=format_inr(t["net_pnl"]),
-                font=("Segoe UI", 11, "bold"),
-                foreground="#1e8449" if t["net_pnl"] >= 0 else "#c0392b"
-            ).grid(row=row, column=3, padx=10, sticky="w")
-
-            Label(
-                self.scroll_frame,
-                text=format_inr(cumulative),
-                font=("Segoe UI", 11, "bold"),
-                foreground="#1e8449" if cumulative >= 0 else "#c0392b"
-            ).grid(row=row, column=4, padx=10, sticky="w")
-
-            self._delete_icon(self.scroll_frame, row, 5, i)
-
-            Separator(self.scroll_frame).grid(row=row + 1, column=0, columnspan=6, sticky="ew", pady=6)
-            row += 2
+    @metrics.timed("app.render_trades")
+    def _render_trades(self, from_index=0):
+        """Refresh visible rows from from_index on and the overall total."""
+        self.trades_grid.refresh(from_index)
 
+        total = self.trades.total_net_pnl()
         self.total_label.config(
             text=f"Overall P&L: {format_inr(total)}",
-            foreground="#1e8449" if total >= 0 else "#c0392b"
+            foreground=pnl_color(total)
         )
-
-    # ================= Circular Delete Icon =================
-    def _delete_icon(self, parent, row, col, index):
-        canvas = tk.Canvas(parent, width=24, height=24, highlightthickness=0, bd=0)
-        canvas.grid(row=row, column=col, padx=6)
-        canvas.create_oval(2, 2, 22, 22, fill="#c0392b", outline="")
-        canvas.create_text(12, 12, text="×", fill="white",
-                           font=("Segoe UI", 13, "bold"))
-        canvas.bind("<Button-1>", lambda e: self.confirm_delete(index))
+        self.stats_label.config(text=stats_text(self.analytics.summary(),
+                                                self.analytics.day(self.store.session_date)))
 
     # ================= Actions =================
+    @metrics.timed("tk.calculate")
     def calculate(self):
         try:
             buy = float(self.buy.get())
@@ -253,71 +510,132 @@ class ZerodhaPnLApp:
 
             if buy <= 0 or sell <= 0 or qty <= 0:
                 raise ValueError
+        except ValueError:
+            self._invalid_input()
+            return
+
+        # Only the latest request may update the label; earlier results are dropped.
+        self.quote_seq += 1
+        seq = self.quote_seq
+        self.calculated = False
+        self.add_btn.config(state="disabled")
+        inputs = (buy, sell, qty, self.exchange.get())
+        self.worker.submit(
+            QUOTE_CACHE.quote, *inputs,
+            on_done=lambda result: self._show_quote(seq, inputs, result),
+            on_error=lambda e: seq == self.quote_seq and self._invalid_input()
+        )
 
-            self.last_result = zerodha_intraday_pnl(buy, sell, qty, self.exchange.get())
-            net = self.last_result["Net P&L"]
+    @metrics.timed("tk.show_quote")
+    def _show_quote(self, seq, inputs, result):
+        if seq != self.quote_seq:
+            return
+        self.last_inputs = inputs
+        self.last_result = result
+        net = result["Net P&L"]
 
-            self.pnl.config(
-                text=format_inr(net),
-                foreground="#1e8449" if net >= 0 else "#c0392b"
-            )
+        self.pnl.config(
+            text=format_inr(net),
+            foreground=pnl_color(net)
+        )
 
-            self.calculated = True
-            self.add_btn.config(state="normal")
+        self.calculated = True
+        self.add_btn.config(state="normal")
 
-        except Exception:
-            messagebox.showerror("Invalid input", "Buy, Sell and Quantity must be greater than zero.")
+    def _invalid_input(self):
+        messagebox.showerror("Invalid input", "Buy, Sell and Quantity must be greater than zero.")
 
+    @metrics.timed("tk.add_trade")
     def add_trade(self):
-        if not self.calculated or not self.last_result:
+        if not self.calculated or not self.last_result or not self.trades_loaded:
             return
 
-        self.trades.append({
-            "buy": int(float(self.buy.get())),
-            "sell": int(float(self.sell.get())),
-            "qty": int(self.qty.get()),
-            "net_pnl": int(round(self.last_result["Net P&L"]))
-        })
+        # The trade is stored exactly as quoted: the inputs that produced
+        # the shown result, not the entry fields, which may have changed since.
+        today = self.store.session_date
+        buy, sell, qty, _ = self.last_inputs
+        self.trades.append(buy, sell, qty, self.last_result["Net P&L"], today)
+        trade = self.trades[-1]
+        self.analytics.add(trade.buy, trade.sell, trade.qty, trade.net_pnl, today)
 
-        self._persist()
-        self._render_trades()
+        self._persist("add_trade", trade_record(trade, today))
+        self._render_trades(len(self.trades) - 1)
 
         self.calculated = False
         self.add_btn.config(state="disabled")
 
+    @metrics.timed("tk.confirm_delete")
     def confirm_delete(self, index):
+        if not self.trades_loaded:
+            return
         if messagebox.askyesno("Confirm delete", "Delete this trade?"):
-            self.trades.pop(index)
-            self._persist()
-            self._render_trades()
+            self.trades.delete(index)
+            self.analytics.remove(index)
+            self._persist("delete_trade", index)
+            self._render_trades(index)
 
+    @metrics.timed("tk.reset_trades")
     def reset_trades(self):
+        if not self.trades_loaded:
+            return
         if messagebox.askyesno("Reset trades", "Remove all saved trades?"):
             self.trades.clear()
-            self._persist()
+            self.analytics.clear()
+            self._persist("clear_trades")
             self._render_trades()
 
+    @metrics.timed("tk.open_scenarios")
+    def open_scenarios(self):
+        try:
+            buy = float(self.buy.get())
+            qty = int(self.qty.get()) if self.qty.get() else 100
+            if buy <= 0 or qty <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid input", "Enter a Buy Price (and optionally a Quantity) first.")
+            return
+        ScenarioPanel(self.root, buy, qty, self.exchange.get())
+
+    @metrics.timed("tk.toggle_theme")
     def toggle_theme(self):
         self.state["theme"] = "dark" if self.state["theme"] == "light" else "light"
-        self._persist()
+        self._persist("set", "theme", self.state["theme"])
         self.style.theme_use(
             "darkly" if self.state["theme"] == "dark" else "flatly"
         )
 
+    @metrics.timed("tk.on_close")
     def on_close(self):
         self.state["window"] = {
             "x": self.root.winfo_x(),
             "y": self.root.winfo_y()
         }
-        self._persist()
+        self._persist("set", "window", self.state["window"])
+        # Pending writes are flushed before the store closes.
+        self.writes.flush_now()
+        self.worker.close()
+        self.store.close()
         self.root.destroy()
 
-    def _persist(self):
-        AppState.save({
-            "theme": self.state["theme"],
-            "trades": self.trades,
-            "window": self.state.get("window")
-        })
+    # ================= Persistence =================
+    def _persist(self, op, *args):
+        """Queue a store change; bursts are coalesced into one background write."""
+        self.writes.put(op, *args)
+
+    def _apply_writes(self, ops):
+        self.store.apply(ops)
+
+    def _compact_if_due(self):
+        """Fold the journal into a snapshot, from a copy taken on the Tk thread."""
+        if self.store.compaction_due():
+            self.writes.put("save", {
+                "theme": self.state["theme"],
+                "trades": self.trades.copy(),
+                "window": self.state.get("window")
+            })
+
+    def _write_failed(self, error):
+        messagebox.showerror("Could not save", str(error))
 
 # ================= Entry =================
 def main():
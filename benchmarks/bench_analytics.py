@@ -0,0 +1,61 @@
+"""
+TradeAnalytics rebuild and update cost on a synthetic ledger.
+
+    python -m benchmarks.bench_analytics [trades]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from core.analytics import TradeAnalytics
+from core.ledger import TradeLedger
+
+SYMBOLS = 500
+DAYS = 250
+
+
+def make_ledger(count, seed=0):
+    rng = random.Random(seed)
+    ledger = TradeLedger()
+    symbols = []
+    days = [(date(2025, 1, 1) + timedelta(d)).isoformat() for d in range(DAYS)]
+    for i in range(count):
+        buy = round(rng.uniform(50, 5000), 2)
+        sell = round(buy * rng.uniform(0.97, 1.03), 2)
+        qty = rng.randint(1, 2000)
+        ledger.append(buy, sell, qty, (sell - buy) * qty - 20, days[i * DAYS // count])
+        symbols.append(f"SYM{rng.randrange(SYMBOLS):03d}")
+    return ledger, symbols
+
+
+def main(count=1_000_000):
+    ledger, symbols = make_ledger(count)
+    print(f"{'trades':28}: {count:12,}")
+
+    for label, kwargs in (("rebuild", {}), ("rebuild with symbols", {"symbols": symbols})):
+        start = time.perf_counter()
+        analytics = TradeAnalytics.from_ledger(ledger, **kwargs)
+        print(f"{label + ' (s)':28}: {time.perf_counter() - start:12.3f}")
+
+    updates = 10_000
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(updates):
+        analytics.add(100.0, 101.0, 10, 5.0, "2026-01-02", "SYM000")
+        analytics.remove(rng.randrange(len(analytics)))
+    seconds = time.perf_counter() - start
+    print(f"{'add + remove (us)':28}: {seconds / updates * 1e6:12.1f}")
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        analytics.summary()
+    print(f"{'summary (us)':28}: {(time.perf_counter() - start) / updates * 1e6:12.2f}")
+
+    s = analytics.summary()
+    print(f"{'max drawdown':28}: {s.max_drawdown:12,.2f}")
+    print(f"{'win rate':28}: {s.win_rate:12.2%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,85 @@
+"""
+Desktop start-up benchmark: time-to-first-frame and time-to-interactive.
+
+    xvfb-run -a python -m benchmarks.bench_app_startup --trades 100000
+
+Each run is a fresh interpreter so import cost is included. The child seeds
+a temporary app_state.json with N trades, starts the app, records when the
+root window is first mapped and drawn, and when the saved trades have been
+loaded and rendered, then exits.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_ledger import make_records
+
+
+def child(state_dir):
+    started = time.perf_counter()
+    os.chdir(state_dir)
+    import tkinter as tk
+    import app
+
+    marks = {}
+    root = tk.Tk()
+
+    def first_frame(event):
+        if event.widget is root and "first_frame" not in marks:
+            root.update_idletasks()
+            marks["first_frame"] = time.perf_counter() - started
+
+    def interactive():
+        marks["interactive"] = time.perf_counter() - started
+        root.after_idle(root.destroy)
+
+    root.bind("<Map>", first_frame)
+    app.ZerodhaPnLApp(root, on_loaded=interactive)
+    root.mainloop()
+    print(json.dumps(marks))
+
+
+def run(trades, runs):
+    samples = {"first_frame": [], "interactive": []}
+    with tempfile.TemporaryDirectory() as state_dir:
+        with open(os.path.join(state_dir, "app_state.json"), "w") as f:
+            json.dump({"theme": "light", "window": None, "trades": make_records(trades)}, f)
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root_dir)
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_app_startup", "--child", state_dir],
+                check=True, capture_output=True, text=True, env=env, cwd=root_dir
+            ).stdout
+            marks = json.loads(out.strip().splitlines()[-1])
+            for key in samples:
+                samples[key].append(marks[key] * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trades", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+    if not os.environ.get("DISPLAY"):
+        sys.exit("No display; run under xvfb-run -a")
+
+    samples = run(args.trades, args.runs)
+    print(f"{args.trades:,} saved trades, {args.runs} runs")
+    for key, values in samples.items():
+        print(f"{key:15}: median {statistics.median(values):7.1f} ms  min {min(values):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
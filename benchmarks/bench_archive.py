@@ -0,0 +1,72 @@
+"""
+Columnar trade archive versus the JSON trade format: write, full load and
+a single-column (net P&L) scan.
+
+    python -m benchmarks.bench_archive [trades]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_ledger import make_records
+from storage.archive import TradeArchive, write_archive
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main(count=1_000_000):
+    import numpy as np
+
+    records = make_records(count)
+    buy = np.array([r["buy"] for r in records])
+    sell = np.array([r["sell"] for r in records])
+    qty = np.array([r["qty"] for r in records])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "trades.json")
+        archive_path = os.path.join(tmp, "trades.zpa")
+
+        def write_json():
+            with open(json_path, "w") as f:
+                f.write(json.dumps(records, separators=(",", ":")))
+
+        _, json_write = timed(write_json)
+        _, archive_write = timed(lambda: write_archive(archive_path, buy, sell, qty, "NSE"))
+
+        def json_scan():
+            with open(json_path) as f:
+                return sum(r["net_pnl"] for r in json.load(f))
+
+        def archive_scan():
+            with TradeArchive(archive_path) as archive:
+                view = archive.column("net_pnl")
+                total = float(np.frombuffer(view).sum())
+                view.release()
+                return total
+
+        def archive_load():
+            with TradeArchive(archive_path) as archive:
+                return len(archive.to_records())
+
+        _, json_seconds = timed(json_scan)
+        _, scan_seconds = timed(archive_scan)
+        _, load_seconds = timed(archive_load)
+
+        print(f"{'trades':32}: {count:12,}")
+        print(f"{'JSON size (bytes/trade)':32}: {os.path.getsize(json_path) / count:12.1f}  (inputs + net only)")
+        print(f"{'archive size (bytes/trade)':32}: {os.path.getsize(archive_path) / count:12.1f}  (full breakdown)")
+        print(f"{'JSON write (s)':32}: {json_write:12.3f}")
+        print(f"{'archive priced write (s)':32}: {archive_write:12.3f}")
+        print(f"{'JSON load + net P&L sum (s)':32}: {json_seconds:12.3f}")
+        print(f"{'archive net P&L scan (s)':32}: {scan_seconds:12.4f}")
+        print(f"{'archive to_records (s)':32}: {load_seconds:12.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: per-call cost of zerodha_intraday_pnl versus the legacy
+path that priced every trade twice and printed a report on each call, and
+of the float paths versus the exact integer-paise paths (scalar and 1M-row
+batch).
+
+    python -m benchmarks.bench_calculator
+"""
+import contextlib
+import io
+import timeit
+
+from core.calculator import (
+    zerodha_intraday_pnl, zerodha_intraday_pnl_report,
+    zerodha_intraday_pnl_paise, zerodha_intraday_pnl_batch, zerodha_intraday_pnl_batch_paise,
+    calculate_turnover, calculate_brokerage, calculate_exchange_txn,
+    calculate_statutory_charges, calculate_pnl
+)
+from core.utils import validate_inputs, round2
+
+ARGS = (1520.35, 1534.8, 250, "NSE")
+BATCH_ROWS = 1_000_000
+
+
+def legacy_intraday_pnl(buy_price, sell_price, quantity, exchange="NSE"):
+    """The pre-refactor pipeline: report + helper dicts on every call."""
+    validate_inputs(buy_price, sell_price, quantity, exchange)
+    zerodha_intraday_pnl_report(buy_price, sell_price, quantity, exchange)
+    turnovers = calculate_turnover(buy_price, sell_price, quantity)
+    brokerage = calculate_brokerage(turnovers["buy_turnover"], turnovers["sell_turnover"])
+    exchange_txn = calculate_exchange_txn(turnovers["total_turnover"], exchange)
+    statutory = calculate_statutory_charges(
+        turnovers["buy_turnover"], turnovers["sell_turnover"], turnovers["total_turnover"], brokerage, exchange_txn
+    )
+    total_charges = brokerage + statutory["Total Statutory Charges"]
+    pnl = calculate_pnl(buy_price, sell_price, quantity, total_charges)
+    return {"Net P&L": round2(pnl["Net P&L"])}
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(lambda: func(*ARGS), number=number, repeat=5)) / number * 1e6
+
+
+def main(number=20000):
+    # Legacy output goes to an in-memory sink; a real terminal is slower still.
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy = per_call_us(legacy_intraday_pnl, number)
+    fast = per_call_us(zerodha_intraday_pnl, number)
+
+    print(f"{'legacy (report + pipeline)':38}: {legacy:8.2f} us/call")
+    print(f"{'zerodha_intraday_pnl':38}: {fast:8.2f} us/call")
+    print(f"{'speedup':38}: {legacy / fast:8.1f}x")
+
+    exact = per_call_us(zerodha_intraday_pnl_paise, number)
+    print(f"{'zerodha_intraday_pnl_paise':38}: {exact:8.2f} us/call  ({fast / exact:.1f}x float)")
+
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    buy = rng.uniform(50, 5000, BATCH_ROWS).round(2)
+    sell = (buy * rng.uniform(0.97, 1.03, BATCH_ROWS)).round(2)
+    qty = rng.integers(1, 2000, BATCH_ROWS)
+    exchanges = np.where(rng.random(BATCH_ROWS) < 0.5, "NSE", "BSE")
+    batch = {}
+    for func in (zerodha_intraday_pnl_batch, zerodha_intraday_pnl_batch_paise):
+        batch[func] = min(timeit.repeat(lambda: func(buy, sell, qty, exchanges), number=1, repeat=3))
+        print(f"{func.__name__ + ' (1M)':38}: {batch[func] * 1000:8.1f} ms")
+    ratio = batch[zerodha_intraday_pnl_batch] / batch[zerodha_intraday_pnl_batch_paise]
+    print(f"{'exact batch vs float':38}: {ratio:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
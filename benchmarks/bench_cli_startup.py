@@ -0,0 +1,36 @@
+"""
+Cold-start time of the headless CLI against cli.commands.STARTUP_BUDGET_MS.
+
+    python -m benchmarks.bench_cli_startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+from cli.commands import STARTUP_BUDGET_MS
+
+COMMAND = [sys.executable, "-m", "cli", "price", "100", "101", "10", "NSE"]
+
+
+def measure(runs=15):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(COMMAND, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    samples = measure()
+    median = statistics.median(samples)
+    print(f"{'min':10}: {min(samples):7.1f} ms")
+    print(f"{'median':10}: {median:7.1f} ms")
+    print(f"{'budget':10}: {STARTUP_BUDGET_MS:7.1f} ms")
+    if median > STARTUP_BUDGET_MS:
+        sys.exit(f"CLI cold start {median:.1f} ms exceeds the {STARTUP_BUDGET_MS} ms budget")
+
+
+if __name__ == "__main__":
+    main()
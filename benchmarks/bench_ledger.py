@@ -0,0 +1,50 @@
+"""
+Memory and load-time benchmark: list-of-dicts trades versus TradeLedger.
+
+    python -m benchmarks.bench_ledger
+"""
+import json
+import random
+import time
+import tracemalloc
+
+from core.ledger import TradeLedger
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def make_records(n, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        buy = round(rng.uniform(50, 5000), 2)
+        sell = round(buy * rng.uniform(0.97, 1.03), 2)
+        records.append({"buy": buy, "sell": sell, "qty": rng.randint(1, 2000),
+                        "net_pnl": round((sell - buy) * 10, 2)})
+    return records
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def main(sizes=SIZES):
+    print(f"{'trades':>10} {'dicts MB':>10} {'ledger MB':>10} {'ratio':>7} {'json.loads s':>12} {'ledger build s':>14}")
+    for n in sizes:
+        payload = json.dumps(make_records(n))
+        _, dict_bytes, dict_time = measure(lambda: json.loads(payload))
+        records = json.loads(payload)
+        _, ledger_bytes, ledger_time = measure(lambda: TradeLedger.from_records(records))
+        del records
+        print(f"{n:>10} {dict_bytes / 1e6:>10.1f} {ledger_bytes / 1e6:>10.1f} "
+              f"{dict_bytes / ledger_bytes:>6.1f}x {dict_time:>12.3f} {ledger_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
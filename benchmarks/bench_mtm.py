@@ -0,0 +1,79 @@
+"""
+Mark-to-market throughput and latency on the offline simulated feed:
+1,000 open positions (long and short) over 250 symbols.
+
+    python -m benchmarks.bench_mtm [ticks]
+
+Reports engine-only ticks/sec (ticks pre-generated), end-to-end ticks/sec
+with the simulator in the loop, tick -> updated P&L latency percentiles,
+and tick -> published frame latency at the default frame rate.
+"""
+import random
+import sys
+import time
+
+from core.feed import simulated_feed
+from core.mtm import MarkToMarketEngine
+
+SYMBOLS = 250
+POSITIONS = 1000
+TARGET_TICKS_PER_SEC = 50_000
+
+
+def build_engine(seed=1):
+    rng = random.Random(seed)
+    prices = {f"SYM{i:03d}": round(rng.uniform(50, 5000), 1) for i in range(SYMBOLS)}
+    engine = MarkToMarketEngine()
+    symbols = list(prices)
+    for i in range(POSITIONS):
+        symbol = symbols[i % SYMBOLS]
+        qty = rng.randint(1, 500) * (1 if i % 3 else -1)
+        engine.open_position(symbol, qty, prices[symbol], rng.choice(("NSE", "BSE")))
+    return engine, prices
+
+
+def percentiles(samples_ns, points=(50, 90, 99, 99.9)):
+    ordered = sorted(samples_ns)
+    n = len(ordered)
+    return {p: ordered[min(n - 1, int(n * p / 100))] / 1000 for p in points}
+
+
+def main(ticks=500_000):
+    engine, prices = build_engine()
+    pregenerated = list(simulated_feed(prices, ticks, seed=2))
+    start = time.perf_counter()
+    engine.run(pregenerated)
+    engine_rate = ticks / (time.perf_counter() - start)
+
+    engine, prices = build_engine()
+    now = time.perf_counter_ns
+    tick_latency = []
+    record = tick_latency.append
+    on_tick = engine.on_tick
+    start = time.perf_counter()
+    for tick in simulated_feed(prices, ticks, seed=3):
+        on_tick(tick.symbol, tick.price, tick.ts)
+        record(now() - tick.ts)
+    e2e_rate = ticks / (time.perf_counter() - start)
+
+    engine, prices = build_engine()
+    frame_latency = []
+
+    def on_frame(frame):
+        if frame.oldest_ts:
+            frame_latency.append(now() - frame.oldest_ts)
+
+    engine.run(simulated_feed(prices, ticks, seed=4), on_frame)
+
+    print(f"{'positions / symbols':32}: {POSITIONS} / {SYMBOLS}")
+    print(f"{'engine only':32}: {engine_rate:12,.0f} ticks/s")
+    print(f"{'feed + engine':32}: {e2e_rate:12,.0f} ticks/s "
+          f"(target {TARGET_TICKS_PER_SEC:,})")
+    for p, us in percentiles(tick_latency).items():
+        print(f"{'tick -> P&L p' + str(p):32}: {us:12.2f} us")
+    for p, us in percentiles(frame_latency, (50, 99)).items():
+        print(f"{'tick -> frame p' + str(p):32}: {us / 1000:12.2f} ms  ({len(frame_latency)} frames)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,58 @@
+"""
+PositionBook throughput on a synthetic day of partial fills:
+orders split into 1-5 fills, long and short first, across 500 symbols.
+
+    python -m benchmarks.bench_positions [fills]
+"""
+import random
+import sys
+import time
+
+from core.positions import PositionBook
+
+SYMBOLS = 500
+DAY = "2026-01-02"
+
+
+def make_fills(count, seed=0):
+    rng = random.Random(seed)
+    prices = [rng.uniform(50, 5000) for _ in range(SYMBOLS)]
+    fills = []
+    order = 0
+    while len(fills) < count:
+        order += 1
+        s = rng.randrange(SYMBOLS)
+        is_buy = rng.random() < 0.5
+        price = round(prices[s] * (1 + rng.gauss(0, 0.002)), 1)
+        for _ in range(rng.randint(1, 5)):
+            fills.append((f"SYM{s:03d}", is_buy, rng.randint(1, 200), price, order))
+    return fills[:count]
+
+
+def run(fills, record_trips, chunk=50_000):
+    """Round trips are drained every chunk fills, as the importer does."""
+    book = PositionBook(record_trips=record_trips)
+    fill = book.fill
+    trips = 0
+    start = time.perf_counter()
+    for i in range(0, len(fills), chunk):
+        for symbol, is_buy, qty, price, order in fills[i:i + chunk]:
+            fill(symbol, is_buy, qty, price, order, "NSE", DAY)
+        trips += len(book.take_trips())
+    return book, trips, time.perf_counter() - start
+
+
+def main(count=2_000_000):
+    fills = make_fills(count)
+    print(f"{'fills':28}: {count:12,}")
+    for record_trips in (False, True):
+        book, trips, seconds = run(fills, record_trips)
+        label = "with round trips" if record_trips else "totals only"
+        print(f"{label + ' fills/sec':28}: {count / seconds:12,.0f}  ({seconds / count * 1e6:.2f} us/fill)")
+    print(f"{'round trips':28}: {trips:12,}")
+    print(f"{'realized net P&L':28}: {book.realized:12,.2f}")
+    print(f"{'open quantity':28}: {book.open_quantity():12,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
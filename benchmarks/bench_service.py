@@ -0,0 +1,127 @@
+"""
+Load test for the pricing service: keep-alive connections each send the
+next request as soon as the previous response arrives. Reports
+requests/sec and latency percentiles.
+
+    python -m benchmarks.bench_service                   # starts a local server
+    python -m benchmarks.bench_service --url http://127.0.0.1:8080 --connections 32 --seconds 10
+    python -m benchmarks.bench_service --batch 1000      # /quote/batch with 1,000-row bodies
+
+The client runs in one process, so at high request rates it can be the
+bottleneck; run several instances against --url to push harder.
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+def make_body(batch, seed=0):
+    rng = random.Random(seed)
+
+    def row():
+        buy = round(rng.uniform(50, 5000), 2)
+        return {"buy": buy, "sell": round(buy * rng.uniform(0.97, 1.03), 2),
+                "qty": rng.randint(1, 2000), "exchange": rng.choice(("NSE", "BSE"))}
+
+    if not batch:
+        return "/quote", json.dumps(row()).encode()
+    return "/quote/batch", json.dumps([row() for _ in range(batch)]).encode()
+
+
+async def client(host, port, request, deadline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    clock = time.perf_counter
+    try:
+        while clock() < deadline:
+            start = clock()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head[9:12])
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            latencies.append(clock() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, path, body, connections, seconds):
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(client(host, port, request, deadline, latencies, statuses)
+                           for _ in range(connections)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def start_server(workers=None):
+    """A `python -m cli serve --port 0` subprocess and its port."""
+    command = [sys.executable, "-m", "cli", "serve", "--port", "0"]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Listening on"):
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_service", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="running server (default: start one locally)")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=0, help="rows per /quote/batch request; 0 = /quote")
+    parser.add_argument("--workers", type=int, help="process pool size of the local server")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        process, port = start_server(args.workers)
+        host = "127.0.0.1"
+
+    path, body = make_body(args.batch)
+    try:
+        latencies, statuses, elapsed = asyncio.run(
+            run_load(host, port, path, body, args.connections, args.seconds))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"{'endpoint':20}: {path} ({args.batch or 1} row(s), {len(body):,} bytes)")
+    print(f"{'connections':20}: {args.connections}")
+    print(f"{'requests':20}: {count:,}")
+    print(f"{'statuses':20}: {', '.join(f'{s}={n:,}' for s, n in sorted(statuses.items()))}")
+    print(f"{'requests/sec':20}: {count / elapsed:,.0f}")
+    if args.batch:
+        print(f"{'rows/sec':20}: {count * args.batch / elapsed:,.0f}")
+    if count:
+        for label, q in (("p50", 0.5), ("p99", 0.99)):
+            print(f"{label + ' latency (ms)':20}: {percentile(latencies, q) * 1000:.2f}")
+    return 0 if set(statuses) <= {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Performance regression suite with machine-readable baselines.
+
+    python -m benchmarks.suite run --save benchmarks/baseline.json
+    python -m benchmarks.suite compare benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.suite run --quick          # skip the 1M-trade cases
+
+Each case reports one number with its unit and direction (ops/s: higher
+is better; s: lower is better), the best of a few repeats. `compare`
+re-runs the suite (or reads --current) and exits 1 when any case is worse
+than the baseline by more than the threshold. Cases missing on either
+side, e.g. rendering without a display, are reported and ignored.
+
+Baselines are only comparable on the same machine and Python build.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from benchmarks.bench_ledger import make_records
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000, 100_000)
+BATCH_ROWS = 1_000_000
+RENDER_TRADES = 100_000
+THRESHOLD = 0.15
+REPEATS = 3
+
+HIGHER = "ops/s"
+LOWER = "s"
+
+
+def best_of(fn, repeats=REPEATS):
+    """Fastest wall time of fn() over repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def rate(fn, number):
+    """Calls per second of fn, best of REPEATS batches of number calls."""
+    return number / min(timeit.repeat(fn, number=number, repeat=REPEATS))
+
+
+# ================= Cases =================
+def bench_scalar():
+    from core.calculator import zerodha_intraday_pnl, zerodha_intraday_pnl_paise
+
+    return {
+        "calculator.scalar": (rate(lambda: zerodha_intraday_pnl(1520.35, 1534.8, 250, "NSE"), 20_000), HIGHER),
+        "calculator.scalar_exact": (rate(lambda: zerodha_intraday_pnl_paise(1520.35, 1534.8, 250, "NSE"), 20_000),
+                                    HIGHER),
+    }
+
+
+def bench_batch(rows=BATCH_ROWS):
+    import numpy as np
+    from core.calculator import zerodha_intraday_pnl_batch, zerodha_intraday_pnl_batch_paise
+
+    rng = np.random.default_rng(0)
+    buy = rng.uniform(50, 5000, rows).round(2)
+    sell = (buy * rng.uniform(0.97, 1.03, rows)).round(2)
+    qty = rng.integers(1, 2000, rows)
+    exchanges = np.where(rng.random(rows) < 0.5, "NSE", "BSE")
+    return {
+        "calculator.batch_1m": (best_of(lambda: zerodha_intraday_pnl_batch(buy, sell, qty, exchanges)), LOWER),
+        "calculator.batch_1m_exact": (best_of(lambda: zerodha_intraday_pnl_batch_paise(buy, sell, qty, exchanges)),
+                                      LOWER),
+    }
+
+
+def bench_format_inr():
+    from app import format_inr
+
+    values = [-1234567.891, 0, 98.5, 12345678901.25, -0.004]
+    return {"app.format_inr": (rate(lambda: [format_inr(v) for v in values], 20_000) * len(values), HIGHER)}
+
+
+def bench_state(sizes=SIZES):
+    from storage.state import AppState
+
+    results = {}
+    for n in sizes:
+        records = make_records(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app_state.json")
+            store = AppState(path)
+            store.load()
+            state = {"theme": "light", "window": None, "trades": records}
+            save = best_of(lambda: store.save(state))
+            store.close()
+            load = best_of(lambda: AppState(path).load())
+        results[f"state.save_{n // 1000}k"] = (save, LOWER)
+        results[f"state.load_{n // 1000}k"] = (load, LOWER)
+    return results
+
+
+def bench_render(trades=RENDER_TRADES):
+    """_render_trades in a fresh app process under a (virtual) display; {} if none."""
+    command = [sys.executable, "-m", "benchmarks.suite", "render-child", str(trades)]
+    if not os.environ.get("DISPLAY"):
+        if not shutil.which("xvfb-run"):
+            return {}
+        command = ["xvfb-run", "-a"] + command
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root_dir)
+    out = subprocess.run(command, check=True, capture_output=True, text=True,
+                         env=env, cwd=root_dir).stdout
+    marks = json.loads(out.strip().splitlines()[-1])
+    return {name: (value, LOWER) for name, value in marks.items()}
+
+
+def render_child(trades):
+    import tkinter as tk
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "app_state.json"), "w") as f:
+            json.dump({"theme": "light", "window": None, "trades": make_records(trades)}, f)
+        os.chdir(tmp)
+        import app
+
+        marks = {}
+        root = tk.Tk()
+
+        def loaded():
+            last = len(pnl_app.trades) - 1
+            marks["app.render_full"] = best_of(lambda: (pnl_app._render_trades(), root.update_idletasks()))
+            marks["app.render_tail"] = best_of(lambda: (pnl_app._render_trades(last), root.update_idletasks()))
+            root.after_idle(root.destroy)
+
+        pnl_app = app.ZerodhaPnLApp(root, on_loaded=loaded)
+        root.mainloop()
+        pnl_app.worker.close()
+    print(json.dumps(marks))
+
+
+# ================= Suite =================
+def run_suite(quick=False, log=sys.stderr):
+    cases = [
+        bench_scalar,
+        bench_batch,
+        bench_format_inr,
+        lambda: bench_state(QUICK_SIZES if quick else SIZES),
+        bench_render,
+    ]
+    results = {}
+    for case in cases:
+        for name, (value, unit) in case().items():
+            results[name] = {"value": value, "unit": unit}
+            print(f"{name:24} {format_value(value, unit)}", file=log, flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def format_value(value, unit):
+    if unit == HIGHER:
+        return f"{value:14,.0f} ops/s"
+    return f"{value * 1000:14.2f} ms"
+
+
+def compare(baseline: dict, current: dict, threshold: float = THRESHOLD) -> list:
+    """
+    Rows of (name, baseline, current, change, status) for every case in
+    either run. change is the fractional slowdown (positive = worse).
+    status is "regressed", "ok", "improved" or "missing".
+    """
+    old, new = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            rows.append((name, old.get(name), new.get(name), None, "missing"))
+            continue
+        before, after = old[name]["value"], new[name]["value"]
+        if old[name]["unit"] == HIGHER:
+            change = before / after - 1 if after else float("inf")
+        else:
+            change = after / before - 1 if before else 0.0
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, old[name], new[name], change, status))
+    return rows
+
+
+def print_comparison(rows, out=sys.stdout):
+    print(f"{'case':24} {'baseline':>20} {'current':>20} {'change':>8}  status", file=out)
+    for name, before, after, change, status in rows:
+        b = format_value(before["value"], before["unit"]) if before else "-"
+        a = format_value(after["value"], after["unit"]) if after else "-"
+        c = f"{change * 100:+7.1f}%" if change is not None else ""
+        print(f"{name:24} {b:>20} {a:>20} {c:>8}  {status}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and print (or save) results")
+    run.add_argument("--save", help="write results JSON here (e.g. as a baseline)")
+    run.add_argument("--quick", action="store_true", help="skip the 1M-trade persistence cases")
+
+    cmp = sub.add_parser("compare", help="compare against a baseline; exit 1 on regression")
+    cmp.add_argument("baseline")
+    cmp.add_argument("--current", help="results JSON to compare instead of running the suite")
+    cmp.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, 0.15 = 15%%")
+    cmp.add_argument("--quick", action="store_true")
+
+    child = sub.add_parser("render-child")
+    child.add_argument("trades", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "render-child":
+        render_child(args.trades)
+        return 0
+
+    if args.command == "run":
+        results = run_suite(args.quick)
+        text = json.dumps(results, indent=2)
+        if args.save:
+            with open(args.save, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.quick)
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows)
+    regressed = [row[0] for row in rows if row[4] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
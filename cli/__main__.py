@@ -0,0 +1,7 @@
+from core import metrics
+
+if __name__ == "__main__":
+    # --metrics/--profile must be applied before instrumented modules load.
+    argv = metrics.configure()
+    from cli.commands import main
+    main(argv)
@@ -0,0 +1,339 @@
+"""
+Headless command-line interface. Never imports tkinter or ttkbootstrap.
+
+    python -m cli price 100 101 10 NSE
+    python -m cli price --file trades.csv --format csv
+    python -m cli price --exact 1520.35 1534.8 250   # integer-paise contract-note mode
+    cat trades.jsonl | python -m cli price
+    python -m cli import tradebook.csv --jobs 4
+    python -m cli mtm positions.csv --ticks 100000
+    python -m cli archive trades.json trades.zpa    # and back: archive trades.zpa out.json
+    python -m cli serve --port 8080                 # HTTP pricing service (service/server.py)
+
+Input rows are "buy,sell,qty[,exchange]" (comma or whitespace separated,
+header lines skipped) or JSON objects with the same keys. File and stdin
+input is priced in fixed-size chunks with the batch calculator and written
+as it goes, so memory stays flat however large the input is.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+
+from core.calculator import paise_to_rupees, zerodha_intraday_pnl, zerodha_intraday_pnl_paise
+from core.utils import validate_inputs
+
+CHUNK_ROWS = 8192
+# Cold start of `python -m cli price ...` (interpreter included); see
+# benchmarks/bench_cli_startup.py.
+STARTUP_BUDGET_MS = 150
+FRAME_RATE = 10
+
+INPUT_FIELDS = ["buy", "sell", "qty", "exchange"]
+RESULT_FIELDS = [
+    "Turnover", "Zerodha Brokerage", "Exchange Txn Charges", "SEBI Charges",
+    "Stamp Duty", "STT", "GST", "Total Charges", "Points to Breakeven",
+    "Gross P&L", "Net P&L",
+]
+OUT_OF_RANGE = "result is out of range"
+
+
+def _finite(value, field: str) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{field} must be a finite number")
+    return value
+
+
+def parse_line(line: str, default_exchange: str):
+    """Return (buy, sell, qty, exchange), None for blank/header lines; raises ValueError."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        return parse_record(json.loads(line), default_exchange)
+    parts = line.replace(",", " ").split()
+    try:
+        buy = float(parts[0])
+    except ValueError:
+        if parts[0].lower() == "buy":
+            return None
+        raise
+    if len(parts) < 3:
+        raise ValueError("expected buy, sell, qty[, exchange]")
+    exchange = parts[3] if len(parts) > 3 else default_exchange
+    return (_finite(buy, "buy"), _finite(parts[1], "sell"), int(_finite(parts[2], "qty")),
+            exchange)
+
+
+def parse_record(row: dict, default_exchange: str = "NSE"):
+    """(buy, sell, qty, exchange) from a JSON object; raises ValueError/KeyError."""
+    if not isinstance(row, dict):
+        raise ValueError("expected an object with buy, sell and qty")
+    buy, sell, qty = _finite(row["buy"], "buy"), _finite(row["sell"], "sell"), row["qty"]
+    if isinstance(qty, float):
+        # json.loads accepts NaN and Infinity; int() would raise OverflowError.
+        _finite(qty, "qty")
+    return buy, sell, int(qty), str(row.get("exchange", default_exchange))
+
+
+def result_record(row, result, error) -> dict:
+    """Inputs plus either the result fields or an "error" message."""
+    record = dict(zip(INPUT_FIELDS, row)) if row else {}
+    if error:
+        record["error"] = error
+    else:
+        record.update(result)
+    return record
+
+
+def check_finite(result: dict) -> dict:
+    """result, or ValueError if a figure overflowed to inf/NaN (not valid JSON)."""
+    if not all(map(math.isfinite, result.values())):
+        raise ValueError(OUT_OF_RANGE)
+    return result
+
+
+def _rejection(row) -> str:
+    try:
+        validate_inputs(*row)
+    except ValueError as e:
+        return str(e)
+    return "invalid input"
+
+
+def price_rows(rows, exact=False):
+    """Price a chunk of parsed rows; yields (row, result or None, error or None)."""
+    if not rows:
+        return
+    import numpy as np
+    from core.calculator import PAISE, zerodha_intraday_pnl_batch, zerodha_intraday_pnl_batch_paise
+
+    buy, sell, qty, exchange = zip(*rows)
+    # Rows that overflow are reported below, not warned about.
+    with np.errstate(over="ignore", invalid="ignore"):
+        if exact:
+            result = zerodha_intraday_pnl_batch_paise(buy, sell, qty, exchange)
+            columns = [(result[key] / PAISE).tolist() for key in RESULT_FIELDS]
+        else:
+            result = zerodha_intraday_pnl_batch(buy, sell, qty, exchange)
+            columns = [result[key].tolist() for key in RESULT_FIELDS]
+    valid = result["Valid"].tolist()
+    finite = np.isfinite(np.column_stack([result[key] for key in RESULT_FIELDS])).all(axis=1).tolist()
+    for i, row in enumerate(rows):
+        if valid[i] and finite[i]:
+            yield row, dict(zip(RESULT_FIELDS, (col[i] for col in columns))), None
+        elif valid[i]:
+            yield row, None, OUT_OF_RANGE
+        else:
+            yield row, None, _rejection(row)
+
+
+def iter_priced(lines, default_exchange="NSE", chunk_rows=CHUNK_ROWS, parse=parse_line, exact=False):
+    """Stream (row, result, error) for every input line (or parse()-able item), chunk by chunk."""
+    chunk = []
+    for number, line in enumerate(lines, 1):
+        try:
+            row = parse(line, default_exchange)
+        except (ValueError, KeyError, IndexError, TypeError, OverflowError) as e:
+            yield from price_rows(chunk, exact)
+            chunk = []
+            yield None, None, f"line {number}: {e}"
+            continue
+        if row is None:
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield from price_rows(chunk, exact)
+            chunk = []
+    yield from price_rows(chunk, exact)
+
+
+class JsonLinesWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, row, result, error):
+        self.out.write(json.dumps(result_record(row, result, error)) + "\n")
+
+
+class CsvWriter:
+    def __init__(self, out):
+        self.writer = csv.writer(out, lineterminator="\n")
+        self.writer.writerow(INPUT_FIELDS + RESULT_FIELDS + ["error"])
+
+    def write(self, row, result, error):
+        inputs = list(row) if row else [""] * len(INPUT_FIELDS)
+        values = [result[k] for k in RESULT_FIELDS] if result else [""] * len(RESULT_FIELDS)
+        self.writer.writerow(inputs + values + [error or ""])
+
+
+WRITERS = {"jsonl": JsonLinesWriter, "csv": CsvWriter}
+
+
+def cmd_price(args, out=None) -> int:
+    out = out or sys.stdout
+    writer = WRITERS[args.format](out)
+    failures = 0
+
+    if args.values:
+        if len(args.values) not in (3, 4):
+            raise SystemExit("price expects: buy sell qty [exchange]")
+        try:
+            row = parse_line(" ".join(args.values), args.exchange)
+        except (ValueError, KeyError, IndexError, TypeError, OverflowError) as e:
+            writer.write(None, None, str(e))
+            return 1
+        if row is None:
+            writer.write(None, None, "expected buy, sell, qty[, exchange]")
+            return 1
+        try:
+            if args.exact:
+                result = paise_to_rupees(zerodha_intraday_pnl_paise(*row))
+            else:
+                result = zerodha_intraday_pnl(*row)
+            writer.write(row, check_finite(result), None)
+        except (ValueError, OverflowError) as e:
+            writer.write(row, None, str(e))
+            failures += 1
+        return 1 if failures else 0
+
+    source = sys.stdin if args.file in (None, "-") else open(args.file, "r")
+    try:
+        for row, result, error in iter_priced(source, args.exchange, args.chunk_rows, exact=args.exact):
+            writer.write(row, result, error)
+            failures += error is not None
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 1 if failures else 0
+
+
+def cmd_import(args) -> int:
+    from storage import importer
+
+    importer.main(args.importer_args)
+    return 0
+
+
+def cmd_mtm(args, out=None) -> int:
+    """Mark positions (symbol,qty,entry[,exchange]) to a simulated or replayed feed."""
+    from core.feed import simulated_feed, replay_feed
+    from core.mtm import MarkToMarketEngine
+
+    out = out or sys.stdout
+    engine = MarkToMarketEngine()
+    entries = {}
+    with open(args.positions, newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().lower() == "symbol":
+                continue
+            symbol, qty, entry = row[0].strip(), int(row[1]), float(row[2])
+            exchange = row[3].strip().upper() if len(row) > 3 and row[3].strip() else "NSE"
+            engine.open_position(symbol, qty, entry, exchange)
+            entries.setdefault(symbol, entry)
+
+    if args.replay:
+        feed = replay_feed(args.replay, args.speed)
+    else:
+        feed = simulated_feed(entries, args.ticks, seed=args.seed)
+
+    def on_frame(frame):
+        out.write(json.dumps({"total": round(frame.total, 2), "ticks": frame.ticks,
+                              "updated": len(frame.updates)}) + "\n")
+
+    engine.run(feed, on_frame, frame_rate=args.fps)
+    return 0
+
+
+def cmd_archive(args, out=None) -> int:
+    """Pack saved trades (a JSON list or a state snapshot) into an archive, or unpack one to JSON."""
+    from storage.archive import ARCHIVE_SUFFIX, TradeArchive, write_records
+
+    out = out or sys.stdout
+    if args.source.endswith(ARCHIVE_SUFFIX):
+        with TradeArchive(args.source) as archive:
+            records = archive.to_records()
+        if args.dest == "-":
+            json.dump(records, out, separators=(",", ":"))
+        else:
+            with open(args.dest, "w") as f:
+                json.dump(records, f, separators=(",", ":"))
+        return 0
+
+    with open(args.source) as f:
+        data = json.load(f)
+    records = data["trades"] if isinstance(data, dict) else data
+    rows = write_records(args.dest, records)
+    out.write(json.dumps({"archived": rows, "path": args.dest}) + "\n")
+    return 0
+
+
+def cmd_serve(args, out=None) -> int:
+    from service.server import serve
+
+    out = out or sys.stdout
+
+    def ready(server):
+        out.write(f"Listening on http://{server.host}:{server.port}\n")
+        out.flush()
+
+    options = {name: getattr(args, name) for name in
+               ("host", "port", "concurrency", "backlog", "workers", "offload_bytes")}
+    serve(on_ready=ready, **{name: value for name, value in options.items() if value is not None})
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli", description="Zerodha intraday P&L (headless).",
+        epilog="Before the command: --metrics FILE (.json or .prom) and --profile FILE "
+               "(.pstats for cProfile, .folded for sampling) record a session."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    price = sub.add_parser("price", help="price trades from arguments, a file or stdin")
+    price.add_argument("values", nargs="*", help="buy sell qty [exchange]")
+    price.add_argument("--file", "-f", help="input file ('-' for stdin)")
+    price.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    price.add_argument("--exchange", default="NSE", help="exchange for rows without one")
+    price.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    price.add_argument("--exact", action="store_true",
+                       help="contract-note arithmetic in integer paise (STT to the rupee)")
+    price.set_defaults(handler=cmd_price)
+
+    imp = sub.add_parser("import", help="import a tradebook CSV into the SQLite store")
+    imp.add_argument("importer_args", nargs=argparse.REMAINDER)
+    imp.set_defaults(handler=cmd_import)
+
+    mtm = sub.add_parser("mtm", help="live unrealized P&L of positions on a simulated or replayed feed")
+    mtm.add_argument("positions", help="CSV of symbol,qty,entry[,exchange] (negative qty for shorts)")
+    mtm.add_argument("--replay", help="recorded tick CSV (time,symbol,price) instead of the simulator")
+    mtm.add_argument("--speed", type=float, default=0.0, help="replay pacing; 0 = as fast as possible")
+    mtm.add_argument("--ticks", type=int, default=100_000, help="simulated ticks")
+    mtm.add_argument("--seed", type=int, default=0)
+    mtm.add_argument("--fps", type=float, default=FRAME_RATE, help="frames written per second")
+    mtm.set_defaults(handler=cmd_mtm)
+
+    archive = sub.add_parser("archive", help="convert saved trades to or from the columnar .zpa archive")
+    archive.add_argument("source", help="JSON trades or snapshot to pack, or a .zpa archive to unpack")
+    archive.add_argument("dest", help="archive to write, or JSON output ('-' for stdout)")
+    archive.set_defaults(handler=cmd_archive)
+
+    # Defaults live in service/server.py, which is only imported when serving.
+    serve = sub.add_parser("serve", help="HTTP pricing service with single and batch quote endpoints")
+    serve.add_argument("--host", help="default 127.0.0.1")
+    serve.add_argument("--port", type=int, help="default 8080; 0 picks a free port")
+    serve.add_argument("--concurrency", type=int, help="requests priced at once (default 64)")
+    serve.add_argument("--backlog", type=int, help="requests allowed to wait before 503s (default 256)")
+    serve.add_argument("--workers", type=int, help="process pool size for large batches (default: CPUs)")
+    serve.add_argument("--offload-bytes", type=int,
+                       help="batch bodies above this size are priced in the process pool (default 64 KiB)")
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(args.handler(args))
@@ -0,0 +1,400 @@
+from array import array
+from itertools import accumulate, compress
+from typing import NamedTuple
+
+from core.ledger import COMPACT_MIN_DEAD, NO_DAY, day_number, day_text
+
+# Trades per drawdown block: an update rescans one block, then O(log n) tree nodes.
+BLOCK = 64
+
+
+class Rollup(NamedTuple):
+    trades: int
+    net_pnl: float
+    wins: int
+    losses: int
+    charges: float
+    turnover: float
+
+
+class Summary(NamedTuple):
+    trades: int
+    net_pnl: float
+    wins: int
+    losses: int
+    win_rate: float             # wins / trades, 0.0 with no trades
+    profit_factor: float        # gross profit / gross loss; inf with no losing trades
+    gross_profit: float
+    gross_loss: float           # positive number
+    max_drawdown: float         # largest peak-to-trough fall of the equity curve
+    current_drawdown: float     # below the running peak right now
+    peak_equity: float
+    charges: float
+    turnover: float
+    charges_pct: float          # charges as a percentage of turnover
+
+
+def _rollup(values) -> Rollup:
+    return Rollup(*values)
+
+
+class TradeAnalytics:
+    """
+    Trade statistics kept in step with a ledger's appends and deletes, so
+    reads never rescan history.
+
+    Totals, win/loss counts, charges and turnover are running sums, as are
+    the per-day and per-symbol rollups. Charges are derived per trade as
+    gross minus net P&L. Max drawdown needs the whole equity path, and
+    deleting a trade shifts every later point of it. Trades are therefore
+    grouped into blocks of BLOCK slots under a segment tree. Each tree node
+    keeps (count, sum, max prefix, min prefix, max drawdown). A change
+    rescans one block and walks O(log n) nodes; the root answers in O(1).
+    Deleted trades stay as zero tombstones until compaction, as in
+    TradeLedger. A full rebuild is vectorized with NumPy.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._net = array("d")
+        self._charges = array("d")
+        self._turnover = array("d")
+        self._alive = array("b")
+        self._day = array("i")
+        self._symbol = array("i")
+        self._symbols = []
+        self._symbol_codes = {}
+        self._size = 0
+        self._totals = [0.0, 0, 0, 0.0, 0.0, 0.0, 0.0]   # net, wins, losses, profit, loss, charges, turnover
+        self._by_day = {}
+        self._by_symbol = {}
+        self._cap = 1
+        self._tcount = array("q", [0, 0])
+        self._tsum, self._thigh, self._tlow, self._tdd = (array("d", [0.0, 0.0]) for _ in range(4))
+
+    # ================= Building =================
+    @classmethod
+    def from_ledger(cls, ledger, symbols=None) -> "TradeAnalytics":
+        """Rebuild from a TradeLedger's live rows (and optional per-row symbols)."""
+        return cls.from_columns(*(ledger.column(name) for name in ("buy", "sell", "qty", "net_pnl", "day")),
+                                symbols=symbols)
+
+    @classmethod
+    def from_columns(cls, buy, sell, qty, net_pnl, days=None, symbols=None) -> "TradeAnalytics":
+        """Vectorized rebuild from column sequences; days are epoch days (NO_DAY if unknown)."""
+        import numpy as np
+
+        analytics = cls()
+        net = np.asarray(net_pnl, dtype=np.float64)
+        n = len(net)
+        if not n:
+            return analytics
+        qty = np.asarray(qty, dtype=np.float64)
+        buy = np.asarray(buy, dtype=np.float64)
+        sell = np.asarray(sell, dtype=np.float64)
+        charges = (sell - buy) * qty - net
+        turnover = (buy + sell) * qty
+        days = np.full(n, NO_DAY, dtype=np.int32) if days is None else np.asarray(days, dtype=np.int32)
+        if symbols is None:
+            codes = np.zeros(n, dtype=np.int32)
+            analytics._symbols = [None]
+        else:
+            analytics._symbols = list(dict.fromkeys(symbols))
+            index = {s: i for i, s in enumerate(analytics._symbols)}
+            codes = np.frombuffer(array("i", map(index.__getitem__, symbols)), dtype=np.int32)
+        analytics._symbol_codes = {s: i for i, s in enumerate(analytics._symbols)}
+
+        analytics._net = array("d", net.tobytes())
+        analytics._charges = array("d", charges.tobytes())
+        analytics._turnover = array("d", turnover.tobytes())
+        analytics._alive = array("b", bytes([1]) * n)
+        analytics._day = array("i", days.tobytes())
+        analytics._symbol = array("i", codes.tobytes())
+        analytics._size = n
+
+        wins, losses = net > 0, net < 0
+        analytics._totals = [
+            float(net.sum()), int(wins.sum()), int(losses.sum()),
+            float(net[wins].sum()), float(-net[losses].sum()),
+            float(charges.sum()), float(turnover.sum()),
+        ]
+        analytics._by_day = cls._group(days, net, wins, losses, charges, turnover)
+        analytics._by_symbol = cls._group(codes, net, wins, losses, charges, turnover)
+        analytics._build_tree()
+        return analytics
+
+    @staticmethod
+    def _group(keys, net, wins, losses, charges, turnover) -> dict:
+        import numpy as np
+
+        unique, inverse = np.unique(keys, return_inverse=True)
+        columns = [np.bincount(inverse, weights=w, minlength=len(unique)).tolist()
+                   for w in (None, net, wins, losses, charges, turnover)]
+        return {
+            int(key): [int(c), n, int(w), int(l), ch, t]
+            for key, c, n, w, l, ch, t in zip(unique.tolist(), *columns)
+        }
+
+    def _build_tree(self):
+        """Block summaries and every tree level, vectorized."""
+        import numpy as np
+
+        n = len(self._net)
+        cap = 1
+        while cap * BLOCK < n:
+            cap *= 2
+        values = np.zeros(cap * BLOCK)
+        alive = np.zeros(cap * BLOCK, dtype=np.int64)
+        if n:
+            alive[:n] = np.frombuffer(self._alive, dtype=np.int8)
+            values[:n] = np.frombuffer(self._net, dtype=np.float64) * alive[:n]
+
+        cnt, total, high, low, dd = (np.zeros(2 * cap) for _ in range(5))
+        running = values.reshape(cap, BLOCK).cumsum(axis=1)
+        cnt[cap:] = alive.reshape(cap, BLOCK).sum(axis=1)
+        total[cap:] = running[:, -1]
+        high[cap:] = np.maximum(running.max(axis=1), 0)
+        low[cap:] = np.minimum(running.min(axis=1), 0)
+        peaks = np.maximum.accumulate(np.maximum(running, 0), axis=1)
+        dd[cap:] = np.maximum((peaks - running).max(axis=1), 0)
+
+        width = cap // 2
+        while width:
+            node = np.arange(width, 2 * width)
+            left, right = 2 * node, 2 * node + 1
+            cnt[node] = cnt[left] + cnt[right]
+            total[node] = total[left] + total[right]
+            high[node] = np.maximum(high[left], total[left] + high[right])
+            low[node] = np.minimum(low[left], total[left] + low[right])
+            dd[node] = np.maximum(np.maximum(dd[left], dd[right]), high[left] - (total[left] + low[right]))
+            width //= 2
+
+        self._cap = cap
+        self._tcount = array("q", cnt.astype(np.int64).tobytes())
+        self._tsum, self._thigh, self._tlow, self._tdd = (
+            array("d", a.tobytes()) for a in (total, high, low, dd)
+        )
+
+    # ================= Updates =================
+    def add(self, buy: float, sell: float, qty: int, net_pnl: float,
+            trade_date: str = None, symbol: str = None) -> None:
+        slot = len(self._net)
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        charges = (sell - buy) * qty - net_pnl
+        turnover = (buy + sell) * qty
+        day = day_number(trade_date)
+
+        self._net.append(net_pnl)
+        self._charges.append(charges)
+        self._turnover.append(turnover)
+        self._alive.append(1)
+        self._day.append(day)
+        self._symbol.append(code)
+        self._size += 1
+        self._count(1, net_pnl, charges, turnover, day, code)
+
+        if slot >= self._cap * BLOCK:
+            self._grow()
+        self._update_block(slot // BLOCK)
+
+    def remove(self, index: int) -> None:
+        """Drop the index-th live trade (same indexing as TradeLedger.delete)."""
+        slot = self._slot(index)
+        self._alive[slot] = 0
+        self._size -= 1
+        self._count(-1, self._net[slot], self._charges[slot], self._turnover[slot],
+                    self._day[slot], self._symbol[slot])
+
+        dead = len(self._alive) - self._size
+        if dead >= COMPACT_MIN_DEAD and dead > self._size:
+            self._compact()
+        else:
+            self._update_block(slot // BLOCK)
+
+    def clear(self) -> None:
+        self._reset()
+
+    def _count(self, sign, net, charges, turnover, day, code):
+        win = sign if net > 0 else 0
+        loss = sign if net < 0 else 0
+        t = self._totals
+        t[0] += sign * net
+        t[1] += win
+        t[2] += loss
+        if net > 0:
+            t[3] += sign * net
+        elif net < 0:
+            t[4] -= sign * net
+        t[5] += sign * charges
+        t[6] += sign * turnover
+        for table, key in ((self._by_day, day), (self._by_symbol, code)):
+            r = table.get(key)
+            if r is None:
+                r = table[key] = [0, 0.0, 0, 0, 0.0, 0.0]
+            r[0] += sign
+            r[1] += sign * net
+            r[2] += win
+            r[3] += loss
+            r[4] += sign * charges
+            r[5] += sign * turnover
+            if not r[0]:
+                del table[key]
+
+    def _update_block(self, block):
+        net, alive = self._net, self._alive
+        start = block * BLOCK
+        running = high = low = dd = 0.0
+        count = 0
+        for slot in range(start, min(start + BLOCK, len(net))):
+            if alive[slot]:
+                count += 1
+                running += net[slot]
+                if running > high:
+                    high = running
+                elif high - running > dd:
+                    dd = high - running
+                if running < low:
+                    low = running
+
+        node = self._cap + block
+        self._tcount[node] = count
+        self._tsum[node], self._thigh[node], self._tlow[node], self._tdd[node] = running, high, low, dd
+        node //= 2
+        while node:
+            self._pull(node)
+            node //= 2
+
+    def _pull(self, node):
+        """Recompute a tree node from its two children."""
+        cnt, total, hi, lo, dd = self._tcount, self._tsum, self._thigh, self._tlow, self._tdd
+        left, right = 2 * node, 2 * node + 1
+        cnt[node] = cnt[left] + cnt[right]
+        total[node] = total[left] + total[right]
+        hi[node] = max(hi[left], total[left] + hi[right])
+        lo[node] = min(lo[left], total[left] + lo[right])
+        dd[node] = max(dd[left], dd[right], hi[left] - (total[left] + lo[right]))
+
+    def _grow(self):
+        """Double the leaf count; the old tree becomes the left half."""
+        cap = self._cap
+        for name in ("_tcount", "_tsum", "_thigh", "_tlow", "_tdd"):
+            old = getattr(self, name)
+            new = array(old.typecode, bytes(old.itemsize * 4 * cap))
+            new[2 * cap:3 * cap] = old[cap:]
+            setattr(self, name, new)
+        self._cap = 2 * cap
+        for node in range(2 * cap - 1, 0, -1):
+            self._pull(node)
+
+    def _compact(self):
+        keep = self._alive
+        self._net, self._charges, self._turnover, self._day, self._symbol = (
+            array(a.typecode, compress(a, keep))
+            for a in (self._net, self._charges, self._turnover, self._day, self._symbol)
+        )
+        self._alive = array("b", bytes([1]) * self._size)
+        self._build_tree()
+
+    # ================= Reads =================
+    def __len__(self):
+        return self._size
+
+    def summary(self) -> Summary:
+        """All headline statistics, in O(1)."""
+        net, wins, losses, profit, loss, charges, turnover = self._totals
+        n = self._size
+        if loss:
+            profit_factor = profit / loss
+        else:
+            profit_factor = float("inf") if profit else 0.0
+        return Summary(
+            trades=n, net_pnl=net, wins=wins, losses=losses,
+            win_rate=wins / n if n else 0.0,
+            profit_factor=profit_factor,
+            gross_profit=profit, gross_loss=loss,
+            max_drawdown=self._tdd[1],
+            current_drawdown=self._thigh[1] - self._tsum[1],
+            peak_equity=self._thigh[1],
+            charges=charges, turnover=turnover,
+            charges_pct=charges / turnover * 100 if turnover else 0.0,
+        )
+
+    def max_drawdown(self) -> float:
+        return self._tdd[1]
+
+    def day(self, trade_date) -> Rollup:
+        """Rollup for one ISO date (None: trades saved without a date)."""
+        return _rollup(self._by_day.get(day_number(trade_date), (0, 0.0, 0, 0, 0.0, 0.0)))
+
+    def symbol(self, symbol) -> Rollup:
+        code = self._symbol_codes.get(symbol)
+        return _rollup(self._by_symbol.get(code, (0, 0.0, 0, 0, 0.0, 0.0)))
+
+    def by_day(self) -> dict:
+        """{ISO date or None: Rollup}, oldest first."""
+        return {day_text(day): _rollup(r) for day, r in sorted(self._by_day.items())}
+
+    def by_symbol(self) -> dict:
+        return {self._symbols[code]: _rollup(r) for code, r in self._by_symbol.items()}
+
+    def equity_at(self, index: int) -> float:
+        """Cumulative net P&L through the index-th live trade, in O(log n + BLOCK)."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        block, before, rank = self._descend(index)
+        net, alive = self._net, self._alive
+        slot = block * BLOCK
+        while True:
+            if alive[slot]:
+                before += net[slot]
+                if not rank:
+                    return before
+                rank -= 1
+            slot += 1
+
+    def equity_curve(self, points: int = None) -> list:
+        """Equity after every live trade, or after `points` evenly spaced ones."""
+        if points is None or points >= self._size:
+            return list(accumulate(compress(self._net, self._alive)))
+        if points <= 0:
+            return []
+        step = (self._size - 1) / max(1, points - 1)
+        return [self.equity_at(round(i * step)) for i in range(points)]
+
+    # ================= Internals =================
+    def _descend(self, index):
+        """(block, equity before that block, rank of the trade inside it)."""
+        cnt, total = self._tcount, self._tsum
+        node = 1
+        before = 0.0
+        while node < self._cap:
+            left = 2 * node
+            if index < cnt[left]:
+                node = left
+            else:
+                index -= cnt[left]
+                before += total[left]
+                node = left + 1
+        return node - self._cap, before, index
+
+    def _slot(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        block, _, rank = self._descend(index)
+        alive = self._alive
+        slot = block * BLOCK
+        while True:
+            if alive[slot]:
+                if not rank:
+                    return slot
+                rank -= 1
+            slot += 1
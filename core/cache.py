@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from core.calculator import zerodha_pnl
+from core.schedule import DEFAULT_SCHEDULE
+from core.utils import validate_inputs
+
+DEFAULT_MAXSIZE = 4096
+
+
+class QuoteCache:
+    """
+    Bounded LRU cache in front of zerodha_pnl.
+
+    Keys are normalized inputs (float prices, int quantity) plus the compiled
+    rate row that applies, so "nse"/"NSE" or two dates under the same rate
+    version share an entry. Results are read-only mappings; swapping the
+    schedule with set_schedule() drops every entry.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, schedule=DEFAULT_SCHEDULE):
+        self.maxsize = maxsize
+        self.schedule = schedule
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def quote(self, buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE",
+              segment: str = "intraday", trade_date=None) -> MappingProxyType:
+        validate_inputs(buy_price, sell_price, quantity, exchange)
+        rates = self.schedule.lookup(segment, exchange, trade_date)
+        key = (float(buy_price), float(sell_price), int(quantity), rates)
+
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = MappingProxyType(zerodha_pnl(
+            buy_price, sell_price, quantity, exchange, segment, trade_date, self.schedule
+        ))
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def set_schedule(self, schedule) -> None:
+        """Switch rate schedules; cached quotes priced on the old one are dropped."""
+        with self._lock:
+            if schedule.fingerprint != self.schedule.fingerprint:
+                self._entries.clear()
+            self.schedule = schedule
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+
+QUOTE_CACHE = QuoteCache()
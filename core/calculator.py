@@ -4,7 +4,9 @@ from core.constants import (
     STT_RATE, SEBI_CHARGE_RATE,
     STAMP_DUTY_RATE, GST_RATE
 )
-from core.utils import validate_inputs, round2
+from core import metrics
+from core.schedule import DEFAULT_SCHEDULE
+from core.utils import validate_inputs, validate_inputs_batch, round2, round2_array
 
 
 def zerodha_intraday_pnl1(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE") -> dict:
@@ -78,11 +80,10 @@ def calculate_brokerage(buy_turnover: float, sell_turnover: float) -> float:
     brokerage_sell = min(BROKERAGE_CAP, BROKERAGE_RATE * sell_turnover)
     return brokerage_buy + brokerage_sell
 
+EXCHANGE_TXN_CHARGES = {"NSE": NSE_TXN_CHARGE, "BSE": BSE_TXN_CHARGE}
+
 def calculate_exchange_txn(total_turnover: float, exchange: str) -> float:
-    if exchange.upper() == "NSE":
-        return NSE_TXN_CHARGE * total_turnover
-    else:
-        return BSE_TXN_CHARGE * total_turnover
+    return EXCHANGE_TXN_CHARGES.get(exchange.upper(), BSE_TXN_CHARGE) * total_turnover
 
 def calculate_statutory_charges(buy_turnover: float, sell_turnover: float, total_turnover: float, brokerage: float, exchange_txn: float) -> dict:
     stt = STT_RATE * sell_turnover
@@ -108,76 +109,408 @@ def calculate_pnl(buy_price: float, sell_price: float, quantity: int, total_char
         "Points to Breakeven": points_to_breakeven
     }
 
+@metrics.timed("calculator.intraday_pnl")
 def zerodha_intraday_pnl(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE") -> dict:
+    """
+    Pure, print-free Zerodha Intraday Equity P&L.
+    Computes the charge pipeline once; use format_pnl_report to render it.
+    """
     validate_inputs(buy_price, sell_price, quantity, exchange)
-    zerodha_intraday_pnl_report(buy_price, sell_price,quantity,exchange)
-    turnovers = calculate_turnover(buy_price, sell_price, quantity)
-    brokerage = calculate_brokerage(turnovers["buy_turnover"], turnovers["sell_turnover"])
-    exchange_txn = calculate_exchange_txn(turnovers["total_turnover"], exchange)
-    statutory_charges = calculate_statutory_charges(
-        turnovers["buy_turnover"], turnovers["sell_turnover"], turnovers["total_turnover"], brokerage, exchange_txn
+
+    buy_turnover = buy_price * quantity
+    sell_turnover = sell_price * quantity
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        min(BROKERAGE_CAP, BROKERAGE_RATE * buy_turnover)
+        + min(BROKERAGE_CAP, BROKERAGE_RATE * sell_turnover)
     )
-    total_charges = brokerage + statutory_charges["Total Statutory Charges"]
-    pnl = calculate_pnl(buy_price, sell_price, quantity, total_charges)
+    exchange_txn = calculate_exchange_txn(total_turnover, exchange)
+
+    stt = STT_RATE * sell_turnover
+    sebi = SEBI_CHARGE_RATE * total_turnover
+    stamp_duty = STAMP_DUTY_RATE * buy_turnover
+    gst = GST_RATE * (brokerage + exchange_txn + sebi)
+    total_charges = brokerage + (stt + sebi + stamp_duty + exchange_txn + gst)
+
+    gross_pnl = (sell_price - buy_price) * quantity
+    net_pnl = gross_pnl - total_charges
 
     return {
-        "Turnover": round2(turnovers["total_turnover"]),
+        "Turnover": round2(total_turnover),
         "Zerodha Brokerage": round2(brokerage),
         "Exchange Txn Charges": round2(exchange_txn),
-        "SEBI Charges": round2(statutory_charges["SEBI"]),
-        "Stamp Duty": round2(statutory_charges["Stamp Duty"]),
-        "STT": round2(statutory_charges["STT"]),
-        "GST": round2(statutory_charges["GST"]),
+        "SEBI Charges": round2(sebi),
+        "Stamp Duty": round2(stamp_duty),
+        "STT": round2(stt),
+        "GST": round2(gst),
         "Total Charges": round2(total_charges),
-        "Points to Breakeven": round2(pnl["Points to Breakeven"]),
-        "Gross P&L": round2(pnl["Gross P&L"]),
-        "Net P&L": round2(pnl["Net P&L"])
+        "Points to Breakeven": round2(total_charges / quantity),
+        "Gross P&L": round2(gross_pnl),
+        "Net P&L": round2(net_pnl)
     }
 
-def zerodha_intraday_pnl_report(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE") -> None:
+@metrics.timed("calculator.intraday_pnl_batch")
+def zerodha_intraday_pnl_batch(buy_prices, sell_prices, quantities, exchanges="NSE", out=None) -> dict:
     """
-    Prints a detailed Zerodha intraday P&L report with additional metrics:
-    - Break-even margin % of money invested
-    - Profit % of money invested
+    Vectorized Zerodha Intraday Equity P&L over columnar inputs.
+    Returns the same keys as zerodha_intraday_pnl, each mapped to a NumPy
+    array, plus a boolean "Valid" mask. Rows failing validation are NaN.
+
+    out may map some of those keys to preallocated float64 arrays (e.g.
+    columns of a memory-mapped archive); they are filled in place and
+    returned in the result instead of new arrays.
+    """
+    # Imported here so scalar-only callers (CLI, GUI) start without NumPy.
+    import numpy as np
+
+    buy = np.asarray(buy_prices, dtype=np.float64)
+    sell = np.asarray(sell_prices, dtype=np.float64)
+    qty = np.asarray(quantities, dtype=np.float64)
+    # The exchange is not broadcast itself: a single "NSE" stays a scalar
+    # instead of becoming a row-sized string array.
+    exchange = np.char.upper(np.asarray(exchanges, dtype=str))
+    buy, sell, qty, _ = np.broadcast_arrays(buy, sell, qty, exchange)
+
+    valid = validate_inputs_batch(buy, sell, qty, exchange)
+
+    # --- Basic Turnovers ---
+    buy_turnover = buy * qty
+    sell_turnover = sell * qty
+    total_turnover = buy_turnover + sell_turnover
+
+    # --- Brokerage ---
+    brokerage = (
+        np.minimum(BROKERAGE_CAP, BROKERAGE_RATE * buy_turnover)
+        + np.minimum(BROKERAGE_CAP, BROKERAGE_RATE * sell_turnover)
+    )
+
+    # --- Exchange Txn Charges ---
+    exchange_txn = np.where(exchange == "NSE", NSE_TXN_CHARGE, BSE_TXN_CHARGE) * total_turnover
+
+    # --- Statutory Charges ---
+    stt = STT_RATE * sell_turnover
+    sebi = SEBI_CHARGE_RATE * total_turnover
+    stamp_duty = STAMP_DUTY_RATE * buy_turnover
+    gst = GST_RATE * (brokerage + exchange_txn + sebi)
+    total_statutory = stt + sebi + stamp_duty + exchange_txn + gst
+    total_charges = brokerage + total_statutory
+
+    # --- P&L ---
+    gross_pnl = (sell - buy) * qty
+    net_pnl = gross_pnl - total_charges
+    with np.errstate(divide="ignore", invalid="ignore"):
+        points_to_breakeven = total_charges / qty
+
+    columns = {
+        "Turnover": total_turnover,
+        "Zerodha Brokerage": brokerage,
+        "Exchange Txn Charges": exchange_txn,
+        "SEBI Charges": sebi,
+        "Stamp Duty": stamp_duty,
+        "STT": stt,
+        "GST": gst,
+        "Total Charges": total_charges,
+        "Points to Breakeven": points_to_breakeven,
+        "Gross P&L": gross_pnl,
+        "Net P&L": net_pnl
+    }
+    out = out or {}
+    result = {}
+    for key, value in columns.items():
+        if key in out:
+            target = out[key]
+            round2_array(value, out=target)
+            target[~valid] = np.nan
+            result[key] = target
+        else:
+            result[key] = np.where(valid, round2_array(value), np.nan)
+    result["Valid"] = valid
+    return result
+
+# ================= Exact (integer paise) =================
+PAISE = 100
+# Every rate is an integer over RATE_SCALE, so charges are exact integer
+# products; _scaled rejects a rate that needs more decimals.
+RATE_SCALE = 10 ** 7
+_HALF = RATE_SCALE // 2
+
+
+def _scaled(rate: float) -> int:
+    scaled = round(rate * RATE_SCALE)
+    if abs(scaled - rate * RATE_SCALE) > 1e-6:
+        raise ValueError(f"Rate {rate} has more than 7 decimals.")
+    return scaled
+
+
+BROKERAGE_SCALED = _scaled(BROKERAGE_RATE)
+BROKERAGE_CAP_PAISE = round(BROKERAGE_CAP * PAISE)
+TXN_SCALED = {"NSE": _scaled(NSE_TXN_CHARGE), "BSE": _scaled(BSE_TXN_CHARGE)}
+STT_SCALED = _scaled(STT_RATE)
+SEBI_SCALED = _scaled(SEBI_CHARGE_RATE)
+STAMP_SCALED = _scaled(STAMP_DUTY_RATE)
+GST_SCALED = _scaled(GST_RATE)
+
+
+def to_paise(rupees) -> int:
+    """Rupees (number or numeric string) to the nearest whole paisa."""
+    return round(float(rupees) * PAISE)
+
+
+def paise_to_rupees(result: dict) -> dict:
+    """A paise result in rupees; each value is the float nearest its 2-decimal amount."""
+    return {key: value / PAISE for key, value in result.items()}
+
+
+@metrics.timed("calculator.intraday_pnl_paise")
+def zerodha_intraday_pnl_paise(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE") -> dict:
+    """
+    Exact Zerodha Intraday Equity P&L in integer paise, as on a contract note.
+    Prices are taken to the nearest paisa. Each charge is rounded half up to
+    the paisa, STT to the nearest rupee, and Total Charges is the sum of the
+    rounded charges, so totals over any number of trades add up exactly.
     """
     validate_inputs(buy_price, sell_price, quantity, exchange)
+    if quantity != int(quantity):
+        raise ValueError("Quantity must be a whole number.")
+    buy = round(buy_price * PAISE)
+    sell = round(sell_price * PAISE)
+    qty = int(quantity)
 
-    # --- Calculations ---
-    invested = buy_price * quantity
-    turnovers = calculate_turnover(buy_price, sell_price, quantity)
-    brokerage = calculate_brokerage(turnovers["buy_turnover"], turnovers["sell_turnover"])
-    exchange_txn = calculate_exchange_txn(turnovers["total_turnover"], exchange)
-    statutory_charges = calculate_statutory_charges(
-        turnovers["buy_turnover"], turnovers["sell_turnover"], turnovers["total_turnover"], brokerage, exchange_txn
+    buy_turnover = buy * qty
+    sell_turnover = sell * qty
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        min(BROKERAGE_CAP_PAISE, (BROKERAGE_SCALED * buy_turnover + _HALF) // RATE_SCALE)
+        + min(BROKERAGE_CAP_PAISE, (BROKERAGE_SCALED * sell_turnover + _HALF) // RATE_SCALE)
     )
-    total_charges = brokerage + statutory_charges["Total Statutory Charges"]
-    pnl = calculate_pnl(buy_price, sell_price, quantity, total_charges)
-
-    # --- Additional metrics ---
-    break_even_margin_pct = (total_charges / turnovers["buy_turnover"]) * 100
-    profit_pct = (pnl["Net P&L"] / turnovers["buy_turnover"]) * 100
-
-    # --- Report ---
-    print(f"Exchange: {exchange.upper()}")
-    print("-" * 40)
-    print(f"{'Buy Price':25}: {buy_price}")
-    print(f"{'Sell Price':25}: {sell_price}")
-    print(f"{'Invested':25}: {invested}")
-    print("-" * 40)
-    print(f"{'Turnover':25}: {round2(turnovers['total_turnover'])}")
-    print(f"{'Zerodha Brokerage':25}: {round2(brokerage)}")
-    print(f"{'Exchange Txn Charges':25}: {round2(exchange_txn)}")
-    print(f"{'SEBI Charges':25}: {round2(statutory_charges['SEBI'])}")
-    print(f"{'Stamp Duty':25}: {round2(statutory_charges['Stamp Duty'])}")
-    print(f"{'STT':25}: {round2(statutory_charges['STT'])}")
-    print(f"{'GST':25}: {round2(statutory_charges['GST'])}")
-    print("-" * 40)
-    print(f"{'Total Charges':25}: {round2(total_charges)}")
-    print("-" * 40)
-    print(f"{'Points to Breakeven':25}: {round2(pnl['Points to Breakeven'])}")
-    print(f"{'Break-even Margin %':25}: {round2(break_even_margin_pct)}%")
-    print("-" * 40)
-    print(f"{'Gross P&L':25}: {round2(pnl['Gross P&L'])}")
-    print(f"{'Net P&L':25}: {round2(pnl['Net P&L'])}")
-    print(f"{'Profit %':25}: {round2(profit_pct)}%")
-    print("-" * 40)
\ No newline at end of file
+    exchange_txn = (TXN_SCALED[exchange.upper()] * total_turnover + _HALF) // RATE_SCALE
+    stt = (STT_SCALED * sell_turnover + _HALF * PAISE) // (RATE_SCALE * PAISE) * PAISE
+    sebi = (SEBI_SCALED * total_turnover + _HALF) // RATE_SCALE
+    stamp_duty = (STAMP_SCALED * buy_turnover + _HALF) // RATE_SCALE
+    gst = (GST_SCALED * (brokerage + exchange_txn + sebi) + _HALF) // RATE_SCALE
+    total_charges = brokerage + stt + sebi + stamp_duty + exchange_txn + gst
+    gross_pnl = (sell - buy) * qty
+
+    return {
+        "Turnover": total_turnover,
+        "Zerodha Brokerage": brokerage,
+        "Exchange Txn Charges": exchange_txn,
+        "SEBI Charges": sebi,
+        "Stamp Duty": stamp_duty,
+        "STT": stt,
+        "GST": gst,
+        "Total Charges": total_charges,
+        "Points to Breakeven": (2 * total_charges + qty) // (2 * qty),
+        "Gross P&L": gross_pnl,
+        "Net P&L": gross_pnl - total_charges
+    }
+
+@metrics.timed("calculator.intraday_pnl_batch_paise")
+def zerodha_intraday_pnl_batch_paise(buy_prices, sell_prices, quantities, exchanges="NSE") -> dict:
+    """
+    Vectorized zerodha_intraday_pnl_paise: int64 arrays of paise plus the
+    "Valid" mask. Invalid rows, including fractional quantities, are 0
+    (integers have no NaN). Exact while a row's turnover stays under about
+    3e15 paise.
+    """
+    import numpy as np
+
+    exchange = np.char.upper(np.asarray(exchanges, dtype=str))
+    buy_in, sell_in, qty_in, _ = np.broadcast_arrays(
+        np.asarray(buy_prices, dtype=np.float64), np.asarray(sell_prices, dtype=np.float64),
+        np.asarray(quantities), exchange)
+    valid = validate_inputs_batch(buy_in, sell_in, qty_in, exchange) & (qty_in % 1 == 0)
+
+    buy = np.where(valid, np.rint(buy_in * PAISE), 0).astype(np.int64)
+    sell = np.where(valid, np.rint(sell_in * PAISE), 0).astype(np.int64)
+    qty = np.where(valid, qty_in, 1).astype(np.int64)
+
+    buy_turnover = buy * qty
+    sell_turnover = sell * qty
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        np.minimum(BROKERAGE_CAP_PAISE, (BROKERAGE_SCALED * buy_turnover + _HALF) // RATE_SCALE)
+        + np.minimum(BROKERAGE_CAP_PAISE, (BROKERAGE_SCALED * sell_turnover + _HALF) // RATE_SCALE)
+    )
+    txn_scaled = np.where(exchange == "NSE", TXN_SCALED["NSE"], TXN_SCALED["BSE"])
+    exchange_txn = (txn_scaled * total_turnover + _HALF) // RATE_SCALE
+    stt = (STT_SCALED * sell_turnover + _HALF * PAISE) // (RATE_SCALE * PAISE) * PAISE
+    sebi = (SEBI_SCALED * total_turnover + _HALF) // RATE_SCALE
+    stamp_duty = (STAMP_SCALED * buy_turnover + _HALF) // RATE_SCALE
+    gst = (GST_SCALED * (brokerage + exchange_txn + sebi) + _HALF) // RATE_SCALE
+    total_charges = brokerage + stt + sebi + stamp_duty + exchange_txn + gst
+    gross_pnl = (sell - buy) * qty
+
+    columns = {
+        "Turnover": total_turnover,
+        "Zerodha Brokerage": brokerage,
+        "Exchange Txn Charges": exchange_txn,
+        "SEBI Charges": sebi,
+        "Stamp Duty": stamp_duty,
+        "STT": stt,
+        "GST": gst,
+        "Total Charges": total_charges,
+        "Points to Breakeven": (2 * total_charges + qty) // (2 * qty),
+        "Gross P&L": gross_pnl,
+        "Net P&L": gross_pnl - total_charges
+    }
+    # np.where keeps 0-d results for scalar inputs, like the float batch.
+    result = {key: np.where(valid, value, 0) for key, value in columns.items()}
+    result["Valid"] = valid
+    return result
+
+@metrics.timed("calculator.pnl")
+def zerodha_pnl(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE",
+               segment: str = "intraday", trade_date=None, schedule=DEFAULT_SCHEDULE) -> dict:
+    """
+    P&L for any segment (intraday, delivery, futures, options) using the
+    charge schedule in effect on trade_date (default today).
+    Returns the same keys as zerodha_intraday_pnl.
+    """
+    validate_inputs(buy_price, sell_price, quantity, exchange)
+    r = schedule.lookup(segment, exchange, trade_date)
+
+    buy_turnover = buy_price * quantity
+    sell_turnover = sell_price * quantity
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        min(r.brokerage_cap, r.brokerage_rate * buy_turnover)
+        + min(r.brokerage_cap, r.brokerage_rate * sell_turnover)
+    )
+    exchange_txn = r.txn_rate * total_turnover
+    stt = r.stt_buy_rate * buy_turnover + r.stt_sell_rate * sell_turnover
+    sebi = r.sebi_rate * total_turnover
+    stamp_duty = r.stamp_rate * buy_turnover
+    gst = r.gst_rate * (brokerage + exchange_txn + sebi)
+    total_charges = brokerage + (stt + sebi + stamp_duty + exchange_txn + gst)
+
+    gross_pnl = (sell_price - buy_price) * quantity
+    net_pnl = gross_pnl - total_charges
+
+    return {
+        "Turnover": round2(total_turnover),
+        "Zerodha Brokerage": round2(brokerage),
+        "Exchange Txn Charges": round2(exchange_txn),
+        "SEBI Charges": round2(sebi),
+        "Stamp Duty": round2(stamp_duty),
+        "STT": round2(stt),
+        "GST": round2(gst),
+        "Total Charges": round2(total_charges),
+        "Points to Breakeven": round2(total_charges / quantity),
+        "Gross P&L": round2(gross_pnl),
+        "Net P&L": round2(net_pnl)
+    }
+
+@metrics.timed("calculator.pnl_batch")
+def zerodha_pnl_batch(buy_prices, sell_prices, quantities, exchanges="NSE", segments="intraday",
+                      trade_dates=None, schedule=DEFAULT_SCHEDULE) -> dict:
+    """
+    Vectorized zerodha_pnl. Rates for every row come from one gather on the
+    compiled schedule; rows with an unknown segment/exchange or a date before
+    the first schedule are flagged in "Valid" like other invalid input.
+    """
+    import numpy as np
+
+    buy = np.asarray(buy_prices, dtype=np.float64)
+    sell = np.asarray(sell_prices, dtype=np.float64)
+    qty = np.asarray(quantities, dtype=np.float64)
+    buy, sell, qty = np.broadcast_arrays(buy, sell, qty)
+
+    rates, known = schedule.lookup_batch(
+        np.broadcast_to(np.asarray(segments, dtype=str), buy.shape),
+        np.broadcast_to(np.asarray(exchanges, dtype=str), buy.shape),
+        trade_dates
+    )
+    (brokerage_rate, brokerage_cap, txn_rate, stt_buy_rate,
+     stt_sell_rate, stamp_rate, sebi_rate, gst_rate) = rates.T
+    valid = validate_inputs_batch(buy, sell, qty, exchanges) & known
+
+    buy_turnover = buy * qty
+    sell_turnover = sell * qty
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        np.minimum(brokerage_cap, brokerage_rate * buy_turnover)
+        + np.minimum(brokerage_cap, brokerage_rate * sell_turnover)
+    )
+    exchange_txn = txn_rate * total_turnover
+    stt = stt_buy_rate * buy_turnover + stt_sell_rate * sell_turnover
+    sebi = sebi_rate * total_turnover
+    stamp_duty = stamp_rate * buy_turnover
+    gst = gst_rate * (brokerage + exchange_txn + sebi)
+    total_charges = brokerage + (stt + sebi + stamp_duty + exchange_txn + gst)
+
+    gross_pnl = (sell - buy) * qty
+    net_pnl = gross_pnl - total_charges
+    with np.errstate(divide="ignore", invalid="ignore"):
+        points_to_breakeven = total_charges / qty
+
+    columns = {
+        "Turnover": total_turnover,
+        "Zerodha Brokerage": brokerage,
+        "Exchange Txn Charges": exchange_txn,
+        "SEBI Charges": sebi,
+        "Stamp Duty": stamp_duty,
+        "STT": stt,
+        "GST": gst,
+        "Total Charges": total_charges,
+        "Points to Breakeven": points_to_breakeven,
+        "Gross P&L": gross_pnl,
+        "Net P&L": net_pnl
+    }
+    result = {
+        key: np.where(valid, round2_array(value), np.nan)
+        for key, value in columns.items()
+    }
+    result["Valid"] = valid
+    return result
+
+def format_pnl_report(buy_price: float, sell_price: float, quantity: int, exchange: str, result: dict) -> str:
+    """
+    Renders a detailed P&L report from a zerodha_intraday_pnl result with additional metrics:
+    - Break-even margin % of money invested
+    - Profit % of money invested
+    """
+    invested = buy_price * quantity
+    break_even_margin_pct = (result["Total Charges"] / invested) * 100
+    profit_pct = (result["Net P&L"] / invested) * 100
+    rule = "-" * 40
+
+    lines = [
+        f"Exchange: {exchange.upper()}",
+        rule,
+        f"{'Buy Price':25}: {buy_price}",
+        f"{'Sell Price':25}: {sell_price}",
+        f"{'Invested':25}: {invested}",
+        rule,
+    ]
+    for key in ("Turnover", "Zerodha Brokerage", "Exchange Txn Charges",
+                "SEBI Charges", "Stamp Duty", "STT", "GST"):
+        lines.append(f"{key:25}: {result[key]}")
+    lines += [
+        rule,
+        f"{'Total Charges':25}: {result['Total Charges']}",
+        rule,
+        f"{'Points to Breakeven':25}: {result['Points to Breakeven']}",
+        f"{'Break-even Margin %':25}: {round2(break_even_margin_pct)}%",
+        rule,
+        f"{'Gross P&L':25}: {result['Gross P&L']}",
+        f"{'Net P&L':25}: {result['Net P&L']}",
+        f"{'Profit %':25}: {round2(profit_pct)}%",
+        rule,
+    ]
+    return "\n".join(lines)
+
+def zerodha_intraday_pnl_report(buy_price: float, sell_price: float, quantity: int, exchange: str = "NSE",
+                                result: dict = None) -> None:
+    """
+    Prints a detailed Zerodha intraday P&L report.
+    Pass an existing result to avoid recomputing the charges.
+    """
+    if result is None:
+        result = zerodha_intraday_pnl(buy_price, sell_price, quantity, exchange)
+    print(format_pnl_report(buy_price, sell_price, quantity, exchange, result))
@@ -0,0 +1,63 @@
+import csv
+import random
+import time
+from typing import NamedTuple
+
+
+class Tick(NamedTuple):
+    ts: int          # time.perf_counter_ns() when the tick was emitted
+    symbol: str
+    price: float
+
+
+def simulated_feed(prices: dict, count: int, seed: int = 0, volatility: float = 0.0005,
+                   tick_size: float = 0.05):
+    """
+    Offline quote feed: a random walk over prices ({symbol: start price}),
+    one symbol per tick, snapped to tick_size. Ticks are stamped as they are
+    generated so consumers can measure end-to-end latency.
+    """
+    rng = random.Random(seed)
+    symbols = list(prices)
+    last = [float(prices[s]) for s in symbols]
+    n = len(symbols)
+    rand, gauss, now = rng.randrange, rng.gauss, time.perf_counter_ns
+    for _ in range(count):
+        i = rand(n)
+        price = round(last[i] * (1 + gauss(0, volatility)) / tick_size) * tick_size
+        if price <= 0:
+            price = tick_size
+        last[i] = price
+        yield Tick(now(), symbols[i], round(price, 2))
+
+
+def write_ticks(ticks, path: str, start_ns: int = None) -> int:
+    """Record ticks to CSV (seconds since the first tick, symbol, price) for replay."""
+    count = 0
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["time", "symbol", "price"])
+        for tick in ticks:
+            if start_ns is None:
+                start_ns = tick.ts
+            w.writerow([f"{(tick.ts - start_ns) / 1e9:.6f}", tick.symbol, tick.price])
+            count += 1
+    return count
+
+
+def replay_feed(path: str, speed: float = 0.0):
+    """
+    Replay a recorded CSV feed. speed=0 replays as fast as possible;
+    speed=1 keeps the recorded pacing, 2 plays twice as fast.
+    """
+    now = time.perf_counter_ns
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        start = now()
+        for at, symbol, price in reader:
+            if speed:
+                delay = float(at) / speed - (now() - start) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+            yield Tick(now(), symbol, float(price))
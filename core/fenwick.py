@@ -0,0 +1,69 @@
+from array import array
+
+
+class FenwickTree:
+    """
+    Binary indexed tree over a growable array of numbers.
+    Point updates, appends and prefix sums are O(log n).
+    """
+    __slots__ = ("_tree",)
+
+    def __init__(self, values=(), typecode: str = "d"):
+        tree = array(typecode, values)
+        # O(n) build: push each node's partial sum into its parent.
+        n = len(tree)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent - 1] += tree[i - 1]
+        self._tree = tree
+
+    def __len__(self):
+        return len(self._tree)
+
+    def copy(self) -> "FenwickTree":
+        tree = FenwickTree.__new__(FenwickTree)
+        tree._tree = self._tree[:]
+        return tree
+
+    def append(self, value) -> None:
+        """Add a new element at the end."""
+        i = len(self._tree) + 1
+        # Node i covers (i - lowbit(i), i]; its existing part is a range sum.
+        self._tree.append(value + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    def add(self, index: int, delta) -> None:
+        """Add delta to the element at 0-based index."""
+        tree = self._tree
+        n = len(tree)
+        i = index + 1
+        while i <= n:
+            tree[i - 1] += delta
+            i += i & -i
+
+    def prefix_sum(self, count: int):
+        """Sum of the first count elements."""
+        tree = self._tree
+        total = 0
+        i = count
+        while i > 0:
+            total += tree[i - 1]
+            i -= i & -i
+        return total
+
+    def find(self, target) -> int:
+        """
+        Smallest 0-based index whose prefix sum reaches target.
+        Requires non-negative elements (e.g. a tree of live-row counts).
+        """
+        tree = self._tree
+        n = len(tree)
+        pos = 0
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt - 1] < target:
+                pos = nxt
+                target -= tree[nxt - 1]
+            step >>= 1
+        return pos
@@ -0,0 +1,195 @@
+from array import array
+from datetime import date
+from functools import lru_cache
+from itertools import compress
+from typing import NamedTuple
+
+from core.calculator import PAISE, zerodha_intraday_pnl
+from core.fenwick import FenwickTree
+from core.schedule import EPOCH_ORDINAL, to_epoch_day
+from core.utils import plain_number
+
+# Compact once deleted slots outnumber live ones (and are worth the O(n) pass).
+COMPACT_MIN_DEAD = 1024
+# Day column value for trades saved without a date.
+NO_DAY = -1
+
+
+class Trade(NamedTuple):
+    buy: float
+    sell: float
+    qty: int
+    net_pnl: float
+
+
+def trade_record(trade: Trade, trade_date: str = None) -> dict:
+    """A trade in the saved list-of-dicts format."""
+    record = {"buy": plain_number(trade.buy), "sell": plain_number(trade.sell),
+              "qty": trade.qty, "net_pnl": plain_number(trade.net_pnl)}
+    if trade_date:
+        record["date"] = trade_date
+    return record
+
+
+@lru_cache(maxsize=4096)
+def day_number(trade_date) -> int:
+    """ISO date (or None) -> day column value."""
+    return NO_DAY if trade_date is None else to_epoch_day(trade_date)
+
+
+@lru_cache(maxsize=4096)
+def day_text(day: int):
+    """Day column value -> ISO date, or None for NO_DAY."""
+    return None if day == NO_DAY else date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+
+class TradeLedger:
+    """
+    Compact trade ledger stored as typed array columns (struct-of-arrays).
+    Each trade costs 36 bytes instead of a dict with four boxed values; the
+    optional trade date is kept as an epoch-day column.
+
+    Deletes leave a tombstone slot so that a Fenwick tree over net P&L can be
+    updated in O(log n); a second tree of live counts maps row positions to
+    slots. Cumulative P&L for any row is a prefix query, the total is O(1).
+    Both sums are kept in integer paise, so edits and deletes never drift.
+    """
+    __slots__ = ("_buy", "_sell", "_qty", "_net_pnl", "_day", "_alive",
+                 "_live", "_sums", "_size", "_total")
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self, buy=(), sell=(), qty=(), net_pnl=(), day=None):
+        self._buy = array("d", buy)
+        self._sell = array("d", sell)
+        self._qty = array("q", qty)
+        self._net_pnl = array("d", net_pnl)
+        n = len(self._net_pnl)
+        self._day = array("i", day) if day is not None else array("i", [NO_DAY]) * n
+        self._alive = array("b", bytes([1]) * n)
+        self._live = FenwickTree(self._alive, "q")
+        paise = [round(v * PAISE) for v in self._net_pnl]
+        self._sums = FenwickTree(paise, "q")
+        self._size = n
+        self._total = sum(paise)
+
+    @classmethod
+    def from_records(cls, records) -> "TradeLedger":
+        """Build a ledger from the saved list-of-dicts format."""
+        dates = [r.get("date") for r in records]
+        days = {d: day_number(d) for d in set(dates)}
+        ledger = cls()
+        ledger._reset(
+            (r["buy"] for r in records),
+            (r["sell"] for r in records),
+            (r["qty"] for r in records),
+            (r["net_pnl"] for r in records),
+            map(days.__getitem__, dates),
+        )
+        return ledger
+
+    def to_records(self) -> list:
+        """Serialize back to the list-of-dicts format used by AppState."""
+        days = self.column("day")
+        texts = {d: day_text(d) for d in set(days)}
+        return [trade_record(t, texts[d]) for t, d in zip(self, days)]
+
+    def copy(self) -> "TradeLedger":
+        """Independent copy made with array memcpy, cheap enough for the UI thread."""
+        ledger = TradeLedger.__new__(TradeLedger)
+        for name in ("_buy", "_sell", "_qty", "_net_pnl", "_day", "_alive"):
+            values = getattr(self, name)
+            setattr(ledger, name, values[:])
+        ledger._live = self._live.copy()
+        ledger._sums = self._sums.copy()
+        ledger._size = self._size
+        ledger._total = self._total
+        return ledger
+
+    def append(self, buy: float, sell: float, qty: int, net_pnl: float, trade_date: str = None) -> None:
+        self._buy.append(buy)
+        self._sell.append(sell)
+        self._qty.append(qty)
+        self._net_pnl.append(net_pnl)
+        self._day.append(day_number(trade_date))
+        self._alive.append(1)
+        self._live.append(1)
+        paise = round(net_pnl * PAISE)
+        self._sums.append(paise)
+        self._size += 1
+        self._total += paise
+
+    def add_trade(self, buy: float, sell: float, qty: int, exchange: str = "NSE",
+                  trade_date: str = None) -> Trade:
+        """Price a trade with the calculator and append it."""
+        net = zerodha_intraday_pnl(buy, sell, qty, exchange)["Net P&L"]
+        self.append(buy, sell, qty, net, trade_date)
+        return self[-1]
+
+    def delete(self, index: int) -> Trade:
+        slot = self._slot(index)
+        trade = self._trade(slot)
+        self._alive[slot] = 0
+        self._live.add(slot, -1)
+        paise = round(trade.net_pnl * PAISE)
+        self._sums.add(slot, -paise)
+        self._size -= 1
+        self._total -= paise
+
+        dead = len(self._alive) - self._size
+        if dead >= COMPACT_MIN_DEAD and dead > self._size:
+            self._compact()
+        return trade
+
+    def clear(self) -> None:
+        self._reset()
+
+    def cumulative(self, index: int) -> float:
+        """Net P&L of rows 0..index inclusive, in O(log n)."""
+        return self._sums.prefix_sum(self._slot(index) + 1) / PAISE
+
+    def total_net_pnl(self) -> float:
+        return self._total / PAISE
+
+    def trade_date(self, index: int):
+        """ISO date of a row, or None if it was saved without one."""
+        return day_text(self._day[self._slot(index)])
+
+    def column(self, name: str) -> array:
+        """Live values of one column ("buy", "sell", "qty", "net_pnl" or "day")."""
+        values = getattr(self, "_" + name)
+        if self._size == len(values):
+            return array(values.typecode, values)
+        return array(values.typecode, compress(values, self._alive))
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index: int) -> Trade:
+        return self._trade(self._slot(index))
+
+    def __iter__(self):
+        return map(Trade._make, self._rows())
+
+    # ================= Internals =================
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        if self._size == len(self._alive):
+            return index
+        return self._live.find(index + 1)
+
+    def _trade(self, slot: int) -> Trade:
+        return Trade(self._buy[slot], self._sell[slot], self._qty[slot], self._net_pnl[slot])
+
+    def _rows(self):
+        rows = zip(self._buy, self._sell, self._qty, self._net_pnl)
+        if self._size == len(self._alive):
+            return rows
+        return compress(rows, self._alive)
+
+    def _compact(self):
+        self._reset(*(self.column(name) for name in ("buy", "sell", "qty", "net_pnl", "day")))
@@ -0,0 +1,310 @@
+"""
+Opt-in instrumentation: timers, counters, histograms and session profiles.
+
+    ZERODHA_PNL_METRICS=metrics.json python app.py     # or metrics.prom
+    ZERODHA_PNL_PROFILE=session.pstats python app.py   # cProfile
+    ZERODHA_PNL_PROFILE=session.folded python app.py   # sampling, folded stacks
+    python app.py --metrics metrics.json --profile session.pstats
+    python -m cli --metrics metrics.prom price --file trades.csv
+
+Instrumentation is decided once, before the instrumented modules are
+imported. When it is off (the default), @timed returns the function
+itself and timer() returns a shared no-op context manager, so hot paths
+run exactly as before. When it is on, every timed call is recorded in a
+histogram. The histograms, counters and registered gauges are written to
+the metrics file at exit, as JSON or as Prometheus text depending on the
+file extension.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import nullcontext
+
+METRICS_ENV = "ZERODHA_PNL_METRICS"
+PROFILE_ENV = "ZERODHA_PNL_PROFILE"
+SAMPLE_INTERVAL = 0.005
+
+# Upper bounds in seconds: 1 us to 10 s, three buckets per decade.
+BUCKETS = tuple(m * 10.0 ** e for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0,)
+
+enabled = False
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile."""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS + (self.max,), self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {str(b): n for b, n in zip(BUCKETS + ("+Inf",), self.buckets) if n},
+        }
+
+
+class Registry:
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def gauge(self, name: str, read) -> None:
+        """Register read() -> number or dict of numbers, sampled when dumped."""
+        self.gauges[name] = read
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            gauges = {}
+            for name, read in self.gauges.items():
+                value = read()
+                if isinstance(value, dict):
+                    gauges.update({f"{name}.{k}": v for k, v in value.items()})
+                else:
+                    gauges[name] = value
+            return {
+                "counters": dict(self.counters),
+                "gauges": gauges,
+                "histograms": {n: h.to_dict() for n, h in sorted(self.histograms.items())},
+            }
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines = []
+        for name, value in sorted(snap["counters"].items()):
+            metric = _prom_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in sorted(snap["gauges"].items()):
+            metric = _prom_name(name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        for name, h in histograms:
+            metric = _prom_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+            lines += [f"{metric}_sum {h.total!r}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write JSON, or Prometheus text for .prom/.txt paths."""
+        if path.endswith((".prom", ".txt")):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2) + "\n"
+        with open(path, "w") as f:
+            f.write(text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+REGISTRY = Registry()
+
+
+def _prom_name(name: str) -> str:
+    return "zerodha_pnl_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+# ================= Instrumentation =================
+def timed(name: str):
+    """Decorator recording each call's duration under name (identity when disabled)."""
+    def decorate(fn):
+        if not enabled:
+            return fn
+        observe, clock = REGISTRY.observe, time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, clock() - start)
+
+        return wrapper
+    return decorate
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timer(name: str):
+    """Context manager timing a block; a shared no-op when disabled."""
+    return _Timer(name) if enabled else _NULL_TIMER
+
+
+def count(name: str, amount: int = 1) -> None:
+    if enabled:
+        REGISTRY.inc(name, amount)
+
+
+def gauge(name: str, read) -> None:
+    if enabled:
+        REGISTRY.gauge(name, read)
+
+
+# ================= Profiling =================
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack every interval seconds from a
+    background thread and counts folded stacks ("a;b;c count" lines, the
+    input format of flamegraph tools).
+    """
+
+    def __init__(self, thread_id: int = None, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+def start_profile(path: str):
+    """Profile the calling thread until exit: cProfile, or sampling for .folded paths."""
+    if path.endswith(".folded"):
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        if isinstance(profiler, SamplingProfiler):
+            profiler.stop()
+            profiler.dump(path)
+        else:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+    atexit.register(finish)
+    return profiler
+
+
+# ================= Configuration =================
+_profiler = None
+
+
+def enable(metrics_path: str = None, profile_path: str = None) -> None:
+    """
+    Turn instrumentation on. Must run before instrumented modules are
+    imported; metrics are written to metrics_path at exit.
+    """
+    global enabled, _profiler
+    if metrics_path and not enabled:
+        enabled = True
+        atexit.register(REGISTRY.dump, metrics_path)
+    if profile_path and _profiler is None:
+        _profiler = start_profile(profile_path)
+
+
+def configure(argv=None) -> list:
+    """
+    Enable from the environment and from leading --metrics/--profile PATH
+    options in argv (entry points call this before importing the app).
+    Returns argv without those options.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    options = {"--metrics": os.environ.get(METRICS_ENV), "--profile": os.environ.get(PROFILE_ENV)}
+    while len(argv) >= 2 and argv[0] in options:
+        options[argv[0]] = argv[1]
+        del argv[:2]
+    enable(options["--metrics"], options["--profile"])
+    return argv
+
+
+# The environment switch also covers imports that bypass the entry points.
+if os.environ.get(METRICS_ENV):
+    enable(os.environ[METRICS_ENV])
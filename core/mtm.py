@@ -0,0 +1,168 @@
+import math
+import time
+from typing import NamedTuple
+
+from core.schedule import DEFAULT_SCHEDULE
+
+FRAME_RATE = 30
+
+
+class Frame(NamedTuple):
+    total: float        # unrealized net P&L across open positions
+    updates: dict       # position id -> (last price, unrealized net P&L) changed since last frame
+    ticks: int          # ticks consumed since last frame
+    oldest_ts: int      # perf_counter_ns stamp of the oldest tick in this frame (0 if none)
+
+
+def exit_coefficients(quantity: int, entry_price: float, rates):
+    """
+    Unrealized net P&L of a position as a function of the exit price p.
+
+    Entry-leg charges are fixed once the position is open and every exit
+    charge is linear in exit turnover until the exit brokerage hits its cap,
+    so net(p) = k * p + c with one (k, c) pair below the cap price and one
+    above. Returns (cap_price, k_below, c_below, k_above, c_above).
+    Positive quantity is long (exit is a sell), negative is short.
+    """
+    r = rates
+    g = 1 + r.gst_rate
+    q = abs(quantity)
+    entry = entry_price * q
+    entry_brokerage = min(r.brokerage_cap, r.brokerage_rate * entry)
+    turnover_rate = g * (r.txn_rate + r.sebi_rate)
+    cap_price = r.brokerage_cap / (r.brokerage_rate * q) if r.brokerage_rate else math.inf
+
+    if quantity > 0:
+        entry_cost = entry * (1 + turnover_rate + r.stt_buy_rate + r.stamp_rate) + g * entry_brokerage
+        k = q * (1 - turnover_rate - r.stt_sell_rate)
+        return (cap_price, k - g * r.brokerage_rate * q, -entry_cost,
+                k, -entry_cost - g * r.brokerage_cap)
+
+    entry_proceeds = entry * (1 - turnover_rate - r.stt_sell_rate) - g * entry_brokerage
+    k = -q * (1 + turnover_rate + r.stt_buy_rate + r.stamp_rate)
+    return (cap_price, k - g * r.brokerage_rate * q, entry_proceeds,
+            k, entry_proceeds - g * r.brokerage_cap)
+
+
+class MarkToMarketEngine:
+    """
+    Live unrealized net P&L (after exit charges) for open positions.
+
+    on_tick() is O(positions in that symbol): each position's P&L is one
+    multiply-add on precomputed coefficients and the portfolio total is
+    kept as a running sum. Changed symbols are remembered and handed out
+    once per frame(), so a UI can redraw at a fixed rate no matter how
+    fast ticks arrive.
+    """
+
+    def __init__(self, schedule=DEFAULT_SCHEDULE, trade_date=None):
+        self.schedule = schedule
+        self.trade_date = trade_date
+        self.total = 0.0
+        self.ticks = 0
+        self._coef = []
+        self._net = []
+        self._symbol = []
+        self._by_symbol = {}
+        self._last = {}
+        self._dirty = set()
+        self._frame_ticks = 0
+        self._oldest_ts = 0
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._by_symbol.values())
+
+    def open_position(self, symbol: str, quantity: int, entry_price: float,
+                      exchange: str = "NSE", segment: str = "intraday") -> int:
+        """Track a position (negative quantity for shorts); returns its id."""
+        if quantity == 0 or entry_price <= 0:
+            raise ValueError("Quantity must be non-zero and entry price greater than 0.")
+        rates = self.schedule.lookup(segment, exchange, self.trade_date)
+        pid = len(self._coef)
+        self._coef.append(exit_coefficients(quantity, entry_price, rates))
+        self._symbol.append(symbol)
+        self._by_symbol[symbol] = self._by_symbol.get(symbol, ()) + (pid,)
+        # Marked at the last seen price, or at entry (i.e. minus round-trip charges).
+        self._net.append(0.0)
+        self._mark(pid, self._last.get(symbol, entry_price))
+        self._dirty.add(symbol)
+        return pid
+
+    def close_position(self, pid: int) -> float:
+        """Stop tracking a position; returns its last unrealized net P&L."""
+        symbol = self._symbol[pid]
+        ids = self._by_symbol.get(symbol, ())
+        if pid not in ids:
+            raise KeyError(pid)
+        remaining = tuple(i for i in ids if i != pid)
+        if remaining:
+            self._by_symbol[symbol] = remaining
+        else:
+            del self._by_symbol[symbol]
+        net = self._net[pid]
+        self.total -= net
+        return net
+
+    def unrealized(self, pid: int) -> float:
+        return self._net[pid]
+
+    def last_price(self, symbol: str) -> float:
+        return self._last.get(symbol)
+
+    def on_tick(self, symbol: str, price: float, ts: int = 0) -> None:
+        self.ticks += 1
+        self._frame_ticks += 1
+        if ts and not self._oldest_ts:
+            self._oldest_ts = ts
+        self._last[symbol] = price
+        ids = self._by_symbol.get(symbol)
+        if not ids:
+            return
+        coef, nets = self._coef, self._net
+        delta = 0.0
+        for pid in ids:
+            cap_price, k_lo, c_lo, k_hi, c_hi = coef[pid]
+            net = k_lo * price + c_lo if price < cap_price else k_hi * price + c_hi
+            delta += net - nets[pid]
+            nets[pid] = net
+        self.total += delta
+        self._dirty.add(symbol)
+
+    def frame(self) -> Frame:
+        """Changes since the previous frame; resets the dirty set."""
+        updates = {}
+        last, nets = self._last, self._net
+        for symbol in self._dirty:
+            price = last.get(symbol)
+            for pid in self._by_symbol.get(symbol, ()):
+                updates[pid] = (price, nets[pid])
+        frame = Frame(self.total, updates, self._frame_ticks, self._oldest_ts)
+        self._dirty = set()
+        self._frame_ticks = 0
+        self._oldest_ts = 0
+        return frame
+
+    def run(self, feed, on_frame=None, frame_rate: float = FRAME_RATE,
+            clock=time.perf_counter) -> int:
+        """
+        Consume a tick feed until it ends, calling on_frame(Frame) at most
+        frame_rate times per second plus once at the end. Returns ticks consumed.
+        """
+        interval = 1.0 / frame_rate
+        next_frame = clock() + interval
+        on_tick = self.on_tick
+        start = self.ticks
+        for tick in feed:
+            on_tick(tick.symbol, tick.price, tick.ts)
+            if on_frame is not None and clock() >= next_frame:
+                on_frame(self.frame())
+                next_frame = clock() + interval
+        if on_frame is not None:
+            on_frame(self.frame())
+        return self.ticks - start
+
+    def _mark(self, pid, price):
+        cap_price, k_lo, c_lo, k_hi, c_hi = self._coef[pid]
+        net = k_lo * price + c_lo if price < cap_price else k_hi * price + c_hi
+        self.total += net - self._net[pid]
+        self._net[pid] = net
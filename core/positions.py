@@ -0,0 +1,133 @@
+from collections import deque
+from typing import NamedTuple
+
+from core.schedule import DEFAULT_SCHEDULE
+
+
+class RoundTrip(NamedTuple):
+    trade_date: str
+    symbol: str
+    exchange: str
+    buy: float
+    sell: float
+    qty: int
+    charges: float
+    net_pnl: float
+
+
+class PositionBook:
+    """
+    Intraday positions built from individual fills.
+
+    Fills are matched FIFO into round-trip lots per (trade date, symbol,
+    exchange). A position may open from either side, so selling first
+    opens a short. Each instrument keeps one deque of open lots, all on
+    the same side. A fill pushes at most one lot and every match pops or
+    shrinks the head lot, so a fill costs O(1) amortized.
+
+    Charges are booked as each fill arrives. Brokerage is capped per order:
+    fills sharing an order_id pay only the increase in
+    min(cap, rate * order turnover), so a 10-fill order is capped once, not
+    ten times. A fill's charges are spread evenly over its units. Each
+    round trip carries the charges of the units it closes, and the charges
+    of the units still open stay on their lots.
+    """
+
+    def __init__(self, schedule=DEFAULT_SCHEDULE, segment: str = "intraday",
+                 record_trips: bool = True):
+        self.schedule = schedule
+        self.segment = segment
+        self.record_trips = record_trips
+        self.fills = 0
+        self.realized = 0.0       # net P&L of closed units, after their charges
+        self.charges = 0.0        # charges of every fill so far, open or closed
+        self._open = {}           # (date, symbol, exchange) -> deque([is_buy, qty, price, charge_per_unit])
+        self._orders = {}         # order_id -> turnover so far
+        self._costs = {}
+        self._trips = []
+
+    def fill(self, symbol: str, is_buy: bool, qty: int, price: float, order_id=None,
+             exchange: str = "NSE", trade_date: str = None) -> float:
+        """Book one fill; returns the realized net P&L it closed."""
+        if qty <= 0 or price <= 0:
+            raise ValueError("Fill quantity and price must be greater than 0.")
+        costs = self._costs.get((exchange, trade_date))
+        if costs is None:
+            costs = self._fill_costs(exchange, trade_date)
+        rate, cap, gst, side_rate = costs[0], costs[1], costs[2], costs[3 if is_buy else 4]
+
+        turnover = price * qty
+        brokerage = rate * turnover
+        if order_id is None:
+            if brokerage > cap:
+                brokerage = cap
+        else:
+            orders = self._orders
+            before = orders.get(order_id, 0.0)
+            orders[order_id] = before + turnover
+            charged = rate * before
+            if charged + brokerage > cap:
+                brokerage = cap - charged if charged < cap else 0.0
+        # side_rate already carries GST on the exchange and SEBI charges.
+        charges = gst * brokerage + side_rate * turnover
+        per_unit = charges / qty
+        self.fills += 1
+        self.charges += charges
+
+        key = (trade_date, symbol, exchange)
+        lots = self._open.get(key)
+        if lots is None:
+            lots = self._open[key] = deque()
+        realized = 0.0
+        while qty and lots and lots[0][0] != is_buy:
+            lot = lots[0]
+            matched = qty if qty < lot[1] else lot[1]
+            buy, sell = (price, lot[2]) if is_buy else (lot[2], price)
+            trip_charges = (per_unit + lot[3]) * matched
+            net = (sell - buy) * matched - trip_charges
+            realized += net
+            if self.record_trips:
+                self._trips.append(RoundTrip(trade_date, symbol, exchange, buy, sell,
+                                             matched, trip_charges, net))
+            lot[1] -= matched
+            qty -= matched
+            if not lot[1]:
+                lots.popleft()
+        if qty:
+            lots.append([is_buy, qty, price, per_unit])
+        elif not lots:
+            del self._open[key]
+        self.realized += realized
+        return realized
+
+    def _fill_costs(self, exchange, trade_date):
+        """(brokerage rate, cap, 1 + GST, buy-side rate, sell-side rate) per unit turnover."""
+        r = self.schedule.lookup(self.segment, exchange, trade_date)
+        gst = 1 + r.gst_rate
+        regulatory = gst * (r.txn_rate + r.sebi_rate)
+        costs = (r.brokerage_rate, r.brokerage_cap, gst,
+                 regulatory + r.stt_buy_rate + r.stamp_rate, regulatory + r.stt_sell_rate)
+        self._costs[(exchange, trade_date)] = costs
+        return costs
+
+    def take_trips(self) -> list:
+        """Round trips closed since the last call."""
+        trips, self._trips = self._trips, []
+        return trips
+
+    def position(self, symbol: str, exchange: str = "NSE", trade_date: str = None) -> int:
+        """Signed open quantity: positive long, negative short, 0 flat."""
+        lots = self._open.get((trade_date, symbol, exchange), ())
+        return sum(lot[1] if lot[0] else -lot[1] for lot in lots)
+
+    def open_lots(self, symbol: str, exchange: str = "NSE", trade_date: str = None) -> list:
+        """Open lots oldest first as (qty, price); quantity is negative for shorts."""
+        lots = self._open.get((trade_date, symbol, exchange), ())
+        return [(lot[1] if lot[0] else -lot[1], lot[2]) for lot in lots]
+
+    def open_quantity(self) -> int:
+        return sum(lot[1] for lots in self._open.values() for lot in lots)
+
+    def clear_orders(self) -> None:
+        """Forget per-order turnover, e.g. at day end (order ids repeat across days)."""
+        self._orders.clear()
@@ -0,0 +1,54 @@
+from core.schedule import DEFAULT_SCHEDULE
+
+
+def exit_price_range(buy_price: float, pct: float = 2.0, steps: int = 500, tick: float = 0.05):
+    """Exit prices from buy_price -pct% to +pct%, snapped to tick and de-duplicated."""
+    import numpy as np
+
+    prices = np.linspace(buy_price * (1 - pct / 100), buy_price * (1 + pct / 100), steps)
+    prices = np.unique(np.round(prices / tick) * tick)
+    return np.round(prices[prices > 0], 10)
+
+
+def quantity_range(max_quantity: int, steps: int = 200):
+    """Up to steps distinct quantities from 1 to max_quantity."""
+    import numpy as np
+
+    return np.unique(np.linspace(1, max(1, max_quantity), steps).round().astype(np.int64))
+
+
+def pnl_surface(buy_price: float, sell_prices, quantities, exchange: str = "NSE",
+                segment: str = "intraday", trade_date=None, schedule=DEFAULT_SCHEDULE,
+                dtype="float32"):
+    """
+    Net P&L for every (exit price, quantity) pair as a
+    (len(sell_prices), len(quantities)) array, computed by broadcasting with
+    a single rate lookup. Same charge formula as zerodha_pnl, unrounded.
+    """
+    import numpy as np
+
+    if buy_price <= 0:
+        raise ValueError("Buy price must be greater than 0.")
+    r = schedule.lookup(segment, exchange, trade_date)
+    sell = np.asarray(sell_prices, dtype=np.float64)[:, None]
+    qty = np.asarray(quantities, dtype=np.float64)[None, :]
+    if (sell <= 0).any() or (qty <= 0).any():
+        raise ValueError("Sell prices and quantities must be greater than 0.")
+
+    buy_turnover = buy_price * qty
+    sell_turnover = sell * qty
+    total_turnover = buy_turnover + sell_turnover
+
+    brokerage = (
+        np.minimum(r.brokerage_cap, r.brokerage_rate * buy_turnover)
+        + np.minimum(r.brokerage_cap, r.brokerage_rate * sell_turnover)
+    )
+    exchange_txn = r.txn_rate * total_turnover
+    sebi = r.sebi_rate * total_turnover
+    stt = r.stt_buy_rate * buy_turnover + r.stt_sell_rate * sell_turnover
+    stamp_duty = r.stamp_rate * buy_turnover
+    gst = r.gst_rate * (brokerage + exchange_txn + sebi)
+    total_charges = brokerage + (stt + sebi + stamp_duty + exchange_txn + gst)
+
+    net = sell_turnover - buy_turnover - total_charges
+    return net.astype(dtype, copy=False)
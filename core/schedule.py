@@ -0,0 +1,154 @@
+from bisect import bisect_right
+from datetime import date
+from typing import NamedTuple
+
+from core.constants import (
+    BROKERAGE_RATE, BROKERAGE_CAP,
+    NSE_TXN_CHARGE, BSE_TXN_CHARGE,
+    STT_RATE, SEBI_CHARGE_RATE,
+    STAMP_DUTY_RATE, GST_RATE
+)
+
+SEGMENTS = ("intraday", "delivery", "futures", "options")
+EXCHANGES = ("NSE", "BSE")
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class ChargeRates(NamedTuple):
+    brokerage_rate: float     # per leg, clamped at brokerage_cap
+    brokerage_cap: float
+    txn_rate: float           # exchange transaction charge on total turnover
+    stt_buy_rate: float
+    stt_sell_rate: float
+    stamp_rate: float         # buy side
+    sebi_rate: float
+    gst_rate: float           # on brokerage + exchange + SEBI
+
+
+# Segment rates without the exchange-specific transaction charge.
+# Options brokerage is a flat ₹20 per order: rate 1.0 clamped at the cap.
+DEFAULT_VERSIONS = [
+    {
+        "effective_from": "2023-04-01",
+        "segments": {
+            "intraday": {"brokerage_rate": 0.0003, "brokerage_cap": 20.0, "stt_sell_rate": 0.00025,
+                         "stamp_rate": 0.00003, "txn": {"NSE": 0.0000322, "BSE": 0.0000375}},
+            "delivery": {"stt_buy_rate": 0.001, "stt_sell_rate": 0.001,
+                         "stamp_rate": 0.00015, "txn": {"NSE": 0.0000322, "BSE": 0.0000375}},
+            "futures": {"brokerage_rate": 0.0003, "brokerage_cap": 20.0, "stt_sell_rate": 0.000125,
+                        "stamp_rate": 0.00002, "txn": {"NSE": 0.00002, "BSE": 0.0}},
+            "options": {"brokerage_rate": 1.0, "brokerage_cap": 20.0, "stt_sell_rate": 0.000625,
+                        "stamp_rate": 0.00003, "txn": {"NSE": 0.000495, "BSE": 0.000325}},
+        },
+    },
+    {
+        "effective_from": "2024-10-01",
+        "segments": {
+            "intraday": {"brokerage_rate": BROKERAGE_RATE, "brokerage_cap": BROKERAGE_CAP,
+                         "stt_sell_rate": STT_RATE, "stamp_rate": STAMP_DUTY_RATE,
+                         "txn": {"NSE": NSE_TXN_CHARGE, "BSE": BSE_TXN_CHARGE}},
+            "delivery": {"stt_buy_rate": 0.001, "stt_sell_rate": 0.001,
+                         "stamp_rate": 0.00015, "txn": {"NSE": NSE_TXN_CHARGE, "BSE": BSE_TXN_CHARGE}},
+            "futures": {"brokerage_rate": 0.0003, "brokerage_cap": 20.0, "stt_sell_rate": 0.0002,
+                        "stamp_rate": 0.00002, "txn": {"NSE": 0.0000173, "BSE": 0.0}},
+            "options": {"brokerage_rate": 1.0, "brokerage_cap": 20.0, "stt_sell_rate": 0.001,
+                        "stamp_rate": 0.00003, "txn": {"NSE": 0.0003503, "BSE": 0.000325}},
+        },
+    },
+]
+
+
+def to_epoch_day(value) -> int:
+    """date, ISO string or None (today) -> days since 1970-01-01."""
+    if value is None:
+        value = date.today()
+    elif isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+class ChargeSchedule:
+    """
+    Versioned, date-effective charge rates compiled into a flat table.
+
+    Row (version, segment, exchange) lives at
+    (version * len(SEGMENTS) + segment) * len(EXCHANGES) + exchange, so a
+    lookup is one bisect on the version dates plus two dict hits; the batch
+    path gathers whole rate columns with one fancy index.
+    """
+
+    def __init__(self, versions=DEFAULT_VERSIONS):
+        versions = sorted(versions, key=lambda v: v["effective_from"])
+        self.effective_from = [v["effective_from"] for v in versions]
+        self.days = [to_epoch_day(d) for d in self.effective_from]
+        self.segment_index = {s: i for i, s in enumerate(SEGMENTS)}
+        self.exchange_index = {e: i for i, e in enumerate(EXCHANGES)}
+        self.table = [
+            self._compile(version["segments"][segment], exchange)
+            for version in versions
+            for segment in SEGMENTS
+            for exchange in EXCHANGES
+        ]
+        self._matrix = None
+        # Identifies this schedule's rates, e.g. for cache invalidation.
+        self.fingerprint = hash((tuple(self.days), tuple(self.table)))
+
+    @staticmethod
+    def _compile(rates: dict, exchange: str) -> ChargeRates:
+        return ChargeRates(
+            brokerage_rate=rates.get("brokerage_rate", 0.0),
+            brokerage_cap=rates.get("brokerage_cap", 0.0),
+            txn_rate=rates["txn"][exchange],
+            stt_buy_rate=rates.get("stt_buy_rate", 0.0),
+            stt_sell_rate=rates.get("stt_sell_rate", 0.0),
+            stamp_rate=rates.get("stamp_rate", 0.0),
+            sebi_rate=rates.get("sebi_rate", SEBI_CHARGE_RATE),
+            gst_rate=rates.get("gst_rate", GST_RATE),
+        )
+
+    def lookup(self, segment: str, exchange: str, trade_date=None) -> ChargeRates:
+        try:
+            s = self.segment_index[segment.lower()]
+        except KeyError:
+            raise ValueError(f"Segment must be one of {', '.join(SEGMENTS)}.") from None
+        try:
+            e = self.exchange_index[exchange.upper()]
+        except KeyError:
+            raise ValueError("Exchange must be 'NSE' or 'BSE'.") from None
+        v = bisect_right(self.days, to_epoch_day(trade_date)) - 1
+        if v < 0:
+            raise ValueError(f"No charge schedule before {self.effective_from[0]}.")
+        return self.table[(v * len(SEGMENTS) + s) * len(EXCHANGES) + e]
+
+    def lookup_batch(self, segments, exchanges, trade_dates):
+        """
+        Vectorized lookup. Returns (rates, valid) where rates is an (n, 8)
+        array in ChargeRates field order and valid flags rows that matched.
+        """
+        import numpy as np
+
+        if self._matrix is None:
+            self._matrix = np.array(self.table, dtype=np.float64)
+
+        segments = np.char.lower(np.asarray(segments, dtype=str))
+        exchanges = np.char.upper(np.asarray(exchanges, dtype=str))
+        if trade_dates is None:
+            days = np.full(segments.shape, to_epoch_day(None))
+        else:
+            days = np.asarray(trade_dates, dtype="datetime64[D]").astype(np.int64)
+        segments, exchanges, days = np.broadcast_arrays(segments, exchanges, days)
+
+        seg = np.full(segments.shape, -1)
+        for name, i in self.segment_index.items():
+            seg[segments == name] = i
+        exch = np.full(exchanges.shape, -1)
+        for name, i in self.exchange_index.items():
+            exch[exchanges == name] = i
+        version = np.searchsorted(np.asarray(self.days), days, side="right") - 1
+
+        valid = (seg >= 0) & (exch >= 0) & (version >= 0)
+        row = np.where(valid, (version * len(SEGMENTS) + seg) * len(EXCHANGES) + exch, 0)
+        return self._matrix[row], valid
+
+
+DEFAULT_SCHEDULE = ChargeSchedule()
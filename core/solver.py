@@ -0,0 +1,93 @@
+import math
+
+from core.schedule import DEFAULT_SCHEDULE
+
+
+def _rates(exchange, segment, trade_date, schedule):
+    return schedule.lookup(segment, exchange, trade_date)
+
+
+def _round_to_tick(value: float, tick: float, up: bool) -> float:
+    steps = value / tick
+    steps = math.ceil(steps - 1e-9) if up else math.floor(steps + 1e-9)
+    return round(steps * tick, 10)
+
+
+def sell_price_for_target(buy_price: float, quantity: int, target_net_pnl: float = 0.0,
+                          exchange: str = "NSE", segment: str = "intraday", trade_date=None,
+                          schedule=DEFAULT_SCHEDULE, tick: float = None) -> float:
+    """
+    Exact sell price at which net P&L (after all charges) equals target_net_pnl.
+
+    With buy leg and quantity fixed, net P&L is linear in sell turnover on
+    each side of the point where the sell-leg brokerage reaches its cap, so
+    each piece is solved in closed form and the solution lying inside its
+    own piece is returned. With tick (e.g. 0.05) the price is rounded up to
+    the first tick whose net P&L reaches the target.
+    """
+    if buy_price <= 0 or quantity <= 0:
+        raise ValueError("Buy price and quantity must be greater than 0.")
+    r = _rates(exchange, segment, trade_date, schedule)
+    g = 1 + r.gst_rate
+
+    buy_turnover = buy_price * quantity
+    brokerage_buy = min(r.brokerage_cap, r.brokerage_rate * buy_turnover)
+    turnover_rate = g * (r.txn_rate + r.sebi_rate)
+    # net = slope * sell_turnover - fixed, per piece
+    fixed = (buy_turnover + g * brokerage_buy + turnover_rate * buy_turnover
+             + (r.stt_buy_rate + r.stamp_rate) * buy_turnover)
+    base_slope = 1 - turnover_rate - r.stt_sell_rate
+    boundary = r.brokerage_cap / r.brokerage_rate if r.brokerage_rate else math.inf
+
+    candidates = []
+    # Sell leg below the cap: brokerage grows with turnover.
+    slope = base_slope - g * r.brokerage_rate
+    if slope > 0:
+        st = (target_net_pnl + fixed) / slope
+        if 0 < st <= boundary:
+            candidates.append(st)
+    # Sell leg capped: flat brokerage.
+    if base_slope > 0 and boundary < math.inf:
+        st = (target_net_pnl + fixed + g * r.brokerage_cap) / base_slope
+        if st >= boundary:
+            candidates.append(st)
+    if not candidates:
+        raise ValueError("No positive sell price reaches the target net P&L.")
+
+    price = min(candidates) / quantity
+    if tick:
+        price = _round_to_tick(price, tick, up=True)
+    return price
+
+
+def breakeven_sell_price(buy_price: float, quantity: int, **kwargs) -> float:
+    """Exact sell price at which net P&L is zero."""
+    return sell_price_for_target(buy_price, quantity, 0.0, **kwargs)
+
+
+def max_quantity_for_capital(capital: float, buy_price: float, exchange: str = "NSE",
+                             segment: str = "intraday", trade_date=None,
+                             schedule=DEFAULT_SCHEDULE) -> int:
+    """
+    Largest quantity whose buy turnover plus buy-side charges (brokerage,
+    stamp duty, buy STT, exchange/SEBI on the buy leg and GST) fits in capital.
+    """
+    if capital <= 0 or buy_price <= 0:
+        raise ValueError("Capital and buy price must be greater than 0.")
+    r = _rates(exchange, segment, trade_date, schedule)
+    g = 1 + r.gst_rate
+    per_turnover = 1 + g * (r.txn_rate + r.sebi_rate) + r.stt_buy_rate + r.stamp_rate
+
+    def cost(turnover):
+        return per_turnover * turnover + g * min(r.brokerage_cap, r.brokerage_rate * turnover)
+
+    boundary = r.brokerage_cap / r.brokerage_rate if r.brokerage_rate else math.inf
+    turnover = capital / (per_turnover + g * r.brokerage_rate)
+    if turnover > boundary:
+        turnover = (capital - g * r.brokerage_cap) / per_turnover
+
+    quantity = max(0, math.floor(turnover / buy_price + 1e-9))
+    # Guard the floor against float noise at an exact fit.
+    while quantity and cost(quantity * buy_price) > capital:
+        quantity -= 1
+    return quantity
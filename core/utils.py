@@ -9,3 +9,35 @@ def validate_inputs(buy_price, sell_price, quantity, exchange):
 def round2(value):
     """Round to 2 decimals safely."""
     return round(float(value), 2)
+
+def plain_number(value):
+    """Return integral floats as ints (100.0 -> 100) for display and JSON."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def validate_inputs_batch(buy_prices, sell_prices, quantities, exchanges):
+    """Per-row validation mask; True where the row passes validate_inputs."""
+    import numpy as np
+    exchanges = np.char.upper(np.asarray(exchanges, dtype=str))
+    return (
+        (np.asarray(buy_prices) > 0)
+        & (np.asarray(sell_prices) > 0)
+        & (np.asarray(quantities) > 0)
+        & np.isin(exchanges, ["NSE", "BSE"])
+    )
+
+def round2_array(values, out=None):
+    """
+    Round an array to 2 decimals, matching round2 element for element.
+    np.round scales by 100 first, which can tip a value lying within an ulp
+    of a .xx5 tie the other way; those few values are re-rounded with round().
+    """
+    import numpy as np
+    values = np.asarray(values, dtype=np.float64)
+    result = np.round(values, 2, out=out)
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * 100
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    for i in np.flatnonzero(near_tie):
+        result.flat[i] = round(float(values.flat[i]), 2)
+    return result
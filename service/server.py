@@ -0,0 +1,282 @@
+"""
+Pricing service: a small asyncio HTTP/1.1 server around core.calculator.
+
+    python -m cli serve --port 8080
+    curl -s localhost:8080/quote -d '{"buy": 100, "sell": 101, "qty": 10}'
+    curl -s localhost:8080/quote/batch -H 'Content-Type: application/x-ndjson' --data-binary @trades.jsonl
+
+    GET  /health         {"status": "ok"}
+    POST /quote          one {"buy", "sell", "qty"[, "exchange"]} object -> inputs + result
+    POST /quote/batch    JSON array or NDJSON rows -> one record per row, same format;
+                         invalid rows carry "error" instead of the result fields
+
+Connections are kept alive (the HTTP/1.1 default) and serve one request at
+a time, so a client that stops reading its responses stops being read.
+At most `concurrency` requests are priced at once and up to `backlog` more
+wait; beyond that the server answers 503 with Retry-After. Batch bodies
+larger than `offload_bytes` are parsed, priced and encoded in a process
+pool, so a large batch never stalls the event loop.
+"""
+import asyncio
+import json
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from cli.commands import check_finite, iter_priced, parse_record, result_record
+from core import metrics
+from core.calculator import zerodha_intraday_pnl
+
+HOST = "127.0.0.1"
+PORT = 8080
+CONCURRENCY = 64
+BACKLOG = 256
+OFFLOAD_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024 * 1024
+KEEPALIVE_SECONDS = 15
+BODY_SECONDS = 30
+RETRY_AFTER_SECONDS = 1
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 501: "Not Implemented", 503: "Service Unavailable",
+}
+ROUTES = {"/health": "GET", "/quote": "POST", "/quote/batch": "POST"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ================= Pricing =================
+def price_quote(body: bytes) -> dict:
+    row = parse_record(json.loads(body))
+    return result_record(row, check_finite(zerodha_intraday_pnl(*row)), None)
+
+
+def price_batch(body: bytes, ndjson: bool) -> bytes:
+    """Parse, price and encode one batch body; runs inline or in a worker process."""
+    if ndjson:
+        results = iter_priced(body.decode().splitlines())
+    else:
+        rows = json.loads(body)
+        if not isinstance(rows, list):
+            raise ValueError("expected a JSON array of trades")
+        results = iter_priced(rows, parse=parse_record)
+    records = (result_record(*r) for r in results)
+    # allow_nan=False: a bare NaN/Infinity token would make the body invalid JSON.
+    if ndjson:
+        return "".join(json.dumps(r, allow_nan=False) + "\n" for r in records).encode()
+    return json.dumps(list(records), allow_nan=False).encode()
+
+
+def parse_head(head: bytes):
+    """(method, path, version, headers) from the request line and header block."""
+    try:
+        request_line, *lines = head.decode("latin-1").split("\r\n")
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.") from None
+    headers = {}
+    for line in lines:
+        if line:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "Malformed header line.")
+            headers[name.strip().lower()] = value.strip()
+    return method, target.split("?", 1)[0], version, headers
+
+
+def wants_keep_alive(version: str, headers: dict) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+# ================= Server =================
+class PricingServer:
+    def __init__(self, host: str = HOST, port: int = PORT, concurrency: int = CONCURRENCY,
+                 backlog: int = BACKLOG, workers: int = None, offload_bytes: int = OFFLOAD_BYTES):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.backlog = backlog
+        self.workers = workers
+        self.offload_bytes = offload_bytes
+        self.requests = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._waiting = 0
+        self._pool = None
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    # ================= Connections =================
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, {"error": "Request headers too large."}, keep_alive=False)
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+
+                try:
+                    method, path, version, headers = parse_head(head)
+                    body = await self._read_body(reader, headers)
+                except HTTPError as e:
+                    await self._send(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+
+                keep_alive = wants_keep_alive(version, headers)
+                try:
+                    with metrics.timer("service.request"):
+                        status, payload, content_type = await self._dispatch(method, path, headers, body)
+                except HTTPError as e:
+                    status, payload, content_type = e.status, {"error": str(e)}, JSON
+                except Exception:
+                    # A bug in one request answers 500 rather than dropping the socket.
+                    metrics.count("service.errors")
+                    traceback.print_exc()
+                    status, payload, content_type = 500, {"error": "Internal server error."}, JSON
+                    keep_alive = False
+                self.requests += 1
+                await self._send(writer, status, payload, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_body(self, reader, headers) -> bytes:
+        if "transfer-encoding" in headers:
+            raise HTTPError(501, "Chunked request bodies are not supported; send Content-Length.")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length.") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request bodies are limited to {MAX_BODY_BYTES} bytes.")
+        if not length:
+            return b""
+        try:
+            return await asyncio.wait_for(reader.readexactly(length), BODY_SECONDS)
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Timed out reading the request body.") from None
+        except asyncio.IncompleteReadError:
+            raise ConnectionResetError("client closed mid-body") from None
+
+    async def _send(self, writer, status, payload, content_type=JSON, keep_alive=True):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload, allow_nan=False).encode()
+        head = [
+            f"HTTP/1.1 {status} {REASONS[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append(f"Retry-After: {RETRY_AFTER_SECONDS}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        # Backpressure: a slow reader holds this connection, not the server's memory.
+        await writer.drain()
+
+    # ================= Requests =================
+    async def _dispatch(self, method, path, headers, body):
+        """(status, payload, content type) for one request."""
+        if path not in ROUTES:
+            raise HTTPError(404, f"No route for {path}.")
+        if method != ROUTES[path]:
+            raise HTTPError(405, f"{path} expects {ROUTES[path]}.")
+        if path == "/health":
+            return 200, {"status": "ok"}, JSON
+
+        await self._admit()
+        try:
+            if path == "/quote":
+                try:
+                    return 200, price_quote(body), JSON
+                except (ValueError, KeyError, TypeError, OverflowError) as e:
+                    raise HTTPError(400, _message(e)) from None
+
+            ndjson = headers.get("content-type", "").split(";")[0].strip() == NDJSON
+            try:
+                if len(body) > self.offload_bytes:
+                    metrics.count("service.offloaded")
+                    payload = await asyncio.get_running_loop().run_in_executor(
+                        self._executor(), price_batch, body, ndjson)
+                else:
+                    payload = price_batch(body, ndjson)
+            except (ValueError, UnicodeDecodeError) as e:
+                raise HTTPError(400, _message(e)) from None
+            return 200, payload, NDJSON if ndjson else JSON
+        finally:
+            self._slots.release()
+
+    async def _admit(self):
+        """Wait for a pricing slot, or refuse when the wait queue is full."""
+        if self._slots.locked() and self._waiting >= self.backlog:
+            self.rejected += 1
+            metrics.count("service.rejected")
+            raise HTTPError(503, "Server busy; retry shortly.")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool
+
+
+def _message(error: Exception) -> str:
+    if isinstance(error, KeyError):
+        return f"missing field {error}"
+    return str(error)
+
+
+def serve(host: str = HOST, port: int = PORT, on_ready=None, **options) -> None:
+    """Run a PricingServer until interrupted; on_ready(server) is called once listening."""
+    async def main():
+        server = PricingServer(host, port, **options)
+        await server.start()
+        if on_ready:
+            on_ready(server)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,237 @@
+import mmap
+import os
+import struct
+
+from core.ledger import NO_DAY, Trade, day_number, day_text, trade_record
+
+ARCHIVE_MAGIC = b"ZPNLARC\0"
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = ".zpa"
+# magic, version, column count, header size, rows
+HEADER = struct.Struct("<8sHHIQ")
+# name, struct format, offset, item size
+COLUMN_ENTRY = struct.Struct("<24s8sQI4x")
+HEADER_ALIGN = 64
+SYMBOL_BYTES = 24
+
+# zerodha_intraday_pnl result key -> archive column.
+RESULT_COLUMNS = {
+    "Turnover": "turnover",
+    "Zerodha Brokerage": "brokerage",
+    "Exchange Txn Charges": "exchange_txn",
+    "SEBI Charges": "sebi",
+    "Stamp Duty": "stamp_duty",
+    "STT": "stt",
+    "GST": "gst",
+    "Total Charges": "total_charges",
+    "Points to Breakeven": "points_to_breakeven",
+    "Gross P&L": "gross_pnl",
+    "Net P&L": "net_pnl",
+}
+
+# Widest items first so every column stays naturally aligned.
+COLUMNS = (
+    ("buy", "d"),
+    ("sell", "d"),
+    ("qty", "q"),
+    *((name, "d") for name in RESULT_COLUMNS.values()),
+    ("symbol", f"{SYMBOL_BYTES}s"),     # UTF-8, NUL padded; empty if unknown
+    ("day", "i"),                       # epoch day, NO_DAY if unknown
+    ("exchange", "B"),                  # index into EXCHANGE_CODES
+)
+EXCHANGE_CODES = (None, "NSE", "BSE")   # None: not recorded (priced as NSE)
+
+
+def _layout(rows: int):
+    """(header size, [(name, fmt, offset, itemsize)], file size) for rows trades."""
+    header_size = HEADER.size + COLUMN_ENTRY.size * len(COLUMNS)
+    header_size += -header_size % HEADER_ALIGN
+    offset = header_size
+    columns = []
+    for name, fmt in COLUMNS:
+        itemsize = struct.calcsize(fmt)
+        columns.append((name, fmt, offset, itemsize))
+        offset += itemsize * rows
+    return header_size, columns, offset
+
+
+# ================= Writing =================
+def write_archive(path: str, buy_prices, sell_prices, quantities, exchanges="NSE",
+                  trade_dates=None, symbols=None) -> int:
+    """
+    Price trades with zerodha_intraday_pnl_batch straight into a new archive.
+    The file is built beside path and swapped in once complete. Returns the
+    number of rows; raises ValueError (and writes nothing) on invalid rows.
+    """
+    import numpy as np
+
+    buy = np.asarray(buy_prices, dtype=np.float64)
+    # A single exchange string stays a scalar; broadcasting it here would
+    # make the calculator upper-case a million-element string array.
+    exchanges = np.char.upper(np.asarray(exchanges, dtype=str))
+    codes = np.broadcast_to(np.where(exchanges == "NSE", 1, np.where(exchanges == "BSE", 2, 0)), buy.shape)
+    return _write(path, buy, sell_prices, quantities, exchanges, codes, trade_dates, symbols)
+
+
+def write_records(path: str, records) -> int:
+    """
+    Archive trades in the saved list-of-dicts format. Charges are recomputed;
+    net_pnl keeps each record's saved figure so the records round-trip.
+    """
+    import numpy as np
+
+    records = list(records)
+    exchanges = [r.get("exchange") for r in records]
+    codes = np.fromiter((EXCHANGE_CODES.index(e.upper()) if e else 0 for e in exchanges),
+                        np.uint8, len(records))
+    return _write(
+        path,
+        np.fromiter((r["buy"] for r in records), np.float64, len(records)),
+        np.fromiter((r["sell"] for r in records), np.float64, len(records)),
+        np.fromiter((r["qty"] for r in records), np.int64, len(records)),
+        [e or "NSE" for e in exchanges],
+        codes,
+        [r.get("date") for r in records],
+        [r.get("symbol") for r in records],
+        np.fromiter((r["net_pnl"] for r in records), np.float64, len(records)),
+    )
+
+
+def _write(path, buy, sell, qty, exchanges, codes, trade_dates, symbols, net_pnl=None):
+    import numpy as np
+    from core.calculator import zerodha_intraday_pnl_batch
+
+    rows = len(buy)
+    header_size, layout, size = _layout(rows)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.truncate(max(size, 1))
+        buffer = np.memmap(tmp, dtype=np.uint8, mode="r+", shape=(size,))
+        columns = {
+            name: buffer[offset:offset + itemsize * rows].view(np.dtype(fmt if fmt[-1] != "s" else f"S{itemsize}"))
+            for name, fmt, offset, itemsize in layout
+        }
+
+        header = bytearray(header_size)
+        HEADER.pack_into(header, 0, ARCHIVE_MAGIC, ARCHIVE_VERSION, len(layout), header_size, rows)
+        for i, (name, fmt, offset, itemsize) in enumerate(layout):
+            COLUMN_ENTRY.pack_into(header, HEADER.size + i * COLUMN_ENTRY.size,
+                                   name.encode(), fmt.encode(), offset, itemsize)
+        buffer[:header_size] = np.frombuffer(header, dtype=np.uint8)
+
+        result = zerodha_intraday_pnl_batch(
+            buy, sell, qty, exchanges,
+            out={key: columns[name] for key, name in RESULT_COLUMNS.items()},
+        )
+        invalid = rows - int(result["Valid"].sum())
+        if invalid:
+            raise ValueError(f"{invalid} trade(s) failed validation; archive not written.")
+
+        columns["buy"][:] = buy
+        columns["sell"][:] = sell
+        columns["qty"][:] = qty
+        columns["exchange"][:] = codes
+        if net_pnl is not None:
+            columns["net_pnl"][:] = net_pnl
+        if trade_dates is None:
+            columns["day"][:] = NO_DAY
+        else:
+            columns["day"][:] = [day_number(d) for d in trade_dates]
+        if symbols is not None:
+            encoded = [s.encode() if s else b"" for s in symbols]
+            if any(len(s) > SYMBOL_BYTES for s in encoded):
+                raise ValueError(f"Symbols are limited to {SYMBOL_BYTES} bytes.")
+            columns["symbol"][:] = encoded
+        buffer.flush()
+        # The mapping must be released before the file is swapped in.
+        del buffer, columns, result
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return rows
+
+
+# ================= Reading =================
+class TradeArchive:
+    """
+    Read-only view of a trade archive: a header with the schema version and
+    a column directory, followed by one fixed-width column after another.
+
+    The file is memory-mapped, and column() returns a zero-copy memoryview
+    of one column, so scanning net P&L only pages in that column's bytes.
+    np.frombuffer(archive.column(name)) wraps it for NumPy without copying.
+    Views must be released before close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.version, count, header_size, self.rows = HEADER.unpack_from(self._map)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"{path} is not a trade archive.")
+            if self.version > ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported archive version {self.version} (newest known is {ARCHIVE_VERSION}).")
+            self._columns = {}
+            for i in range(count):
+                name, fmt, offset, itemsize = COLUMN_ENTRY.unpack_from(self._map, HEADER.size + i * COLUMN_ENTRY.size)
+                self._columns[name.rstrip(b"\0").decode()] = (fmt.rstrip(b"\0").decode(), offset, itemsize)
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of one numeric column."""
+        fmt, offset, itemsize = self._column(name)
+        if fmt.endswith("s"):
+            raise ValueError(f"Column {name!r} is not numeric; use symbols().")
+        return memoryview(self._map)[offset:offset + itemsize * self.rows].cast(fmt)
+
+    def symbols(self) -> list:
+        fmt, offset, itemsize = self._column("symbol")
+        data = self._map[offset:offset + itemsize * self.rows]
+        return [data[i:i + itemsize].rstrip(b"\0").decode() or None
+                for i in range(0, len(data), itemsize)]
+
+    def to_records(self) -> list:
+        """Trades in the saved list-of-dicts format (date, symbol, exchange when recorded)."""
+        days = self.column("day")
+        texts = {d: day_text(d) for d in set(days)}
+        records = []
+        for buy, sell, qty, net, day, exchange, symbol in zip(
+            self.column("buy"), self.column("sell"), self.column("qty"), self.column("net_pnl"),
+            days, self.column("exchange"), self.symbols(),
+        ):
+            record = trade_record(Trade(buy, sell, qty, net), texts[day])
+            if symbol:
+                record["symbol"] = symbol
+            if exchange:
+                record["exchange"] = EXCHANGE_CODES[exchange]
+            records.append(record)
+        return records
+
+    def close(self) -> None:
+        self._map.close()
+
+    def _column(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown archive column: {name!r}") from None
@@ -0,0 +1,178 @@
+"""
+Streaming import of broker tradebook CSV exports into the SQLite trade store.
+
+    python -m storage.importer tradebook.csv --db app_state.db --jobs 4
+
+The file is split into byte ranges aligned to line ends. Ranges are parsed
+(optionally in a process pool) and fed to a PositionBook. The book pairs
+buy and sell fills FIFO into round trips per day/symbol/exchange and
+charges brokerage per order (order_id column, when present). Each chunk's
+round trips are written in a batched transaction. Only a bounded window of
+chunks plus the still-open lots is ever held in memory.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from core.positions import PositionBook
+from core.utils import round2
+from storage.sqlite_store import SQLiteStore
+
+CHUNK_BYTES = 8 * 1024 * 1024
+
+# Zerodha tradebook headers (case-insensitive)
+COLUMNS = ("symbol", "trade_date", "exchange", "trade_type", "quantity", "price")
+# Fills of one order share a brokerage cap; without it every fill is its own order.
+ORDER_COLUMN = "order_id"
+# trade_type -> is_buy; any other value makes the row malformed.
+SIDES = {"buy": True, "sell": False}
+
+
+def iter_ranges(path: str, chunk_bytes: int = CHUNK_BYTES):
+    """Yield (start, end) byte ranges after the header, each ending on a newline."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def read_header(path: str) -> dict:
+    with open(path, "r", newline="") as f:
+        header = next(csv.reader(f))
+    index = {name.strip().lower(): i for i, name in enumerate(header)}
+    missing = [c for c in COLUMNS if c not in index]
+    if missing:
+        raise ValueError(f"Tradebook is missing columns: {', '.join(missing)}")
+    columns = {c: index[c] for c in COLUMNS}
+    columns[ORDER_COLUMN] = index.get(ORDER_COLUMN)
+    return columns
+
+
+def parse_range(path: str, start: int, end: int, columns: dict) -> tuple:
+    """
+    Parse one byte range into (date, symbol, exchange, is_buy, qty, price,
+    order_id) fills. Returns (fills, malformed rows skipped).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode("utf-8")
+    sym, day, exch, side, qty, price = (columns[c] for c in COLUMNS)
+    order = columns.get(ORDER_COLUMN)
+    fills = []
+    malformed = 0
+    for row in csv.reader(io.StringIO(data)):
+        if not row:
+            continue
+        try:
+            fills.append((
+                row[day], row[sym], row[exch].upper(),
+                SIDES[row[side].strip().lower()],
+                int(float(row[qty])), float(row[price]),
+                (row[order] or None) if order is not None else None,
+            ))
+        except (ValueError, IndexError, KeyError, OverflowError):
+            malformed += 1
+    return fills, malformed
+
+
+def book_fills(book: PositionBook, fills) -> tuple:
+    """Feed fills to book; returns (records for closed round trips, skipped fills)."""
+    skipped = 0
+    fill = book.fill
+    for day, symbol, exchange, is_buy, qty, price, order_id in fills:
+        try:
+            fill(symbol, is_buy, qty, price, order_id, exchange, day)
+        except ValueError:
+            skipped += 1
+    records = [
+        {"date": t.trade_date, "symbol": t.symbol, "exchange": t.exchange,
+         "buy": t.buy, "sell": t.sell, "qty": t.qty, "net_pnl": round2(t.net_pnl)}
+        for t in book.take_trips()
+    ]
+    return records, skipped
+
+
+def _parsed_chunks(path, columns, jobs, chunk_bytes):
+    ranges = iter_ranges(path, chunk_bytes)
+    if jobs <= 1:
+        for start, end in ranges:
+            yield parse_range(path, start, end, columns)
+        return
+    # Keep at most 2 * jobs ranges in flight so memory stays bounded.
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(parse_range, path, start, end, columns))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_tradebook(path: str, store, jobs: int = 1, chunk_bytes: int = CHUNK_BYTES,
+                     progress=None) -> dict:
+    """
+    Stream a tradebook CSV into store (anything with add_trades).
+    Malformed rows and fills the book rejects are counted in "skipped".
+    progress(stats) is called after every chunk.
+    """
+    columns = read_header(path)
+    book = PositionBook()
+    stats = {"rows": 0, "round_trips": 0, "skipped": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+    started = time.perf_counter()
+
+    for fills, malformed in _parsed_chunks(path, columns, jobs, chunk_bytes):
+        records, skipped = book_fills(book, fills)
+        store.add_trades(records)
+
+        stats["rows"] += len(fills) + malformed
+        stats["round_trips"] += len(records)
+        stats["skipped"] += skipped + malformed
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        if progress:
+            progress(stats)
+
+    stats["open_quantity"] = book.open_quantity()
+    return stats
+
+
+def _print_progress(stats):
+    print(f"\r{stats['rows']:>12,} rows  {stats['rows_per_sec']:>10,.0f} rows/s",
+          end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a broker tradebook CSV.")
+    parser.add_argument("csv", help="tradebook CSV export")
+    parser.add_argument("--db", default="app_state.db", help="SQLite trade store")
+    parser.add_argument("--jobs", type=int, default=1, help="parser processes")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES // (1024 * 1024))
+    args = parser.parse_args(argv)
+
+    store = SQLiteStore(args.db)
+    try:
+        stats = import_tradebook(args.csv, store, jobs=args.jobs,
+                                 chunk_bytes=args.chunk_mb * 1024 * 1024,
+                                 progress=_print_progress)
+    finally:
+        store.close()
+    print(file=sys.stderr)
+    print(f"{stats['rows']:,} fills -> {stats['round_trips']:,} round trips "
+          f"({stats['skipped']:,} skipped, {stats['open_quantity']:,} qty left open) "
+          f"in {stats['seconds']:.2f}s, {stats['rows_per_sec']:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
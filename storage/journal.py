@@ -0,0 +1,219 @@
+import json
+import os
+
+SNAPSHOT_VERSION = 2
+COMPACT_EVERY = 500
+# Trades are encoded in slices so a background save releases the GIL often.
+SNAPSHOT_SLICE = 5000
+
+
+def default_state() -> dict:
+    return {"theme": "light", "trades": [], "window": None}
+
+
+def write_json_atomic(path: str, obj, durable: bool = True) -> None:
+    """Write JSON to a temp file and swap it in, so readers never see a partial file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, separators=(",", ":"))
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Trade operations recorded in the journal, by AppState method name.
+JOURNAL_OPS = {
+    "add_trade": lambda trade: {"op": "add", "trade": trade},
+    "delete_trade": lambda index: {"op": "delete", "index": index},
+    "clear_trades": lambda: {"op": "clear"},
+}
+
+
+def apply_op(state: dict, op: dict) -> None:
+    """Apply one journaled operation to an in-memory state dict."""
+    kind = op["op"]
+    if kind == "add":
+        state["trades"].append(op["trade"])
+    elif kind == "delete":
+        del state["trades"][op["index"]]
+    elif kind == "clear":
+        state["trades"].clear()
+    elif kind == "set":
+        state[op["key"]] = op["value"]
+    else:
+        raise ValueError(f"Unknown journal op: {kind!r}")
+
+
+class JournalStore:
+    """
+    Snapshot + write-ahead journal persistence.
+
+    Every change is appended as one JSON line to <path>.journal. Once the
+    journal holds COMPACT_EVERY ops, the caller saves a full snapshot, which
+    is written to a temp file and atomically swapped in with os.replace.
+    Ops carry a sequence number so a crash between the swap and the journal
+    truncation never replays an op twice; a torn final line is discarded.
+
+    Settings (theme, window) also live in a small <path>.settings file so the
+    app can read them before the trade history has been parsed.
+    """
+
+    def __init__(self, path: str, compact_every: int = COMPACT_EVERY, durable: bool = True):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.settings_path = path + ".settings"
+        self.compact_every = compact_every
+        self.durable = durable
+        self.seq = 0
+        self.pending = 0
+        self._journal = None
+
+    # ================= Recovery =================
+    def load(self) -> dict:
+        state, migrated = self._read_snapshot()
+        self.seq = state.pop("seq", 0)
+        state.pop("version", None)
+
+        self.pending = 0
+        good_offset = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    good_offset += len(line)
+                    if op["seq"] <= self.seq:
+                        continue
+                    apply_op(state, op)
+                    self.seq = op["seq"]
+                    self.pending += 1
+            # Drop a torn tail so new ops are appended after the last good one.
+            if good_offset != os.path.getsize(self.journal_path):
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good_offset)
+
+        settings = self._read_settings()
+        if settings is not None:
+            state.update(settings)
+
+        if migrated:
+            self.save(state)
+        return state
+
+    def load_settings(self) -> dict:
+        """Theme and window only, without reading the trade history."""
+        settings = self._read_settings()
+        if settings is None:
+            # First run after an upgrade: settings are only in the snapshot.
+            state, _ = self._read_snapshot()
+            settings = {"theme": state["theme"], "window": state.get("window")}
+            write_json_atomic(self.settings_path, settings, self.durable)
+        return settings
+
+    def _read_settings(self):
+        if not os.path.exists(self.settings_path):
+            return None
+        with open(self.settings_path, "r") as f:
+            return json.load(f)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.path):
+            return default_state(), False
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        # Version 1 is the original pretty-printed app_state.json.
+        migrated = state.get("version") != SNAPSHOT_VERSION
+        for key, value in default_state().items():
+            state.setdefault(key, value)
+        return state, migrated
+
+    # ================= Writes =================
+    def save(self, state: dict) -> None:
+        """
+        Write a full snapshot atomically and truncate the journal.
+        state["trades"] may be a list of records or anything with to_records().
+        """
+        trades = state["trades"]
+        if hasattr(trades, "to_records"):
+            trades = trades.to_records()
+        settings = {"theme": state["theme"], "window": state.get("window")}
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            header = {"version": SNAPSHOT_VERSION, "seq": self.seq, **settings}
+            f.write(json.dumps(header, separators=(",", ":"))[:-1] + ',"trades":[')
+            for start in range(0, len(trades), SNAPSHOT_SLICE):
+                if start:
+                    f.write(",")
+                f.write(json.dumps(trades[start:start + SNAPSHOT_SLICE], separators=(",", ":"))[1:-1])
+            f.write("]}")
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        write_json_atomic(self.settings_path, settings, self.durable)
+
+        self._close_journal()
+        open(self.journal_path, "w").close()
+        self.pending = 0
+
+    def add_trade(self, trade: dict) -> None:
+        self._write_lines([self._encode(JOURNAL_OPS["add_trade"](trade))])
+
+    def delete_trade(self, index: int) -> None:
+        self._write_lines([self._encode(JOURNAL_OPS["delete_trade"](index))])
+
+    def clear_trades(self) -> None:
+        self._write_lines([self._encode(JOURNAL_OPS["clear_trades"]())])
+
+    def set(self, key: str, value) -> None:
+        settings = self.load_settings()
+        settings[key] = value
+        write_json_atomic(self.settings_path, settings, self.durable)
+
+    def apply(self, ops) -> None:
+        """
+        Apply a batch of (method, args) operations with a single journal
+        flush/fsync, e.g. a coalesced burst from the background writer.
+        """
+        lines = []
+        for name, args in ops:
+            if name in JOURNAL_OPS:
+                lines.append(self._encode(JOURNAL_OPS[name](*args)))
+            else:
+                self._write_lines(lines)
+                lines = []
+                getattr(self, name)(*args)
+        self._write_lines(lines)
+
+    def compaction_due(self) -> bool:
+        return self.pending >= self.compact_every
+
+    def close(self) -> None:
+        self._close_journal()
+
+    def _encode(self, op: dict) -> str:
+        self.seq += 1
+        op["seq"] = self.seq
+        return json.dumps(op, separators=(",", ":")) + "\n"
+
+    def _write_lines(self, lines) -> None:
+        if not lines:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a")
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+        self.pending += len(lines)
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
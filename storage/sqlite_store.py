@@ -0,0 +1,194 @@
+import json
+import sqlite3
+from datetime import date
+
+BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    trade_date TEXT NOT NULL,
+    symbol TEXT,
+    exchange TEXT NOT NULL DEFAULT 'NSE',
+    buy REAL NOT NULL,
+    sell REAL NOT NULL,
+    qty INTEGER NOT NULL,
+    net_pnl REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_date ON trades (trade_date);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades (symbol);
+CREATE INDEX IF NOT EXISTS idx_trades_exchange ON trades (exchange);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteStore:
+    """
+    SQLite trade store with the same interface as JournalStore.
+
+    The app's working set is one session day, so load() and the index-based
+    operations only touch trades dated session_date; older history stays on
+    disk and is reached through the indexed aggregate queries below. Startup
+    cost therefore does not grow with history.
+    """
+
+    def __init__(self, path: str, session_date: str = None):
+        self.path = path
+        self.session_date = session_date or date.today().isoformat()
+        # AppState serializes access, so the background loader may use it too.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    # ================= AppState interface =================
+    def load_settings(self) -> dict:
+        settings = {"theme": "light", "window": None}
+        for key, value in self.conn.execute("SELECT key, value FROM settings"):
+            settings[key] = json.loads(value)
+        return settings
+
+    def load(self) -> dict:
+        state = self.load_settings()
+        state["trades"] = [
+            {"buy": buy, "sell": sell, "qty": qty, "net_pnl": net_pnl, "date": trade_date}
+            for buy, sell, qty, net_pnl, trade_date in self.conn.execute(
+                "SELECT buy, sell, qty, net_pnl, trade_date FROM trades WHERE trade_date = ? ORDER BY id",
+                (self.session_date,)
+            )
+        ]
+        return state
+
+    def save(self, state: dict) -> None:
+        """Replace the session's trades and all settings in one transaction."""
+        with self.conn:
+            self._replace(state)
+
+    def add_trade(self, trade: dict) -> None:
+        with self.conn:
+            self._insert([trade])
+
+    def add_trades(self, trades, batch_size: int = BATCH_SIZE) -> int:
+        """Bulk insert, one transaction per batch. Returns rows written."""
+        written = 0
+        batch = []
+        for trade in trades:
+            batch.append(trade)
+            if len(batch) >= batch_size:
+                with self.conn:
+                    self._insert(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            with self.conn:
+                self._insert(batch)
+            written += len(batch)
+        return written
+
+    def delete_trade(self, index: int) -> None:
+        with self.conn:
+            self._delete_at(index)
+
+    def clear_trades(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM trades WHERE trade_date = ?", (self.session_date,))
+
+    def set(self, key: str, value) -> None:
+        with self.conn:
+            self._set(key, value)
+
+    def apply(self, ops) -> None:
+        """Apply a batch of (method, args) operations in one transaction."""
+        with self.conn:
+            for name, args in ops:
+                if name == "save":
+                    self._replace(*args)
+                elif name == "add_trade":
+                    self._insert(args)
+                elif name == "delete_trade":
+                    self._delete_at(*args)
+                elif name == "clear_trades":
+                    self.conn.execute("DELETE FROM trades WHERE trade_date = ?", (self.session_date,))
+                elif name == "set":
+                    self._set(*args)
+                else:
+                    raise ValueError(f"Unknown operation: {name!r}")
+
+    def compaction_due(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ================= Queries =================
+    def total_net_pnl(self, start: str = None, end: str = None) -> float:
+        where, args = self._date_range(start, end)
+        (total,) = self.conn.execute(f"SELECT COALESCE(SUM(net_pnl), 0) FROM trades{where}", args).fetchone()
+        return total
+
+    def daily_net_pnl(self, start: str = None, end: str = None) -> list:
+        """[(trade_date, net_pnl, trades), ...] ordered by date."""
+        where, args = self._date_range(start, end)
+        return self.conn.execute(
+            f"SELECT trade_date, SUM(net_pnl), COUNT(*) FROM trades{where} "
+            "GROUP BY trade_date ORDER BY trade_date", args
+        ).fetchall()
+
+    def symbol_net_pnl(self, start: str = None, end: str = None) -> list:
+        """[(symbol, net_pnl, trades), ...] ordered by symbol."""
+        where, args = self._date_range(start, end)
+        return self.conn.execute(
+            f"SELECT symbol, SUM(net_pnl), COUNT(*) FROM trades{where} "
+            "GROUP BY symbol ORDER BY symbol", args
+        ).fetchall()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+    # ================= Internals =================
+    def _insert(self, trades):
+        self.conn.executemany(
+            "INSERT INTO trades (trade_date, symbol, exchange, buy, sell, qty, net_pnl) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (t.get("date", self.session_date), t.get("symbol"), t.get("exchange", "NSE").upper(),
+                 t["buy"], t["sell"], t["qty"], t["net_pnl"])
+                for t in trades
+            )
+        )
+
+    def _replace(self, state):
+        trades = state["trades"]
+        if hasattr(trades, "to_records"):
+            trades = trades.to_records()
+        self.conn.execute("DELETE FROM trades WHERE trade_date = ?", (self.session_date,))
+        self._insert(trades)
+        for key in ("theme", "window"):
+            self._set(key, state.get(key))
+
+    def _delete_at(self, index):
+        self.conn.execute(
+            "DELETE FROM trades WHERE id = ("
+            "SELECT id FROM trades WHERE trade_date = ? ORDER BY id LIMIT 1 OFFSET ?)",
+            (self.session_date, index)
+        )
+
+    def _set(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    @staticmethod
+    def _date_range(start, end):
+        clauses, args = [], []
+        if start:
+            clauses.append("trade_date >= ?")
+            args.append(start)
+        if end:
+            clauses.append("trade_date <= ?")
+            args.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
@@ -0,0 +1,86 @@
+import os
+import threading
+from datetime import date
+
+from core import metrics
+from storage.journal import JournalStore
+
+STATE_FILE = "app_state.json"
+SQLITE_STATE_FILE = "app_state.db"
+# "journal" (default) or "sqlite"
+STORE_ENV = "ZERODHA_PNL_STORE"
+
+
+class AppState:
+    """
+    Persistence facade used by the app. Changes are recorded as individual
+    operations; save() writes a full snapshot.
+
+    The backend is a JSON journal unless the path ends in .db/.sqlite or
+    ZERODHA_PNL_STORE=sqlite, in which case trades live in SQLite. Calls are
+    serialized with a lock so trades can be loaded off the Tk main thread.
+    """
+
+    def __init__(self, path: str = None, backend: str = None):
+        backend = backend or os.environ.get(STORE_ENV, "")
+        if path is None:
+            path = SQLITE_STATE_FILE if backend == "sqlite" else STATE_FILE
+        if backend == "sqlite" or path.endswith((".db", ".sqlite")):
+            from storage.sqlite_store import SQLiteStore
+            self.backend = SQLiteStore(path)
+        else:
+            self.backend = JournalStore(path)
+        self.lock = threading.Lock()
+
+    @property
+    def session_date(self) -> str:
+        """
+        Date to stamp new trades with. The SQLite backend's working set is
+        fixed to one day when it opens, so new trades keep that day even
+        after midnight and index-based deletes stay aligned with the app.
+        """
+        return getattr(self.backend, "session_date", None) or date.today().isoformat()
+
+    @metrics.timed("state.load_settings")
+    def load_settings(self) -> dict:
+        with self.lock:
+            return self.backend.load_settings()
+
+    @metrics.timed("state.load")
+    def load(self) -> dict:
+        with self.lock:
+            return self.backend.load()
+
+    @metrics.timed("state.save")
+    def save(self, state: dict) -> None:
+        with self.lock:
+            self.backend.save(state)
+
+    def add_trade(self, trade: dict) -> None:
+        with self.lock:
+            self.backend.add_trade(trade)
+
+    def delete_trade(self, index: int) -> None:
+        with self.lock:
+            self.backend.delete_trade(index)
+
+    def clear_trades(self) -> None:
+        with self.lock:
+            self.backend.clear_trades()
+
+    def set(self, key: str, value) -> None:
+        with self.lock:
+            self.backend.set(key, value)
+
+    @metrics.timed("state.apply")
+    def apply(self, ops) -> None:
+        """Apply a batch of (method, args) operations with one flush/commit."""
+        with self.lock:
+            self.backend.apply(ops)
+
+    def compaction_due(self) -> bool:
+        return self.backend.compaction_due()
+
+    def close(self) -> None:
+        with self.lock:
+            self.backend.close()
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+from core.analytics import TradeAnalytics
+from core.ledger import TradeLedger
+
+
+def reference(nets):
+    running = peak = drawdown = 0.0
+    for net in nets:
+        running += net
+        peak = max(peak, running)
+        drawdown = max(drawdown, peak - running)
+    return running, peak, drawdown
+
+
+def test_summary_statistics():
+    analytics = TradeAnalytics()
+    analytics.add(100, 110, 10, 90.0, "2026-01-05", "INFY")
+    analytics.add(100, 95, 10, -60.0, "2026-01-05", "TCS")
+    analytics.add(100, 104, 10, 30.0, "2026-01-06", "INFY")
+
+    s = analytics.summary()
+    assert (s.trades, s.wins, s.losses) == (3, 2, 1)
+    assert s.net_pnl == pytest.approx(60.0)
+    assert s.win_rate == pytest.approx(2 / 3)
+    assert s.profit_factor == pytest.approx(120 / 60)
+    assert s.max_drawdown == pytest.approx(60.0)
+    assert s.current_drawdown == pytest.approx(30.0)
+    # charges = gross - net: 10 + 10 + 10 on 6300 turnover
+    assert s.charges == pytest.approx(30.0)
+    assert s.charges_pct == pytest.approx(30 / 6090 * 100)
+
+
+def test_rollups_by_day_and_symbol():
+    analytics = TradeAnalytics()
+    analytics.add(100, 110, 10, 90.0, "2026-01-05", "INFY")
+    analytics.add(100, 95, 10, -60.0, "2026-01-05", "TCS")
+    analytics.add(100, 104, 10, 30.0, "2026-01-06", "INFY")
+
+    assert list(analytics.by_day()) == ["2026-01-05", "2026-01-06"]
+    assert analytics.day("2026-01-05").net_pnl == pytest.approx(30.0)
+    assert analytics.symbol("INFY").trades == 2
+    assert analytics.day("2026-02-01").trades == 0
+
+    analytics.remove(1)
+    assert "TCS" not in analytics.by_symbol()
+    assert analytics.day("2026-01-05").trades == 1
+
+
+def test_incremental_matches_full_scan():
+    rng = random.Random(7)
+    analytics = TradeAnalytics()
+    nets = []
+    for step in range(5000):
+        if nets and rng.random() < 0.4:
+            i = rng.randrange(len(nets))
+            nets.pop(i)
+            analytics.remove(i)
+        else:
+            nets.append(rng.uniform(-100, 100))
+            analytics.add(100, 101, 1, nets[-1])
+        if step % 250 == 0:
+            total, peak, drawdown = reference(nets)
+            s = analytics.summary()
+            assert s.net_pnl == pytest.approx(total, abs=1e-6)
+            assert s.peak_equity == pytest.approx(peak, abs=1e-6)
+            assert s.max_drawdown == pytest.approx(drawdown, abs=1e-6)
+
+    assert analytics.equity_curve() == pytest.approx([sum(nets[:i + 1]) for i in range(len(nets))])
+    assert analytics.equity_curve(3) == pytest.approx([nets[0], sum(nets[:len(nets) // 2 + 1]), sum(nets)])
+
+
+def test_rebuild_from_ledger_matches_incremental():
+    rng = random.Random(3)
+    ledger = TradeLedger()
+    incremental = TradeAnalytics()
+    for i in range(1000):
+        buy = rng.uniform(50, 500)
+        sell = buy * rng.uniform(0.98, 1.02)
+        net = (sell - buy) * 10 - 5
+        day = f"2026-01-{1 + i % 20:02d}"
+        ledger.append(buy, sell, 10, net, day)
+        incremental.add(buy, sell, 10, net, day)
+
+    rebuilt = TradeAnalytics.from_ledger(ledger)
+    a, b = rebuilt.summary(), incremental.summary()
+    for field in a._fields:
+        assert getattr(a, field) == pytest.approx(getattr(b, field))
+    assert rebuilt.by_day() == pytest.approx(incremental.by_day())
+
+
+def test_empty_and_clear():
+    analytics = TradeAnalytics()
+    assert analytics.summary().profit_factor == 0.0
+    analytics.add(1, 2, 1, 0.5)
+    assert analytics.summary().profit_factor == float("inf")
+    analytics.clear()
+    assert len(analytics) == 0 and analytics.max_drawdown() == 0.0
+    with pytest.raises(IndexError):
+        analytics.remove(0)
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pytest
+from core.calculator import zerodha_intraday_pnl
+from storage.archive import ARCHIVE_VERSION, HEADER, TradeArchive, write_archive, write_records
+
+RECORDS = [
+    {"buy": 100, "sell": 101.5, "qty": 10, "net_pnl": 9, "date": "2026-01-02"},
+    {"buy": 1520.35, "sell": 1534.8, "qty": 250, "net_pnl": 3456.7},
+    {"date": "2026-01-03", "symbol": "INFY", "exchange": "BSE",
+     "buy": 10, "sell": 9, "qty": 3, "net_pnl": -3.5},
+]
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "trades.zpa")
+    assert write_records(path, RECORDS) == 3
+
+    with TradeArchive(path) as archive:
+        assert archive.version == ARCHIVE_VERSION
+        assert len(archive) == 3
+        assert archive.to_records() == RECORDS
+        assert archive.symbols() == [None, None, "INFY"]
+        # Charges are the calculator's full breakdown.
+        expected = zerodha_intraday_pnl(10, 9, 3, "BSE")
+        assert archive.column("total_charges")[2] == expected["Total Charges"]
+        assert archive.column("stt")[2] == expected["STT"]
+
+
+def test_batch_writes_and_single_column_scan(tmp_path):
+    path = str(tmp_path / "day.zpa")
+    buy = np.array([100.0, 200.0, 300.0])
+    write_archive(path, buy, buy + 1, [10, 20, 30], ["NSE", "BSE", "nse"], trade_dates=["2026-02-02"] * 3)
+
+    with TradeArchive(path) as archive:
+        net = archive.column("net_pnl")
+        expected = [zerodha_intraday_pnl(b, b + 1, q, e)["Net P&L"]
+                    for b, q, e in zip(buy, [10, 20, 30], ["NSE", "BSE", "NSE"])]
+        assert list(net) == pytest.approx(expected)
+        assert np.frombuffer(net).sum() == pytest.approx(sum(expected))
+        assert [r["exchange"] for r in archive.to_records()] == ["NSE", "BSE", "NSE"]
+        net.release()
+
+
+def test_invalid_rows_leave_no_file(tmp_path):
+    path = str(tmp_path / "bad.zpa")
+    with pytest.raises(ValueError, match="1 trade"):
+        write_archive(path, [100, -1], [101, 101], [1, 1])
+    assert os.listdir(tmp_path) == []
+
+
+def test_rejects_unknown_version_and_foreign_files(tmp_path):
+    path = str(tmp_path / "trades.zpa")
+    write_records(path, RECORDS)
+    with open(path, "r+b") as f:
+        header = bytearray(f.read(HEADER.size))
+        header[8:10] = (ARCHIVE_VERSION + 1).to_bytes(2, "little")
+        f.seek(0)
+        f.write(header)
+    with pytest.raises(ValueError, match="Unsupported archive version"):
+        TradeArchive(path)
+
+    other = tmp_path / "trades.json"
+    other.write_bytes(b"[" + b" " * 100 + b"]")
+    with pytest.raises(ValueError, match="not a trade archive"):
+        TradeArchive(str(other))
+
+
+def test_empty_archive(tmp_path):
+    path = str(tmp_path / "empty.zpa")
+    write_records(path, [])
+    with TradeArchive(path) as archive:
+        assert len(archive) == 0
+        assert archive.to_records() == []
@@ -0,0 +1,32 @@
+import json
+
+from benchmarks.suite import compare, main
+
+
+def results(**values):
+    return {"meta": {}, "results": {
+        name: {"value": value, "unit": "ops/s" if name.endswith("rate") else "s"}
+        for name, value in values.items()
+    }}
+
+
+def test_compare_direction_and_threshold():
+    baseline = results(scalar_rate=1000.0, save=1.0, load=1.0, render=0.5)
+    current = results(scalar_rate=800.0, save=1.1, load=0.5, extra=2.0)
+    rows = {row[0]: row for row in compare(baseline, current, threshold=0.15)}
+
+    assert rows["scalar_rate"][4] == "regressed"      # 20% fewer ops/s is 25% slower
+    assert rows["save"][4] == "ok"                    # 10% slower is within threshold
+    assert rows["load"][4] == "improved"
+    assert rows["render"][4] == rows["extra"][4] == "missing"
+
+
+def test_compare_command_fails_on_regression(tmp_path, capsys):
+    base, ok, slow = tmp_path / "base.json", tmp_path / "ok.json", tmp_path / "slow.json"
+    base.write_text(json.dumps(results(save=1.0)))
+    ok.write_text(json.dumps(results(save=1.05)))
+    slow.write_text(json.dumps(results(save=1.5)))
+
+    assert main(["compare", str(base), "--current", str(ok)]) == 0
+    assert main(["compare", str(base), "--current", str(slow), "--threshold", "0.2"]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import pytest
+from core.cache import QuoteCache
+from core.calculator import zerodha_intraday_pnl
+from core.schedule import ChargeSchedule, SEGMENTS
+
+
+def test_hits_on_normalized_inputs():
+    cache = QuoteCache()
+    first = cache.quote(100, 101, 10, "NSE")
+    second = cache.quote(100.0, 101.0, 10, "nse")
+
+    assert second is first
+    assert dict(first) == zerodha_intraday_pnl(100, 101, 10, "NSE")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_results_are_immutable():
+    cache = QuoteCache()
+    result = cache.quote(100, 101, 10)
+    with pytest.raises(TypeError):
+        result["Net P&L"] = 0
+    assert cache.quote(100, 101, 10)["Net P&L"] == 8.93
+
+
+def test_lru_eviction():
+    cache = QuoteCache(maxsize=2)
+    cache.quote(100, 101, 1)
+    cache.quote(100, 101, 2)
+    cache.quote(100, 101, 1)
+    cache.quote(100, 101, 3)
+
+    cache.quote(100, 101, 1)
+    cache.quote(100, 101, 2)
+    assert cache.stats() == {"hits": 2, "misses": 4, "evictions": 2, "size": 2, "maxsize": 2}
+
+
+def test_schedule_change_invalidates():
+    cache = QuoteCache()
+    cache.quote(100, 101, 10)
+    cache.set_schedule(ChargeSchedule([{
+        "effective_from": "2020-01-01",
+        "segments": {s: {"txn": {"NSE": 0.0, "BSE": 0.0}} for s in SEGMENTS},
+    }]))
+
+    assert cache.stats()["size"] == 0
+    assert cache.quote(100, 101, 10)["Total Charges"] == 0
+
+
+def test_invalid_inputs_raise_and_are_not_cached():
+    cache = QuoteCache()
+    with pytest.raises(ValueError):
+        cache.quote(0, 101, 10)
+    assert cache.stats()["size"] == 0
@@ -1,5 +1,11 @@
 import pytest
-from core.calculator import zerodha_intraday_pnl
+import numpy as np
+from core.calculator import (
+    zerodha_intraday_pnl, zerodha_intraday_pnl_batch,
+    zerodha_intraday_pnl_report, format_pnl_report,
+    zerodha_intraday_pnl_paise, zerodha_intraday_pnl_batch_paise,
+    paise_to_rupees, to_paise
+)
 
 def test_basic_intraday_nse():
     """Test normal NSE intraday trade"""
@@ -35,3 +41,133 @@ def test_invalid_prices():
 
     with pytest.raises(ValueError):
         zerodha_intraday_pnl(100, -5, 10, "BSE")
+
+
+def test_batch_matches_scalar():
+    """Batch pricing matches the scalar function to the paisa"""
+    n = 100_000
+    rng = np.random.default_rng(1)
+    buy = rng.uniform(1, 5000, n).round(2)
+    sell = (buy * rng.uniform(0.95, 1.05, n)).round(2)
+    qty = rng.integers(1, 5000, n)
+    exchange = rng.choice(["NSE", "bse"], n)
+
+    batch = zerodha_intraday_pnl_batch(buy, sell, qty, exchange)
+
+    assert batch["Valid"].all()
+    scalars = [zerodha_intraday_pnl(b, s, q, e)
+               for b, s, q, e in zip(buy.tolist(), sell.tolist(), qty.tolist(), exchange.tolist())]
+    for key in scalars[0]:
+        expected = np.array([scalar[key] for scalar in scalars])
+        assert np.array_equal(batch[key], expected), key
+
+
+def test_batch_rounds_ties_like_scalar():
+    """A value an ulp off a .xx5 tie rounds the same way in both paths"""
+    assert zerodha_intraday_pnl(1669.33, 1739.03, 2000)["STT"] == 869.51
+    assert zerodha_intraday_pnl_batch([1669.33], [1739.03], [2000])["STT"].tolist() == [869.51]
+    net = np.empty(1)
+    zerodha_intraday_pnl_batch([1669.33], [1739.03], [2000], out={"STT": net})
+    assert net.tolist() == [869.51]
+
+
+def test_batch_brokerage_cap():
+    """Brokerage is clamped per order at BROKERAGE_CAP"""
+    result = zerodha_intraday_pnl_batch([1000, 100], [1000, 100], [1000, 10])
+    assert result["Zerodha Brokerage"].tolist() == [40.0, 0.6]
+
+
+def test_batch_invalid_rows_masked():
+    """Invalid rows are flagged in the mask instead of raising"""
+    result = zerodha_intraday_pnl_batch([100, 0, 100, 100], [101, 101, -5, 101], [10, 10, 10, 0],
+                                        ["NSE", "NSE", "BSE", "NSE"])
+    assert result["Valid"].tolist() == [True, False, False, False]
+    assert result["Net P&L"][0] == pytest.approx(8.93, rel=1e-2)
+    assert np.isnan(result["Net P&L"][1:]).all()
+
+    result = zerodha_intraday_pnl_batch([100], [101], [10], ["NYSE"])
+    assert not result["Valid"][0]
+
+
+def test_pnl_does_not_print(capsys):
+    """The fast path is pure and writes nothing to stdout"""
+    zerodha_intraday_pnl(100, 101, 10, "NSE")
+    assert capsys.readouterr().out == ""
+
+
+def test_report_rendered_from_result(capsys):
+    """The report is built from an existing result on request"""
+    result = zerodha_intraday_pnl(100, 101, 10, "NSE")
+    report = format_pnl_report(100, 101, 10, "NSE", result)
+    assert "Net P&L                  : 8.93" in report
+    assert "Break-even Margin %      : 0.11%" in report
+
+    zerodha_intraday_pnl_report(100, 101, 10, "NSE", result=result)
+    assert capsys.readouterr().out.strip() == report
+
+
+def test_batch_writes_into_preallocated_columns():
+    """Columns passed in out are filled in place and returned"""
+    net = np.zeros(2)
+    result = zerodha_intraday_pnl_batch([100, 0], [101, 101], [10, 10], "NSE", out={"Net P&L": net})
+    assert result["Net P&L"] is net
+    assert net[0] == pytest.approx(8.93, rel=1e-2)
+    assert np.isnan(net[1])
+
+
+def test_exact_paise_contract_note_rounding():
+    """Charges are rounded per line in paise, STT to the rupee, and add up exactly"""
+    result = zerodha_intraday_pnl_paise(1520.35, 1534.8, 250, "NSE")
+    assert result["Turnover"] == 76378750
+    assert result["Zerodha Brokerage"] == 4000          # both legs capped at ₹20
+    assert result["STT"] == 9600                        # ₹95.92 -> ₹96
+    assert result["Exchange Txn Charges"] == 2268
+    charges = ("Zerodha Brokerage", "Exchange Txn Charges", "SEBI Charges", "Stamp Duty", "STT", "GST")
+    assert result["Total Charges"] == sum(result[k] for k in charges)
+    assert result["Net P&L"] == result["Gross P&L"] - result["Total Charges"]
+    assert paise_to_rupees(result)["Net P&L"] == 3430.24
+
+
+def test_exact_sums_do_not_drift():
+    """A day of trades sums to the paisa, unlike accumulated floats"""
+    trades = [(100.05, 100.15, 7, "NSE")] * 10_000
+    total = sum(zerodha_intraday_pnl_paise(*t)["Net P&L"] for t in trades)
+    assert total == 10_000 * zerodha_intraday_pnl_paise(*trades[0])["Net P&L"]
+    assert to_paise("100.15") == 10015 and to_paise(0.29) == 29
+
+
+def test_exact_batch_matches_scalar():
+    """The int64 batch path agrees with the scalar path row for row"""
+    rng = np.random.default_rng(4)
+    buy = rng.uniform(50, 5000, 500).round(2)
+    sell = (buy * rng.uniform(0.97, 1.03, 500)).round(2)
+    qty = rng.integers(1, 2000, 500)
+    exchanges = np.where(rng.random(500) < 0.5, "NSE", "bse")
+
+    batch = zerodha_intraday_pnl_batch_paise(buy, sell, qty, exchanges)
+    assert batch["Valid"].all()
+    for i in range(0, 500, 37):
+        scalar = zerodha_intraday_pnl_paise(buy[i], sell[i], int(qty[i]), exchanges[i])
+        assert {k: int(v[i]) for k, v in batch.items() if k != "Valid"} == scalar
+
+    invalid = zerodha_intraday_pnl_batch_paise([100, 0], [101, 101], [10, 10])
+    assert invalid["Valid"].tolist() == [True, False]
+    assert invalid["Net P&L"][1] == 0
+
+
+def test_exact_batch_accepts_scalar_inputs():
+    """Scalars give 0-d results, as with the float batch"""
+    exact = zerodha_intraday_pnl_batch_paise(100, 101, 10)
+    floats = zerodha_intraday_pnl_batch(100, 101, 10)
+    assert exact["Valid"].shape == floats["Valid"].shape == ()
+    for key, value in exact.items():
+        assert value.shape == floats[key].shape
+    assert exact["Net P&L"] == zerodha_intraday_pnl_paise(100, 101, 10)["Net P&L"]
+
+
+def test_exact_rejects_fractional_quantities():
+    with pytest.raises(ValueError):
+        zerodha_intraday_pnl_paise(100, 101, 2.7)
+    result = zerodha_intraday_pnl_batch_paise([100] * 3, [101] * 3, [2.7, 0.5, 2.0])
+    assert result["Valid"].tolist() == [False, False, True]
+    assert result["Points to Breakeven"].tolist()[:2] == [0, 0]
@@ -0,0 +1,110 @@
+import io
+import json
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from cli.commands import cmd_archive, cmd_mtm, cmd_price, iter_priced, parse_line
+
+
+def price(values=(), file=None, fmt="jsonl", chunk_rows=4, exact=False):
+    out = io.StringIO()
+    args = SimpleNamespace(values=list(values), file=file, format=fmt, exchange="NSE", chunk_rows=chunk_rows,
+                           exact=exact)
+    code = cmd_price(args, out)
+    return code, out.getvalue()
+
+
+def test_price_arguments():
+    code, out = price(["100", "101", "10", "NSE"])
+    assert code == 0
+    assert json.loads(out)["Net P&L"] == 8.93
+
+
+def test_price_arguments_report_parse_errors():
+    code, out = price(["abc", "101", "10"])
+    assert code == 1
+    assert json.loads(out) == {"error": "could not convert string to float: 'abc'"}
+
+    code, out = price(["buy", "sell", "qty"])
+    assert code == 1
+    assert json.loads(out) == {"error": "expected buy, sell, qty[, exchange]"}
+
+
+def test_price_exact_matches_between_arguments_and_files(tmp_path):
+    code, out = price(["1520.35", "1534.8", "250"], exact=True)
+    single = json.loads(out)
+    assert (single["STT"], single["Net P&L"]) == (96.0, 3430.24)
+
+    path = tmp_path / "trades.csv"
+    path.write_text("1520.35,1534.8,250\n")
+    code, out = price(file=str(path), exact=True)
+    assert json.loads(out) == single
+
+
+def test_price_file_streams_chunks(tmp_path):
+    path = tmp_path / "trades.csv"
+    path.write_text("buy,sell,qty,exchange\n" + "100,101,10,BSE\n" * 10 + "100,0,10\n")
+
+    code, out = price(file=str(path), fmt="csv")
+
+    lines = out.splitlines()
+    assert code == 1
+    assert len(lines) == 12
+    assert lines[1].endswith("8.91,")
+    assert lines[-1].endswith("Buy and Sell prices must be greater than 0.")
+
+
+def test_mtm_writes_frames_for_simulated_feed(tmp_path):
+    path = tmp_path / "positions.csv"
+    path.write_text("symbol,qty,entry\nINFY,100,1500\nTCS,-20,3500,BSE\n")
+    out = io.StringIO()
+    args = SimpleNamespace(positions=str(path), replay=None, speed=0.0, ticks=5000, seed=1, fps=10)
+
+    assert cmd_mtm(args, out) == 0
+    frames = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sum(f["ticks"] for f in frames) == 5000
+    assert frames[-1]["updated"] <= 2
+
+
+def test_archive_packs_and_unpacks_a_snapshot(tmp_path):
+    trades = [{"buy": 100, "sell": 101, "qty": 10, "net_pnl": 9, "date": "2026-01-02"}]
+    snapshot = tmp_path / "app_state.json"
+    snapshot.write_text(json.dumps({"version": 2, "theme": "light", "trades": trades}))
+    archive = str(tmp_path / "trades.zpa")
+
+    out = io.StringIO()
+    assert cmd_archive(SimpleNamespace(source=str(snapshot), dest=archive), out) == 0
+    assert json.loads(out.getvalue())["archived"] == 1
+
+    out = io.StringIO()
+    assert cmd_archive(SimpleNamespace(source=archive, dest="-"), out) == 0
+    assert json.loads(out.getvalue()) == trades
+
+
+def test_parse_errors_are_reported_per_line():
+    results = list(iter_priced(["100,101,10", "oops,1,2", '{"buy": 100, "sell": 101, "qty": 10}']))
+    assert [r[2] for r in results] == [None, "line 2: could not convert string to float: 'oops'", None]
+
+
+def test_non_finite_numbers_are_rejected_per_line():
+    results = list(iter_priced(["nan,101,10", '{"buy": 100, "sell": 101, "qty": Infinity}', "100,101,10"]))
+    assert [r[2] for r in results] == ["line 1: buy must be a finite number",
+                                       "line 2: qty must be a finite number", None]
+
+
+def test_parse_line_skips_header_and_blank():
+    assert parse_line("buy sell qty", "NSE") is None
+    assert parse_line("", "NSE") is None
+    assert parse_line("1 2 3 bse", "NSE") == (1.0, 2.0, 3, "bse")
+
+
+def test_cli_does_not_import_gui_toolkits():
+    code = (
+        "import sys, runpy; sys.argv = ['cli', 'price', '100', '101', '10'];\n"
+        "try: runpy.run_module('cli', run_name='__main__')\n"
+        "except SystemExit: pass\n"
+        "print(sorted(m for m in ('tkinter', 'ttkbootstrap', 'numpy') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "[]"
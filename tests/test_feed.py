@@ -0,0 +1,20 @@
+from core.feed import simulated_feed, write_ticks, replay_feed
+
+
+def test_simulated_feed_is_seeded_and_on_tick_size():
+    prices = {"A": 100.0, "B": 2500.0}
+    first = [(t.symbol, t.price) for t in simulated_feed(prices, 500, seed=7)]
+    second = [(t.symbol, t.price) for t in simulated_feed(prices, 500, seed=7)]
+    assert first == second
+    assert {s for s, _ in first} == {"A", "B"}
+    assert all(round(p / 0.05, 6) % 1 == 0 and p > 0 for _, p in first)
+
+
+def test_recorded_feed_replays(tmp_path):
+    path = str(tmp_path / "ticks.csv")
+    ticks = list(simulated_feed({"A": 100.0}, 50, seed=1))
+    assert write_ticks(ticks, path) == 50
+
+    replayed = list(replay_feed(path))
+    assert [(t.symbol, t.price) for t in replayed] == [(t.symbol, t.price) for t in ticks]
+    assert all(t.ts > 0 for t in replayed)
@@ -0,0 +1,28 @@
+import random
+from core.fenwick import FenwickTree
+
+
+def test_prefix_sums_match_naive():
+    rng = random.Random(3)
+    values = [rng.randint(-50, 50) for _ in range(257)]
+    tree = FenwickTree(values, "q")
+    for n in range(len(values) + 1):
+        assert tree.prefix_sum(n) == sum(values[:n])
+
+
+def test_append_and_add():
+    tree = FenwickTree(typecode="q")
+    values = []
+    for v in range(1, 40):
+        tree.append(v)
+        values.append(v)
+    tree.add(10, -5)
+    values[10] -= 5
+    for n in range(len(values) + 1):
+        assert tree.prefix_sum(n) == sum(values[:n])
+
+
+def test_find_on_counts():
+    counts = [1, 0, 1, 1, 0, 0, 1]
+    tree = FenwickTree(counts, "q")
+    assert [tree.find(k) for k in range(1, 5)] == [0, 2, 3, 6]
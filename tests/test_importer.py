@@ -0,0 +1,74 @@
+import pytest
+from core.calculator import zerodha_intraday_pnl
+from storage.importer import import_tradebook
+from storage.sqlite_store import SQLiteStore
+
+HEADER = "symbol,isin,trade_date,exchange,segment,series,trade_type,auction,quantity,price,trade_id\n"
+
+
+def write_tradebook(path, rows):
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for i, (day, symbol, side, qty, price) in enumerate(rows):
+            f.write(f"{symbol},INE000,{day},NSE,EQ,EQ,{side},false,{qty},{price},{i}\n")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_import_streams_chunks_into_store(tmp_path, jobs):
+    rows = []
+    for i in range(200):
+        rows.append(("2026-01-02", f"S{i % 7}", "buy", 10, 100 + i))
+        rows.append(("2026-01-02", f"S{i % 7}", "sell", 10, 101 + i))
+    csv_path = tmp_path / "tradebook.csv"
+    write_tradebook(csv_path, rows)
+    store = SQLiteStore(str(tmp_path / "trades.db"))
+    seen = []
+
+    stats = import_tradebook(str(csv_path), store, jobs=jobs, chunk_bytes=1024,
+                             progress=lambda s: seen.append(s["rows"]))
+
+    assert stats["rows"] == 400
+    assert stats["round_trips"] == 200
+    assert len(seen) > 1
+    expected = sum(zerodha_intraday_pnl(100 + i, 101 + i, 10)["Net P&L"] for i in range(200))
+    assert store.total_net_pnl() == pytest.approx(expected)
+    store.close()
+
+
+def test_fills_of_one_order_share_the_brokerage_cap(tmp_path):
+    """Two partial fills of one order pay ₹20 brokerage per side, not per fill."""
+    csv_path = tmp_path / "tradebook.csv"
+    csv_path.write_text(
+        "symbol,trade_date,exchange,trade_type,quantity,price,order_id\n"
+        "INFY,2026-01-02,NSE,buy,1000,1500,A\n"
+        "INFY,2026-01-02,NSE,buy,1000,1500,A\n"
+        "INFY,2026-01-02,NSE,sell,2000,1510,B\n"
+    )
+    store = SQLiteStore(str(tmp_path / "trades.db"))
+
+    stats = import_tradebook(str(csv_path), store)
+
+    assert stats["round_trips"] == 2
+    expected = zerodha_intraday_pnl(1500, 1510, 2000)["Net P&L"]
+    assert store.total_net_pnl() == pytest.approx(expected, abs=0.02)
+    store.close()
+
+
+def test_malformed_rows_are_skipped_not_fatal(tmp_path):
+    csv_path = tmp_path / "tradebook.csv"
+    csv_path.write_text(
+        "symbol,trade_date,exchange,trade_type,quantity,price\n"
+        "INFY,2026-01-02,NSE,buy,10,100\n"
+        "INFY,2026-01-02,NSE,buy,,100\n"
+        "INFY,2026-01-02\n"
+        "INFY,2026-01-02,NSE,short,10,90\n"
+        "INFY,2026-01-02,NSE,,10,90\n"
+        "INFY,2026-01-02,NSE,sell,10,101\n"
+    )
+    store = SQLiteStore(str(tmp_path / "trades.db"))
+
+    stats = import_tradebook(str(csv_path), store)
+
+    assert (stats["rows"], stats["round_trips"], stats["skipped"]) == (6, 1, 4)
+    assert store.total_net_pnl() == pytest.approx(zerodha_intraday_pnl(100, 101, 10)["Net P&L"])
+    store.close()
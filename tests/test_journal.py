@@ -0,0 +1,96 @@
+import json
+from storage.journal import JournalStore, SNAPSHOT_VERSION
+
+
+def trade(i):
+    return {"buy": 100 + i, "sell": 101 + i, "qty": 1, "net_pnl": i}
+
+
+def test_ops_are_recovered_from_journal(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = JournalStore(path, durable=False)
+    store.load()
+    for i in range(4):
+        store.add_trade(trade(i))
+    store.delete_trade(1)
+    store.set("theme", "dark")
+    store.close()
+
+    state = JournalStore(path).load()
+    assert state["trades"] == [trade(0), trade(2), trade(3)]
+    assert state["theme"] == "dark"
+
+
+def test_compaction_writes_snapshot_and_truncates_journal(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = JournalStore(path, compact_every=2, durable=False)
+    state = store.load()
+    for i in range(2):
+        store.add_trade(trade(i))
+        state["trades"].append(trade(i))
+    assert store.compaction_due()
+
+    store.save(state)
+    store.add_trade(trade(2))
+    store.close()
+
+    with open(path) as f:
+        snapshot = json.load(f)
+    assert snapshot["version"] == SNAPSHOT_VERSION
+    assert len(snapshot["trades"]) == 2
+    assert JournalStore(path).load()["trades"] == [trade(0), trade(1), trade(2)]
+
+
+def test_stale_journal_is_not_replayed_twice(tmp_path):
+    """Crash after the snapshot swap but before the journal is truncated"""
+    path = str(tmp_path / "state.json")
+    store = JournalStore(path, durable=False)
+    state = store.load()
+    store.add_trade(trade(0))
+    state["trades"].append(trade(0))
+    with open(store.journal_path) as f:
+        stale = f.read()
+    store.save(state)
+    with open(store.journal_path, "w") as f:
+        f.write(stale)
+
+    assert JournalStore(path).load()["trades"] == [trade(0)]
+
+
+def test_torn_tail_is_discarded(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = JournalStore(path, durable=False)
+    store.load()
+    store.add_trade(trade(0))
+    store.close()
+    with open(store.journal_path, "a") as f:
+        f.write('{"op":"add","trade":{"bu')
+
+    store = JournalStore(path, durable=False)
+    assert store.load()["trades"] == [trade(0)]
+    store.add_trade(trade(1))
+    store.close()
+    assert JournalStore(path).load()["trades"] == [trade(0), trade(1)]
+
+
+def test_migrates_legacy_state_file(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"theme": "dark", "trades": [trade(0)], "window": {"x": 1, "y": 2}}, indent=2))
+
+    state = JournalStore(str(path)).load()
+
+    assert state == {"theme": "dark", "trades": [trade(0)], "window": {"x": 1, "y": 2}}
+    assert json.loads(path.read_text())["version"] == SNAPSHOT_VERSION
+
+
+def test_settings_load_without_trades(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = JournalStore(path, durable=False)
+    store.load()
+    store.add_trade(trade(0))
+    store.set("theme", "dark")
+    store.set("window", {"x": 3, "y": 4})
+    store.close()
+
+    assert JournalStore(path).load_settings() == {"theme": "dark", "window": {"x": 3, "y": 4}}
+    assert JournalStore(path).load()["theme"] == "dark"
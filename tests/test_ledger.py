@@ -0,0 +1,118 @@
+import pytest
+from core.ledger import TradeLedger, Trade
+
+
+def test_append_iterate_and_index():
+    ledger = TradeLedger()
+    ledger.append(100, 101, 10, 8.93)
+    ledger.append(200, 198, 5, -11.2)
+
+    assert len(ledger) == 2
+    assert list(ledger) == [Trade(100, 101, 10, 8.93), Trade(200, 198, 5, -11.2)]
+    assert ledger[-1].qty == 5
+    assert ledger.total_net_pnl() == pytest.approx(-2.27)
+
+
+def test_delete_by_index():
+    ledger = TradeLedger()
+    for i in range(3):
+        ledger.append(100 + i, 101 + i, 1, float(i))
+
+    removed = ledger.delete(1)
+
+    assert removed.buy == 101
+    assert [t.net_pnl for t in ledger] == [0.0, 2.0]
+    ledger.clear()
+    assert len(ledger) == 0
+
+
+def test_add_trade_prices_with_calculator():
+    ledger = TradeLedger()
+    trade = ledger.add_trade(100, 101, 10, "NSE")
+    assert trade.net_pnl == pytest.approx(8.93)
+
+
+def test_records_round_trip():
+    records = [
+        {"buy": 100, "sell": 100, "qty": 1, "net_pnl": 0},
+        {"buy": 1520.35, "sell": 1534.8, "qty": 250, "net_pnl": 3456.7},
+    ]
+    assert TradeLedger.from_records(records).to_records() == records
+
+
+def test_cumulative_and_total_after_deletes():
+    """Running totals come from the prefix index, not a rescan"""
+    ledger = TradeLedger.from_records(
+        [{"buy": 100, "sell": 101, "qty": 1, "net_pnl": float(i)} for i in range(10)]
+    )
+    ledger.delete(3)
+    ledger.delete(0)
+    ledger.append(100, 101, 1, 100.0)
+
+    values = [t.net_pnl for t in ledger]
+    assert values == [1, 2, 4, 5, 6, 7, 8, 9, 100]
+    for i in range(len(values)):
+        assert ledger.cumulative(i) == pytest.approx(sum(values[:i + 1]))
+    assert ledger.total_net_pnl() == pytest.approx(sum(values))
+    assert ledger[2].net_pnl == 4
+    assert ledger[-1].net_pnl == 100
+
+
+def test_totals_do_not_drift_after_deletes():
+    """Sums are kept in paise, so deleting every trade leaves exactly 0"""
+    ledger = TradeLedger()
+    for net in (8.93, -1.07, 0.1, 0.2, -12.34, 3.33, 1520.35):
+        ledger.append(100, 101, 1, net)
+    ledger.delete(1)
+    assert ledger.cumulative(2) == 9.23
+    while len(ledger):
+        ledger.delete(0)
+    assert ledger.total_net_pnl() == 0
+
+
+def test_compaction_keeps_order(monkeypatch):
+    monkeypatch.setattr("core.ledger.COMPACT_MIN_DEAD", 2)
+    ledger = TradeLedger()
+    for i in range(6):
+        ledger.append(100, 101, 1, float(i))
+    for _ in range(4):
+        ledger.delete(0)
+
+    assert [t.net_pnl for t in ledger] == [4, 5]
+    assert ledger.cumulative(1) == 9
+    assert ledger.column("net_pnl").tolist() == [4, 5]
+
+    with pytest.raises(IndexError):
+        ledger[2]
+
+
+def test_copy_is_independent():
+    ledger = TradeLedger()
+    for i in range(5):
+        ledger.append(100, 101, 1, float(i))
+    ledger.delete(1)
+
+    snapshot = ledger.copy()
+    ledger.append(100, 101, 1, 50.0)
+    ledger.delete(0)
+
+    assert [t.net_pnl for t in snapshot] == [0, 2, 3, 4]
+    assert snapshot.cumulative(3) == 9
+    assert snapshot.total_net_pnl() == 9
+
+
+def test_trade_dates_round_trip_and_survive_compaction():
+    records = [
+        {"buy": 100, "sell": 101, "qty": 1, "net_pnl": 1, "date": "2026-03-02"},
+        {"buy": 100, "sell": 99, "qty": 1, "net_pnl": -1},
+    ]
+    ledger = TradeLedger.from_records(records)
+    assert ledger.to_records() == records
+    assert ledger.trade_date(0) == "2026-03-02"
+    assert ledger.trade_date(1) is None
+
+    for _ in range(2000):
+        ledger.append(1, 2, 1, 1.0, "2026-03-03")
+    for _ in range(2000):
+        ledger.delete(1)
+    assert [ledger.trade_date(i) for i in range(len(ledger))] == ["2026-03-02", "2026-03-03"]
@@ -0,0 +1,84 @@
+import json
+import time
+
+import pytest
+
+from core import metrics
+
+
+def work(x):
+    return x * 2
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.REGISTRY.clear()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.clear()
+
+
+def test_disabled_instrumentation_is_free():
+    """Disabled: decorators return the function itself and timers are a shared no-op."""
+    assert not metrics.enabled
+    assert metrics.timed("work")(work) is work
+    assert metrics.timer("a") is metrics.timer("b")
+    metrics.count("nothing")
+    assert "nothing" not in metrics.REGISTRY.counters
+
+
+def test_timed_records_histogram(instrumented):
+    timed_work = metrics.timed("work")(work)
+    for i in range(10):
+        assert timed_work(i) == 2 * i
+    with metrics.timer("block"):
+        time.sleep(0.002)
+    metrics.count("ops", 3)
+
+    snap = instrumented.snapshot()
+    assert snap["histograms"]["work"]["count"] == 10
+    assert snap["histograms"]["block"]["min"] >= 0.002
+    assert snap["counters"] == {"ops": 3}
+
+
+def test_dump_json_and_prometheus(instrumented, tmp_path):
+    instrumented.observe("state.save", 0.003)
+    instrumented.observe("state.save", 0.2)
+    instrumented.inc("persist.ops", 5)
+    instrumented.gauge("cache", lambda: {"hits": 4, "size": 2})
+
+    instrumented.dump(str(tmp_path / "m.json"))
+    instrumented.dump(str(tmp_path / "m.prom"))
+
+    data = json.loads((tmp_path / "m.json").read_text())
+    assert data["histograms"]["state.save"]["count"] == 2
+    assert data["gauges"] == {"cache.hits": 4, "cache.size": 2}
+    prom = (tmp_path / "m.prom").read_text()
+    assert 'zerodha_pnl_state_save_seconds_bucket{le="0.005"} 1' in prom
+    assert 'zerodha_pnl_state_save_seconds_bucket{le="+Inf"} 2' in prom
+    assert "zerodha_pnl_persist_ops_total 5" in prom
+
+
+def test_configure_strips_leading_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(metrics, "enable", lambda m, p: calls.append((m, p)))
+    monkeypatch.delenv(metrics.METRICS_ENV, raising=False)
+    monkeypatch.delenv(metrics.PROFILE_ENV, raising=False)
+
+    rest = metrics.configure(["--metrics", "m.prom", "price", "--profile", "x"])
+    assert rest == ["price", "--profile", "x"]
+    assert calls == [("m.prom", None)]
+
+
+def test_sampling_profiler_collects_folded_stacks(tmp_path):
+    profiler = metrics.SamplingProfiler(interval=0.001)
+    profiler.start()
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    profiler.stop()
+    profiler.dump(str(tmp_path / "s.folded"))
+
+    lines = (tmp_path / "s.folded").read_text().splitlines()
+    assert lines
+    assert any("test_sampling_profiler_collects_folded_stacks" in line for line in lines)
@@ -0,0 +1,71 @@
+import itertools
+
+import pytest
+
+from core.calculator import zerodha_pnl
+from core.feed import Tick
+from core.mtm import MarkToMarketEngine
+
+
+@pytest.mark.parametrize("price", [1400.0, 1534.8, 9000.0])
+def test_long_position_matches_calculator(price):
+    """Unrealized P&L equals the calculator for a round trip at the tick price."""
+    engine = MarkToMarketEngine()
+    pid = engine.open_position("INFY", 250, 1520.35)
+    engine.on_tick("INFY", price)
+    expected = zerodha_pnl(1520.35, price, 250)["Net P&L"]
+    assert engine.unrealized(pid) == pytest.approx(expected, abs=0.01)
+
+
+@pytest.mark.parametrize("price", [250.0, 300.0, 5000.0])
+def test_short_position_matches_calculator(price):
+    """A short is priced as buying back at the tick price."""
+    engine = MarkToMarketEngine()
+    pid = engine.open_position("TCS", -40, 300.0, "BSE")
+    engine.on_tick("TCS", price)
+    expected = zerodha_pnl(price, 300.0, 40, "BSE")["Net P&L"]
+    assert engine.unrealized(pid) == pytest.approx(expected, abs=0.01)
+
+
+def test_total_tracks_open_positions():
+    engine = MarkToMarketEngine()
+    a = engine.open_position("A", 100, 50.0)
+    b = engine.open_position("A", -10, 55.0)
+    c = engine.open_position("B", 7, 900.0)
+    for symbol, price in [("A", 51.0), ("B", 880.0), ("A", 52.5), ("C", 1.0)]:
+        engine.on_tick(symbol, price)
+    assert engine.total == pytest.approx(sum(engine.unrealized(p) for p in (a, b, c)))
+
+    closed = engine.close_position(b)
+    assert len(engine) == 2
+    assert engine.total == pytest.approx(engine.unrealized(a) + engine.unrealized(c))
+    assert closed == engine.unrealized(b)
+
+
+def test_frame_batches_changes_since_last_frame():
+    engine = MarkToMarketEngine()
+    a = engine.open_position("A", 100, 50.0)
+    engine.open_position("B", 10, 20.0)
+    engine.frame()
+
+    for price in (50.5, 51.0, 49.0):
+        engine.on_tick("A", price, ts=price)
+    frame = engine.frame()
+    assert frame.updates == {a: (49.0, engine.unrealized(a))}
+    assert frame.ticks == 3
+    assert frame.oldest_ts == 50.5
+    assert engine.frame().updates == {}
+
+
+def test_run_limits_frame_rate():
+    """With a fake clock advancing 1 ms per tick, one second of ticks is ~30 frames at 30 fps."""
+    engine = MarkToMarketEngine()
+    engine.open_position("A", 1, 100.0)
+    ms = itertools.count()
+    frames = []
+    ticks = (Tick(i + 1, "A", 100.0 + i % 5) for i in range(1000))
+
+    consumed = engine.run(ticks, frames.append, frame_rate=30, clock=lambda: next(ms) / 1000)
+    assert consumed == 1000
+    assert 25 <= len(frames) <= 35
+    assert sum(f.ticks for f in frames) == 1000
@@ -0,0 +1,78 @@
+import pytest
+
+from core.calculator import zerodha_pnl
+from core.positions import PositionBook
+
+DAY = "2026-01-02"
+
+
+def test_fifo_partial_fills_and_short_first():
+    book = PositionBook()
+    book.fill("INFY", True, 10, 100.0, trade_date=DAY)
+    book.fill("INFY", True, 5, 102.0, trade_date=DAY)
+    book.fill("INFY", False, 12, 105.0, trade_date=DAY)
+    book.fill("TCS", False, 3, 50.0, trade_date=DAY)
+    book.fill("TCS", True, 3, 49.0, trade_date=DAY)
+
+    trips = [(t.symbol, t.buy, t.sell, t.qty) for t in book.take_trips()]
+    assert trips == [
+        ("INFY", 100.0, 105.0, 10),
+        ("INFY", 102.0, 105.0, 2),
+        ("TCS", 49.0, 50.0, 3),
+    ]
+    assert book.position("INFY", trade_date=DAY) == 3
+    assert book.position("TCS", trade_date=DAY) == 0
+    assert book.open_lots("INFY", trade_date=DAY) == [(3, 102.0)]
+    assert book.take_trips() == []
+
+
+def test_short_that_flips_long():
+    book = PositionBook()
+    book.fill("A", False, 5, 200.0, trade_date=DAY)
+    book.fill("A", True, 8, 190.0, trade_date=DAY)
+    assert book.position("A", trade_date=DAY) == 3
+    assert book.open_lots("A", trade_date=DAY) == [(3, 190.0)]
+
+
+def test_single_orders_match_calculator():
+    """One buy order and one sell order: same charges as the calculator."""
+    book = PositionBook()
+    book.fill("INFY", True, 250, 1520.35, order_id=1, trade_date=DAY)
+    realized = book.fill("INFY", False, 250, 1534.8, order_id=2, trade_date=DAY)
+    expected = zerodha_pnl(1520.35, 1534.8, 250, trade_date=DAY)
+    assert realized == pytest.approx(expected["Net P&L"], abs=0.01)
+    assert book.charges == pytest.approx(expected["Total Charges"], abs=0.01)
+
+
+def test_brokerage_cap_applies_per_order_not_per_fill():
+    per_order = PositionBook()
+    per_fill = PositionBook()
+    for i in range(10):
+        per_order.fill("X", True, 100, 1000.0, order_id="buy", trade_date=DAY)
+        per_fill.fill("X", True, 100, 1000.0, trade_date=DAY)
+    per_order.fill("X", False, 1000, 1000.0, order_id="sell", trade_date=DAY)
+    per_fill.fill("X", False, 1000, 1000.0, trade_date=DAY)
+
+    whole = zerodha_pnl(1000.0, 1000.0, 1000, trade_date=DAY)
+    assert per_order.realized == pytest.approx(whole["Net P&L"], abs=0.01)
+    # Each 1 lakh fill hits the ₹20 cap on its own: nine extra ₹20 + GST.
+    assert per_fill.realized - per_order.realized == pytest.approx(-9 * 20 * 1.18)
+
+
+def test_open_charges_stay_with_open_lots():
+    book = PositionBook()
+    book.fill("X", True, 10, 100.0, order_id="b", trade_date=DAY)
+    book.fill("X", False, 4, 110.0, order_id="s", trade_date=DAY)
+    (trip,) = book.take_trips()
+    assert book.realized == pytest.approx(trip.net_pnl)
+    assert book.charges > trip.charges
+    assert book.open_quantity() == 6
+
+
+def test_invalid_fills_are_rejected():
+    book = PositionBook()
+    with pytest.raises(ValueError):
+        book.fill("X", True, 0, 100.0, trade_date=DAY)
+    with pytest.raises(ValueError):
+        book.fill("X", True, 1, 100.0, exchange="NYSE", trade_date=DAY)
+    assert book.fills == 0
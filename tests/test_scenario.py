@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from core.calculator import zerodha_intraday_pnl, zerodha_pnl
+from core.scenario import pnl_surface, exit_price_range, quantity_range
+
+
+def test_surface_matches_scalar():
+    prices = exit_price_range(1520.35, pct=2, steps=50)
+    quantities = quantity_range(2000, steps=20)
+
+    surface = pnl_surface(1520.35, prices, quantities, dtype="float64")
+
+    assert surface.shape == (len(prices), len(quantities))
+    for i in range(0, len(prices), 7):
+        for j in range(0, len(quantities), 3):
+            expected = zerodha_intraday_pnl(1520.35, float(prices[i]), int(quantities[j]))["Net P&L"]
+            assert surface[i, j] == pytest.approx(expected, abs=0.006)
+
+
+def test_surface_is_compact_and_full_size():
+    surface = pnl_surface(100, exit_price_range(100), quantity_range(5000))
+    assert surface.dtype == np.float32
+    assert surface.shape == (81, 200)
+
+
+def test_surface_other_segment():
+    surface = pnl_surface(250, [255.0], [100], segment="delivery", trade_date="2025-01-01", dtype="float64")
+    expected = zerodha_pnl(250, 255, 100, segment="delivery", trade_date="2025-01-01")["Net P&L"]
+    assert surface[0, 0] == pytest.approx(expected, abs=0.006)
+
+
+def test_axes():
+    prices = exit_price_range(100, pct=1, steps=500, tick=0.05)
+    assert prices[0] == 99 and prices[-1] == 101
+    assert np.allclose(np.diff(prices), 0.05)
+    assert quantity_range(3, steps=200).tolist() == [1, 2, 3]
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        pnl_surface(0, [1.0], [1])
+    with pytest.raises(ValueError):
+        pnl_surface(100, [1.0], [0])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from core.calculator import zerodha_intraday_pnl, zerodha_pnl, zerodha_pnl_batch
+from core.constants import NSE_TXN_CHARGE
+from core.schedule import ChargeSchedule, DEFAULT_SCHEDULE, SEGMENTS
+
+
+def test_lookup_picks_version_in_effect():
+    assert DEFAULT_SCHEDULE.lookup("intraday", "nse", "2024-09-30").txn_rate == 0.0000322
+    assert DEFAULT_SCHEDULE.lookup("intraday", "NSE", "2024-10-01").txn_rate == NSE_TXN_CHARGE
+    assert DEFAULT_SCHEDULE.lookup("OPTIONS", "NSE", "2025-06-01").stt_sell_rate == 0.001
+
+
+def test_lookup_rejects_unknown_inputs():
+    with pytest.raises(ValueError):
+        DEFAULT_SCHEDULE.lookup("commodity", "NSE", "2025-01-01")
+    with pytest.raises(ValueError):
+        DEFAULT_SCHEDULE.lookup("intraday", "NYSE", "2025-01-01")
+    with pytest.raises(ValueError):
+        DEFAULT_SCHEDULE.lookup("intraday", "NSE", "2020-01-01")
+
+
+def test_current_intraday_matches_intraday_calculator():
+    for args in [(100, 101, 10, "NSE"), (2500.5, 2490.25, 400, "BSE"), (10, 12, 1, "NSE")]:
+        assert zerodha_pnl(*args, trade_date="2025-03-03") == zerodha_intraday_pnl(*args)
+
+
+def test_segment_rules():
+    delivery = zerodha_pnl(100, 101, 10, segment="delivery", trade_date="2025-01-01")
+    options = zerodha_pnl(100, 101, 10, segment="options", trade_date="2025-01-01")
+    assert delivery["Zerodha Brokerage"] == 0
+    assert delivery["STT"] == 2.01
+    assert options["Zerodha Brokerage"] == 40
+
+
+def test_batch_matches_scalar_across_versions_and_segments():
+    rng = np.random.default_rng(11)
+    n = 300
+    buy = rng.uniform(1, 3000, n).round(2)
+    sell = (buy * rng.uniform(0.97, 1.03, n)).round(2)
+    qty = rng.integers(1, 2000, n)
+    exchange = rng.choice(["NSE", "BSE"], n)
+    segment = rng.choice(SEGMENTS, n)
+    dates = np.datetime64("2024-03-01") + rng.integers(0, 365, n)
+
+    batch = zerodha_pnl_batch(buy, sell, qty, exchange, segment, dates)
+
+    assert batch["Valid"].all()
+    for i in range(n):
+        scalar = zerodha_pnl(float(buy[i]), float(sell[i]), int(qty[i]), str(exchange[i]),
+                             str(segment[i]), str(dates[i]))
+        for key, value in scalar.items():
+            assert batch[key][i] == value
+
+
+def test_batch_flags_unknown_segment_and_early_date():
+    result = zerodha_pnl_batch([100] * 3, [101] * 3, [10] * 3, "NSE",
+                               ["intraday", "commodity", "intraday"],
+                               ["2025-01-01", "2025-01-01", "2020-01-01"])
+    assert result["Valid"].tolist() == [True, False, False]
+
+
+def test_custom_schedule():
+    schedule = ChargeSchedule([{
+        "effective_from": "2020-01-01",
+        "segments": {s: {"txn": {"NSE": 0.0, "BSE": 0.0}} for s in SEGMENTS},
+    }])
+    result = zerodha_pnl(100, 101, 10, segment="intraday", trade_date="2021-01-01", schedule=schedule)
+    assert result["Total Charges"] == 0
+    assert schedule.fingerprint != DEFAULT_SCHEDULE.fingerprint
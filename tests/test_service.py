@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+from service.server import PricingServer
+
+
+async def request(reader, writer, method, path, body=b"", headers=()):
+    lines = [f"{method} {path} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}", *headers]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    status = int(head.split(" ")[1])
+    fields = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if line)
+    payload = await reader.readexactly(int(fields["Content-Length"]))
+    return status, fields, payload
+
+
+def run_with_server(scenario, **options):
+    async def main():
+        server = PricingServer(port=0, **options)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            return await scenario(server, reader, writer)
+        finally:
+            writer.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_quote_and_keep_alive():
+    async def scenario(server, reader, writer):
+        status, fields, payload = await request(reader, writer, "POST", "/quote",
+                                                b'{"buy": 100, "sell": 101, "qty": 10}')
+        assert status == 200 and fields["Connection"] == "keep-alive"
+        assert json.loads(payload)["Net P&L"] == pytest.approx(8.93)
+
+        # Same connection: a bad body is a 400 and the connection stays usable.
+        status, _, payload = await request(reader, writer, "POST", "/quote", b'{"buy": 100}')
+        assert status == 400 and "sell" in json.loads(payload)["error"]
+        status, _, _ = await request(reader, writer, "GET", "/health")
+        assert status == 200
+        assert server.requests == 3
+
+    run_with_server(scenario)
+
+
+def test_batch_json_and_ndjson():
+    rows = [{"buy": 100, "sell": 101, "qty": 10}, {"buy": -1, "sell": 101, "qty": 10}]
+
+    async def scenario(server, reader, writer):
+        status, fields, payload = await request(reader, writer, "POST", "/quote/batch", json.dumps(rows).encode())
+        assert status == 200 and fields["Content-Type"] == "application/json"
+        results = json.loads(payload)
+        assert results[0]["Net P&L"] == pytest.approx(8.93)
+        assert "error" in results[1]
+
+        body = "".join(json.dumps(r) + "\n" for r in rows).encode()
+        status, fields, payload = await request(reader, writer, "POST", "/quote/batch", body,
+                                                ["Content-Type: application/x-ndjson"])
+        assert fields["Content-Type"] == "application/x-ndjson"
+        assert [json.loads(line).get("error") is None for line in payload.splitlines()] == [True, False]
+
+    run_with_server(scenario)
+
+
+def test_large_batches_run_in_process_pool():
+    rows = [{"buy": 100 + i, "sell": 101 + i, "qty": 10, "exchange": "BSE"} for i in range(50)]
+
+    async def scenario(server, reader, writer):
+        status, _, payload = await request(reader, writer, "POST", "/quote/batch", json.dumps(rows).encode())
+        assert status == 200 and len(json.loads(payload)) == 50
+        assert server._pool is not None
+
+    run_with_server(scenario, offload_bytes=100, workers=1)
+
+
+def test_routes_and_busy_server():
+    async def scenario(server, reader, writer):
+        assert (await request(reader, writer, "GET", "/nope"))[0] == 404
+        assert (await request(reader, writer, "GET", "/quote"))[0] == 405
+
+        # Every slot taken and no backlog allowed: the next quote is refused.
+        await server._slots.acquire()
+        status, fields, _ = await request(reader, writer, "POST", "/quote", b'{"buy": 1, "sell": 2, "qty": 1}')
+        assert status == 503 and fields["Retry-After"] == "1"
+        server._slots.release()
+        assert (await request(reader, writer, "GET", "/health"))[0] == 200
+
+    run_with_server(scenario, concurrency=1, backlog=0)
+
+
+def test_connection_close_is_honoured():
+    async def scenario(server, reader, writer):
+        status, fields, _ = await request(reader, writer, "GET", "/health", headers=["Connection: close"])
+        assert status == 200 and fields["Connection"] == "close"
+        assert await reader.read() == b""
+
+    run_with_server(scenario)
+
+
+def test_non_finite_numbers_are_rejected():
+    async def scenario(server, reader, writer):
+        for body in (b'{"buy": 100, "sell": 101, "qty": Infinity}', b'{"buy": NaN, "sell": 101, "qty": 10}'):
+            status, _, payload = await request(reader, writer, "POST", "/quote", body)
+            assert status == 400 and "finite" in json.loads(payload)["error"]
+
+        body = b'[{"buy": 100, "sell": 101, "qty": Infinity}, {"buy": 100, "sell": 101, "qty": 10}]'
+        status, _, payload = await request(reader, writer, "POST", "/quote/batch", body)
+        results = json.loads(payload)
+        assert status == 200 and "finite" in results[0]["error"] and "error" not in results[1]
+
+    run_with_server(scenario)
+
+
+def test_unexpected_errors_answer_500(monkeypatch, capsys):
+    def broken(body):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("service.server.price_quote", broken)
+
+    async def scenario(server, reader, writer):
+        status, fields, payload = await request(reader, writer, "POST", "/quote", b'{"buy": 1, "sell": 2, "qty": 1}')
+        assert status == 500 and fields["Connection"] == "close"
+        assert json.loads(payload) == {"error": "Internal server error."}
+
+    run_with_server(scenario)
+    assert "RuntimeError: boom" in capsys.readouterr().err
+
+
+def test_overflowing_results_are_rejected():
+    huge = {"buy": 1e300, "sell": 1e300, "qty": 10_000_000_000}
+
+    async def scenario(server, reader, writer):
+        status, _, payload = await request(reader, writer, "POST", "/quote", json.dumps(huge).encode())
+        assert status == 400 and json.loads(payload)["error"] == "result is out of range"
+
+        body = json.dumps([huge, {"buy": 100, "sell": 101, "qty": 10}]).encode()
+        status, _, payload = await request(reader, writer, "POST", "/quote/batch", body)
+        results = json.loads(payload, parse_constant=pytest.fail)
+        assert status == 200 and results[0]["error"] == "result is out of range"
+        assert results[1]["Net P&L"] == pytest.approx(8.93)
+
+    run_with_server(scenario)
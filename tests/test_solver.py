@@ -0,0 +1,64 @@
+import random
+import pytest
+from core.calculator import zerodha_intraday_pnl, zerodha_pnl
+from core.schedule import DEFAULT_SCHEDULE
+from core.solver import breakeven_sell_price, sell_price_for_target, max_quantity_for_capital
+
+CASES = [
+    (100, 10),        # both legs below the brokerage cap
+    (1520.35, 250),   # both legs capped
+    (330, 200),       # buy leg just under the cap, sell leg crosses it
+    (2, 1),
+]
+
+
+@pytest.mark.parametrize("buy, qty", CASES)
+@pytest.mark.parametrize("exchange", ["NSE", "BSE"])
+def test_breakeven_is_exact(buy, qty, exchange):
+    price = breakeven_sell_price(buy, qty, exchange=exchange)
+    assert abs(zerodha_intraday_pnl(buy, price, qty, exchange)["Net P&L"]) <= 0.01
+
+
+def test_target_matches_scalar_on_random_inputs():
+    rng = random.Random(5)
+    for _ in range(500):
+        buy = round(rng.uniform(1, 5000), 2)
+        qty = rng.randint(1, 3000)
+        target = round(rng.uniform(-500, 5000), 2)
+        price = sell_price_for_target(buy, qty, target)
+        assert zerodha_intraday_pnl(buy, price, qty)["Net P&L"] == pytest.approx(target, abs=0.011)
+
+
+def test_tick_rounding_gives_first_profitable_tick():
+    price = sell_price_for_target(1520.35, 250, 1000, tick=0.05)
+    assert round(price / 0.05, 6).is_integer()
+    assert zerodha_intraday_pnl(1520.35, price, 250)["Net P&L"] >= 1000
+    assert zerodha_intraday_pnl(1520.35, price - 0.05, 250)["Net P&L"] < 1000
+
+
+def test_other_segments():
+    for segment in ["delivery", "futures", "options"]:
+        price = breakeven_sell_price(250, 500, segment=segment, trade_date="2025-01-01")
+        assert abs(zerodha_pnl(250, price, 500, segment=segment, trade_date="2025-01-01")["Net P&L"]) <= 0.01
+
+
+def buy_side_cost(qty, buy):
+    r = DEFAULT_SCHEDULE.lookup("intraday", "NSE")
+    turnover = qty * buy
+    brokerage = min(r.brokerage_cap, r.brokerage_rate * turnover)
+    exchange = (r.txn_rate + r.sebi_rate) * turnover
+    return turnover + brokerage + exchange + r.stamp_rate * turnover + r.gst_rate * (brokerage + exchange)
+
+
+def test_max_quantity_for_capital():
+    for capital, buy in [(100000, 1520.35), (10000, 99.95), (50, 10), (5, 10)]:
+        qty = max_quantity_for_capital(capital, buy)
+        assert buy_side_cost(qty, buy) <= capital
+        assert buy_side_cost(qty + 1, buy) > capital
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        breakeven_sell_price(0, 10)
+    with pytest.raises(ValueError):
+        sell_price_for_target(100, 10, -5000)
@@ -0,0 +1,80 @@
+import pytest
+from storage.sqlite_store import SQLiteStore
+from storage.state import AppState
+
+
+def trade(i, day="2026-01-02", symbol="INFY"):
+    return {"buy": 100 + i, "sell": 101 + i, "qty": 1, "net_pnl": float(i),
+            "date": day, "symbol": symbol}
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteStore(str(tmp_path / "trades.db"), session_date="2026-01-02")
+    yield s
+    s.close()
+
+
+def test_uses_wal_mode(store):
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_session_ops_round_trip(store):
+    for i in range(3):
+        store.add_trade({"buy": 100 + i, "sell": 101 + i, "qty": 1, "net_pnl": float(i)})
+    store.delete_trade(1)
+    store.set("theme", "dark")
+
+    state = store.load()
+    assert [t["net_pnl"] for t in state["trades"]] == [0, 2]
+    assert state["theme"] == "dark"
+
+    store.clear_trades()
+    assert store.load()["trades"] == []
+
+
+def test_load_only_reads_session_day(store):
+    store.add_trades([trade(i, day="2025-12-31") for i in range(5)], batch_size=2)
+    store.add_trade(trade(9))
+
+    assert [t["net_pnl"] for t in store.load()["trades"]] == [9]
+    assert store.count() == 6
+
+
+def test_aggregates_in_sql(store):
+    store.add_trades([trade(1, "2026-01-01", "INFY"), trade(2, "2026-01-01", "TCS"), trade(4, "2026-01-02", "TCS")])
+
+    assert store.total_net_pnl() == 7
+    assert store.total_net_pnl(start="2026-01-02") == 4
+    assert store.daily_net_pnl() == [("2026-01-01", 3.0, 2), ("2026-01-02", 4.0, 1)]
+    assert store.symbol_net_pnl(end="2026-01-01") == [("INFY", 1.0, 1), ("TCS", 2.0, 1)]
+
+
+def test_app_state_selects_sqlite_by_extension(tmp_path):
+    state = AppState(str(tmp_path / "state.db"))
+    assert isinstance(state.backend, SQLiteStore)
+    state.close()
+
+
+def test_reopened_session_keeps_trade_dates(tmp_path):
+    from core.analytics import TradeAnalytics
+    from core.ledger import TradeLedger
+
+    path = str(tmp_path / "state.db")
+    state = AppState(path)
+    day = state.session_date
+    state.add_trade({"buy": 100, "sell": 101, "qty": 10, "net_pnl": 8.93, "date": day})
+    state.close()
+
+    state = AppState(path)
+    trades = state.load()["trades"]
+    state.close()
+    assert trades[0]["date"] == day
+    assert TradeAnalytics.from_ledger(TradeLedger.from_records(trades)).day(day).trades == 1
+
+
+def test_session_date_is_fixed_when_the_store_opens(tmp_path):
+    state = AppState(str(tmp_path / "state.db"))
+    state.backend.session_date = "2026-01-02"
+    assert state.session_date == "2026-01-02"
+    state.close()
@@ -1,10 +1,17 @@
 import pytest
-from core.utils import validate_inputs, round2
+import numpy as np
+from core.utils import validate_inputs, validate_inputs_batch, round2, round2_array, plain_number
 
 def test_round2():
     assert round2(12.345) == 12.35
     assert round2(0) == 0.00
 
+def test_round2_array_matches_round2():
+    values = np.random.default_rng(3).uniform(0, 10_000, 100_000).round(3)
+    values = np.append(values, [869.515, 0.125, -2.675, np.nan])
+    expected = [round2(v) for v in values.tolist()]
+    assert np.array_equal(round2_array(values), expected, equal_nan=True)
+
 def test_validate_inputs_valid():
     validate_inputs(100, 101, 10, "NSE")  # Should not raise
 
@@ -19,3 +26,13 @@ def test_validate_inputs_invalid_quantity():
 def test_validate_inputs_invalid_exchange():
     with pytest.raises(ValueError):
         validate_inputs(100, 101, 10, "NYSE")
+
+def test_validate_inputs_batch():
+    mask = validate_inputs_batch([100, -1, 100, 100], [101, 101, 101, 101], [10, 10, 0, 10],
+                                 ["NSE", "NSE", "BSE", "NYSE"])
+    assert mask.tolist() == [True, False, False, False]
+
+def test_plain_number():
+    assert plain_number(100.0) == 100
+    assert isinstance(plain_number(100.0), int)
+    assert plain_number(12.5) == 12.5
@@ -0,0 +1,182 @@
+import heapq
+import itertools
+import time
+
+import pytest
+
+from core.ledger import TradeLedger
+from storage.state import AppState
+from worker import BackgroundWorker, PersistQueue
+
+
+class FakeLoop:
+    """Single-threaded after() loop standing in for Tk's mainloop."""
+
+    def __init__(self):
+        self._timers = []
+        self._order = itertools.count()
+
+    def after(self, ms, callback, *args):
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, next(self._order), callback, args))
+
+    def run_until(self, done, timeout=10.0):
+        deadline = time.perf_counter() + timeout
+        while not done() and time.perf_counter() < deadline:
+            due, _, callback, args = heapq.heappop(self._timers)
+            time.sleep(max(0.0, due - time.perf_counter()))
+            callback(*args)
+
+    def measure_gaps(self, done, tick_ms=5, timeout=10.0):
+        """Run until done(); return the largest lateness of a tick_ms heartbeat, in ms."""
+        gaps = [0.0]
+
+        def tick(expected):
+            now = time.perf_counter()
+            gaps.append((now - expected) * 1000)
+            self.after(tick_ms, tick, now + tick_ms / 1000)
+
+        self.after(tick_ms, tick, time.perf_counter() + tick_ms / 1000)
+        self.run_until(done, timeout)
+        return max(gaps)
+
+
+class RecordingStore:
+    def __init__(self):
+        self.batches = []
+
+    def apply(self, ops):
+        self.batches.append(list(ops))
+
+
+def ledger_of(n):
+    return TradeLedger.from_records([
+        {"buy": 100 + i % 50, "sell": 101 + i % 50, "qty": 1 + i % 9, "net_pnl": i % 7 - 3}
+        for i in range(n)
+    ])
+
+
+def test_callbacks_run_on_loop_thread():
+    """on_done runs from pump(), i.e. inside the UI loop, not on the pool thread."""
+    loop = FakeLoop()
+    worker = BackgroundWorker(loop.after)
+    results = []
+    worker.submit(sum, [1, 2, 3], on_done=results.append)
+    worker.submit(int, "x", on_error=results.append)
+    loop.run_until(lambda: len(results) == 2)
+    worker.close()
+
+    assert 6 in results
+    assert any(isinstance(r, ValueError) for r in results)
+
+
+def test_failing_callback_does_not_stop_the_pump():
+    loop = FakeLoop()
+    errors, results = [], []
+    worker = BackgroundWorker(loop.after, report=lambda *exc: errors.append(exc[1]))
+
+    def broken(result):
+        raise RuntimeError("callback failed")
+
+    worker.submit(sum, [1], on_done=broken)
+    loop.run_until(lambda: errors)
+    worker.submit(sum, [1, 2], on_done=results.append)
+    loop.run_until(lambda: results)
+    worker.close()
+
+    assert [str(e) for e in errors] == ["callback failed"]
+    assert results == [3]
+
+
+def test_burst_of_persists_is_coalesced_in_order():
+    """A burst of clicks becomes one store batch with the operations in order."""
+    loop = FakeLoop()
+    worker = BackgroundWorker(loop.after)
+    store = RecordingStore()
+    flushed = []
+    writes = PersistQueue(worker, store.apply, on_flushed=lambda: flushed.append(1))
+
+    for i in range(50):
+        writes.put("add_trade", {"i": i})
+    writes.put("delete_trade", 3)
+    writes.put("set", "theme", "dark")
+    loop.run_until(lambda: flushed)
+    worker.close()
+
+    ops = [op for batch in store.batches for op in batch]
+    assert len(store.batches) == 1
+    assert ops[0] == ("add_trade", ({"i": 0},))
+    assert ops[-2:] == [("delete_trade", (3,)), ("set", ("theme", "dark"))]
+    assert len(ops) == 52
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    path = str(tmp_path / "state.json")
+    store = AppState(path)
+    store.load()
+    loop = FakeLoop()
+    worker = BackgroundWorker(loop.after)
+    writes = PersistQueue(worker, store.apply, delay=5.0)
+    writes.put("add_trade", {"buy": 1, "sell": 2, "qty": 1, "net_pnl": 1})
+    writes.put("set", "theme", "dark")
+    writes.flush_now()
+    worker.close()
+    store.close()
+
+    state = AppState(path).load()
+    assert len(state["trades"]) == 1
+    assert state["theme"] == "dark"
+
+
+def test_event_loop_stays_responsive_during_heavy_save(tmp_path):
+    """A 200k-trade snapshot written in the background keeps the loop ticking."""
+    path = str(tmp_path / "state.json")
+    store = AppState(path)
+    store.load()
+    ledger = ledger_of(200_000)
+
+    start = time.perf_counter()
+    store.save({"theme": "light", "window": None, "trades": ledger})
+    blocking_ms = (time.perf_counter() - start) * 1000
+
+    loop = FakeLoop()
+    worker = BackgroundWorker(loop.after)
+    flushed = []
+    writes = PersistQueue(worker, store.apply, on_flushed=lambda: flushed.append(1), delay=0)
+    writes.put("save", {"theme": "dark", "window": None, "trades": ledger.copy()})
+    worst_ms = loop.measure_gaps(lambda: flushed)
+    worker.close()
+    store.close()
+
+    assert flushed
+    assert worst_ms < max(50.0, blocking_ms / 2)
+    assert len(AppState(path).load()["trades"]) == 200_000
+
+
+def test_tk_event_loop_latency_during_heavy_save(tmp_path):
+    """Same check against a real Tk mainloop when a display is available."""
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    root.withdraw()
+
+    store = AppState(str(tmp_path / "state.json"))
+    store.load()
+    worker = BackgroundWorker(root.after)
+    writes = PersistQueue(worker, store.apply, on_flushed=root.quit, delay=0)
+    gaps = [0.0]
+
+    def tick(expected):
+        now = time.perf_counter()
+        gaps.append((now - expected) * 1000)
+        root.after(5, tick, now + 0.005)
+
+    writes.put("save", {"theme": "dark", "window": None, "trades": ledger_of(200_000)})
+    root.after(5, tick, time.perf_counter() + 0.005)
+    root.mainloop()
+    worker.close()
+    store.close()
+    root.destroy()
+
+    assert max(gaps) < 100.0
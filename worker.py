@@ -0,0 +1,140 @@
+"""
+Background execution for the desktop app.
+
+Tk is single-threaded: widgets may only be touched from the thread running
+mainloop. BackgroundWorker runs calculations and disk I/O on a thread pool
+and hands results back through a queue that the Tk thread drains on a short
+after() timer, so callbacks always run on the Tk thread.
+
+Persistence goes through PersistQueue: operations are queued in order and a
+single writer thread applies everything queued so far as one batch, so a
+burst of clicks becomes one journal fsync (or one SQLite transaction).
+"""
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core import metrics
+
+POLL_MS = 10
+COALESCE_SECONDS = 0.05
+
+
+class BackgroundWorker:
+    def __init__(self, schedule, max_workers: int = 2, report=None):
+        """
+        schedule(delay_ms, callback) must be the UI loop's timer (root.after).
+        report(type, value, traceback) is told about callbacks that raise
+        (root.report_callback_exception); by default they are printed.
+        """
+        self._schedule = schedule
+        self._report = report or sys.excepthook
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="pnl-worker")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="pnl-writer")
+        self._done = queue.SimpleQueue()
+        self._closed = False
+        self._schedule(POLL_MS, self.pump)
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Run fn(*args) on the pool; on_done(result)/on_error(exc) run on the UI thread."""
+        return self._run(self._pool, fn, args, on_done, on_error)
+
+    def submit_write(self, fn, *args, on_done=None, on_error=None):
+        """Like submit, but on the single writer thread so writes stay ordered."""
+        return self._run(self._writer, fn, args, on_done, on_error)
+
+    def call_soon(self, callback, *args) -> None:
+        """Queue callback(*args) to run on the UI thread from any thread."""
+        self._done.put((callback, args))
+
+    @metrics.timed("tk.pump")
+    def pump(self) -> None:
+        """Run finished callbacks; called on the UI thread by the after() timer."""
+        try:
+            while True:
+                try:
+                    callback, args = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                # One failing callback must not strand the ones queued after it.
+                try:
+                    callback(*args)
+                except Exception:
+                    self._report(*sys.exc_info())
+        finally:
+            if not self._closed:
+                self._schedule(POLL_MS, self.pump)
+
+    def close(self) -> None:
+        """Finish queued writes, then stop. Pending UI callbacks are dropped."""
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, executor, fn, args, on_done, on_error):
+        def task():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                if on_error:
+                    self.call_soon(on_error, e)
+                return None
+            if on_done:
+                self.call_soon(on_done, result)
+            return result
+
+        return executor.submit(task)
+
+
+class PersistQueue:
+    """
+    Ordered, coalescing queue of store operations.
+
+    put(name, *args) records one AppState call. The writer waits
+    COALESCE_SECONDS for the burst to settle, then passes every queued
+    operation to apply_batch in one call. on_flushed() runs on the UI thread
+    after each batch.
+    """
+
+    def __init__(self, worker: BackgroundWorker, apply_batch, on_flushed=None,
+                 on_error=None, delay: float = COALESCE_SECONDS):
+        self.worker = worker
+        self.apply_batch = apply_batch
+        self.on_flushed = on_flushed
+        self.on_error = on_error
+        self.delay = delay
+        self.batches = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._wake = threading.Event()
+
+    def put(self, name: str, *args) -> None:
+        with self._lock:
+            self._pending.append((name, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.clear()
+        self.worker.submit_write(self._flush, on_done=self._flushed, on_error=self.on_error)
+
+    def flush_now(self) -> None:
+        """Skip the coalescing delay for the batch in flight (e.g. on close)."""
+        self._wake.set()
+
+    @metrics.timed("persist.flush")
+    def _flush(self):
+        self._wake.wait(self.delay)
+        with self._lock:
+            ops, self._pending = self._pending, []
+            self._scheduled = False
+        if ops:
+            self.apply_batch(ops)
+            self.batches += 1
+            metrics.count("persist.ops", len(ops))
+        return len(ops)
+
+    def _flushed(self, count):
+        if self.on_flushed:
+            self.on_flushed()